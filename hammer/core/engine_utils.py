@@ -1,14 +1,66 @@
+import asyncio
+import threading
 from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
 
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from .base import Base
 
+# 共享的 engine 按创建时所在的事件循环分组, 组内按 (url, 参数) 共享, 每个 engine 持有一个连接池.
+# asyncpg 的连接绑定在创建它的事件循环上, 不能跨事件循环复用, 因此每个事件循环使用各自的 engine.
+# 生命周期: 事件循环结束前应调用 dispose_engines 关闭本循环的连接池; 已关闭的事件循环的分组
+# 在下一次获取或关闭 engine 时被丢弃 (其连接已随事件循环失效, 无法再异步关闭).
+# 在事件循环外获取的 engine 归入 None 分组.
+_ENGINES: Dict[Optional[asyncio.AbstractEventLoop], Dict[Tuple, AsyncEngine]] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _drop_closed_loops() -> None:
+    for loop in [loop for loop in _ENGINES if loop is not None and loop.is_closed()]:
+        del _ENGINES[loop]
+
+
+def get_async_engine(url: str, **options) -> AsyncEngine:
+    """获取当前事件循环中 url 对应的共享 engine, 不存在时创建. 创建 engine 不会建立连接, 连接在第一次使用时才建立."""
+    key = (url, tuple(sorted(options.items())))
+    with _ENGINES_LOCK:
+        _drop_closed_loops()
+        engines = _ENGINES.setdefault(_running_loop(), {})
+        if key not in engines:
+            engines[key] = create_async_engine(url, **options)
+        return engines[key]
+
+
+async def dispose_engines(url: str = None) -> None:
+    """关闭当前事件循环 (以及事件循环外创建) 的共享 engine 的连接池, url 为空时关闭所有 engine"""
+    engines = []
+    with _ENGINES_LOCK:
+        _drop_closed_loops()
+        for loop in {None, _running_loop()}:
+            group = _ENGINES.get(loop, {})
+            engines += [group.pop(key) for key in list(group) if url is None or key[0] == url]
+            if not group:
+                _ENGINES.pop(loop, None)
+    for engine in engines:
+        await engine.dispose()
+
 
 class AsyncEngineBase(object):
-    """数据库的异步操作: database和表格的创建, 表格条目的增删改查."""
+    """数据库的异步操作: database和表格的创建, 表格条目的增删改查.
+
+    同一个事件循环中同一个 url 共享一个 engine 和连接池, 连接池参数可以在 infra 配置中设置.
+    """
 
     url: str
 
@@ -21,6 +73,13 @@ class AsyncEngineBase(object):
         user: str = None,
         password: str = None,
         database: str = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        statement_cache_size: int = 500,
+        echo: bool = False,
     ):
         self.url = url
         self._host = host
@@ -28,9 +87,23 @@ class AsyncEngineBase(object):
         self._user = user
         self._password = password
         self._database = database
-
-    def create_engine(self, url, *, echo=True, future=True) -> AsyncEngine:
-        return create_async_engine(url, echo=echo, future=future)
+        self._statement_cache_size = statement_cache_size
+        self._engine_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+            # sqlalchemy 编译后的语句缓存
+            "query_cache_size": statement_cache_size,
+            "echo": echo,
+        }
+
+    def create_engine(self, url, **kwargs) -> AsyncEngine:
+        return get_async_engine(url, **{**self._engine_options, **kwargs})
+
+    async def dispose(self) -> None:
+        raise NotImplementedError
 
     async def create_database(self):
         raise NotImplementedError
@@ -40,28 +113,49 @@ class AsyncEngineBase(object):
 
 
 class Postgres(AsyncEngineBase):
-    def __init__(self, *, host: str, port: int, user: str, password: str, database: str):
+    def __init__(self, *, host: str, port: int, user: str, password: str, database: str, **engine_options):
         url_prefix = f"postgresql+asyncpg://{user}:{password}@{host}:{port}"
-        url_with_db = f"{url_prefix}/{database}"
-        url_default = f"{url_prefix}/postgres"
-        super().__init__(url_default, host=host, port=port, user=user, password=password, database=database)
-        self.url_default = url_default
-        self.url_with_db = url_with_db
+        super().__init__(
+            f"{url_prefix}/postgres",
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+            **engine_options,
+        )
+        # asyncpg 的 prepared statement 缓存
+        url_query = f"?prepared_statement_cache_size={self._statement_cache_size}"
+        self.url_default = f"{url_prefix}/postgres{url_query}"
+        self.url_with_db = f"{url_prefix}/{database}{url_query}"
+        # 直接使用 asyncpg 连接时的地址, 比如 LISTEN/NOTIFY
+        self.dsn = f"postgresql://{user}:{password}@{host}:{port}/{database}"
         self._async_engine = None
         self._session_factory = None
 
     @property
-    def async_engine(self):
-        if self._async_engine is None:
-            self._async_engine = self.create_engine(self.url_with_db)
-        return self._async_engine
+    def async_engine(self) -> AsyncEngine:
+        # 每次都按当前事件循环获取, 在新的事件循环中使用时会切换到该循环的 engine
+        engine = self.create_engine(self.url_with_db)
+        if engine is not self._async_engine:
+            self._async_engine = engine
+            self._session_factory = None
+        return engine
 
     @property
     def session_factory(self):
+        engine = self.async_engine
         if self._session_factory is None:
-            self._session_factory = sessionmaker(self.async_engine, class_=AsyncSession, expire_on_commit=False)
+            self._session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
         return self._session_factory
 
+    async def dispose(self) -> None:
+        """关闭当前事件循环的连接池, 之后再使用时会重新创建"""
+        await dispose_engines(self.url_default)
+        await dispose_engines(self.url_with_db)
+        self._async_engine = None
+        self._session_factory = None
+
     async def create_database(self, database: str):
         self._database = database
         try:
@@ -80,7 +174,7 @@ class Postgres(AsyncEngineBase):
             raise
 
     async def create_table(self, table_name: str = None):
-        async with self.create_engine(self.url_with_db).begin() as conn:
+        async with self.async_engine.begin() as conn:
             table = Base.metadata.tables.get(table_name)
             if table is not None:
                 await conn.run_sync(lambda conn: table.create(conn, checkfirst=True))
@@ -107,7 +201,7 @@ class Postgres(AsyncEngineBase):
         if table is None:
             raise ValueError(f"Table '{table_name}' not found in metadata registry")
 
-        async with self.create_engine(self.url_with_db).connect() as conn:
+        async with self.async_engine.connect() as conn:
             # 构建基本查询
             query = table.select()
 
@@ -124,7 +218,7 @@ class Postgres(AsyncEngineBase):
             rows = [dict(row._mapping) for row in result]
             return rows
 
-    async def write(self, table_name: str, data: dict | list[dict], upsert: bool = False):
+    async def write(self, table_name: str, data: dict | list[dict], upsert: bool = False, session: AsyncSession = None):
         """
         异步向数据库表中写入数据。
 
@@ -132,6 +226,7 @@ class Postgres(AsyncEngineBase):
             table_name (str): 要写入的表名
             data (dict | list[dict]): 要写入的数据，可以是单个字典或字典列表
             upsert (bool): 如果为 True，当主键冲突时更新记录，否则插入新记录
+            session (AsyncSession, optional): 在该 session 的事务中写入, 由调用方提交; 为空时在新的事务中写入并提交
 
         Returns:
             int: 受影响的行数
@@ -157,20 +252,22 @@ class Postgres(AsyncEngineBase):
             if invalid_columns:
                 raise ValueError(f"Invalid columns found: {invalid_columns}")
 
-        async with self.create_engine(self.url_with_db).begin() as conn:
-            stmt = table.insert()
-            if upsert:
-                # 使用 PostgreSQL 的 ON CONFLICT 实现 upsert
-                stmt = stmt.values(data).on_conflict_do_update(
-                    index_elements=[table.primary_key.columns.keys()[0]],  # 使用主键
-                    set_={
-                        col: stmt.excluded[col] for col in data[0].keys() if col != table.primary_key.columns.keys()[0]
-                    },
-                )
-            else:
-                # 普通插入
-                stmt = stmt.values(data)
-
+        # on_conflict_do_update 只有 PostgreSQL 方言的 insert 才支持
+        stmt = pg_insert(table)
+        if upsert:
+            # 使用 PostgreSQL 的 ON CONFLICT 实现 upsert
+            stmt = stmt.values(data).on_conflict_do_update(
+                index_elements=[table.primary_key.columns.keys()[0]],  # 使用主键
+                set_={col: stmt.excluded[col] for col in data[0].keys() if col != table.primary_key.columns.keys()[0]},
+            )
+        else:
+            # 普通插入
+            stmt = stmt.values(data)
+
+        if session is not None:
+            result = await session.execute(stmt)
+            return result.rowcount
+        async with self.async_engine.begin() as conn:
             result = await conn.execute(stmt)
             return result.rowcount
 
@@ -194,7 +291,7 @@ class Postgres(AsyncEngineBase):
         if table is None:
             raise ValueError(f"Table '{table_name}' not found in metadata registry")
 
-        async with self.create_engine(self.url_with_db).begin() as conn:
+        async with self.async_engine.begin() as conn:
             # 构建删除语句
             stmt = table.delete()
 
@@ -2,7 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # NO CHECKED-IN PROTOBUF GENCODE
 # source: protos/entity.proto
-# Protobuf Python Version: 5.29.3
+# Protobuf Python Version: 5.29.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -10,14 +10,14 @@ from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
 from google.protobuf.internal import builder as _builder
 
-_runtime_version.ValidateProtobufRuntimeVersion(_runtime_version.Domain.PUBLIC, 5, 29, 3, "", "protos/entity.proto")
+_runtime_version.ValidateProtobufRuntimeVersion(_runtime_version.Domain.PUBLIC, 5, 29, 0, "", "protos/entity.proto")
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x13protos/entity.proto\x12\x06\x65ntity")\n\x06\x45ntity\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tjoin_keys\x18\x02 \x03(\t"5\n\x13\x43reateEntityRequest\x12\x1e\n\x06\x65ntity\x18\x01 \x01(\x0b\x32\x0e.entity.Entity"X\n\x14\x43reateEntityResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1e\n\x06\x65ntity\x18\x03 \x01(\x0b\x32\x0e.entity.Entity" \n\x10GetEntityRequest\x12\x0c\n\x04name\x18\x01 \x01(\t"S\n\x11GetEntityResponse\x12\x1e\n\x06\x65ntity\x18\x01 \x01(\x0b\x32\x0e.entity.Entity\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t2\x9c\x01\n\rEntityService\x12I\n\x0c\x43reateEntity\x12\x1b.entity.CreateEntityRequest\x1a\x1c.entity.CreateEntityResponse\x12@\n\tGetEntity\x12\x18.entity.GetEntityRequest\x1a\x19.entity.GetEntityResponseb\x06proto3'
+    b'\n\x13protos/entity.proto\x12\x06\x65ntity")\n\x06\x45ntity\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tjoin_keys\x18\x02 \x03(\t"5\n\x13\x43reateEntityRequest\x12\x1e\n\x06\x65ntity\x18\x01 \x01(\x0b\x32\x0e.entity.Entity"X\n\x14\x43reateEntityResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1e\n\x06\x65ntity\x18\x03 \x01(\x0b\x32\x0e.entity.Entity" \n\x10GetEntityRequest\x12\x0c\n\x04name\x18\x01 \x01(\t"S\n\x11GetEntityResponse\x12\x1e\n\x06\x65ntity\x18\x01 \x01(\x0b\x32\x0e.entity.Entity\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t">\n\x1a\x42\x61tchCreateEntitiesRequest\x12 \n\x08\x65ntities\x18\x01 \x03(\x0b\x32\x0e.entity.Entity"N\n\x1b\x42\x61tchCreateEntitiesResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05"(\n\x17\x42\x61tchGetEntitiesRequest\x12\r\n\x05names\x18\x01 \x03(\t"M\n\x18\x42\x61tchGetEntitiesResponse\x12 \n\x08\x65ntities\x18\x01 \x03(\x0b\x32\x0e.entity.Entity\x12\x0f\n\x07missing\x18\x02 \x03(\t"=\n\x13ListEntitiesRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x13\n\x0bstart_after\x18\x02 \x01(\t2\x92\x03\n\rEntityService\x12I\n\x0c\x43reateEntity\x12\x1b.entity.CreateEntityRequest\x1a\x1c.entity.CreateEntityResponse\x12@\n\tGetEntity\x12\x18.entity.GetEntityRequest\x1a\x19.entity.GetEntityResponse\x12^\n\x13\x42\x61tchCreateEntities\x12".entity.BatchCreateEntitiesRequest\x1a#.entity.BatchCreateEntitiesResponse\x12U\n\x10\x42\x61tchGetEntities\x12\x1f.entity.BatchGetEntitiesRequest\x1a .entity.BatchGetEntitiesResponse\x12=\n\x0cListEntities\x12\x1b.entity.ListEntitiesRequest\x1a\x0e.entity.Entity0\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -35,6 +35,16 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_GETENTITYREQUEST"]._serialized_end = 251
     _globals["_GETENTITYRESPONSE"]._serialized_start = 253
     _globals["_GETENTITYRESPONSE"]._serialized_end = 336
-    _globals["_ENTITYSERVICE"]._serialized_start = 339
-    _globals["_ENTITYSERVICE"]._serialized_end = 495
+    _globals["_BATCHCREATEENTITIESREQUEST"]._serialized_start = 338
+    _globals["_BATCHCREATEENTITIESREQUEST"]._serialized_end = 400
+    _globals["_BATCHCREATEENTITIESRESPONSE"]._serialized_start = 402
+    _globals["_BATCHCREATEENTITIESRESPONSE"]._serialized_end = 480
+    _globals["_BATCHGETENTITIESREQUEST"]._serialized_start = 482
+    _globals["_BATCHGETENTITIESREQUEST"]._serialized_end = 522
+    _globals["_BATCHGETENTITIESRESPONSE"]._serialized_start = 524
+    _globals["_BATCHGETENTITIESRESPONSE"]._serialized_end = 601
+    _globals["_LISTENTITIESREQUEST"]._serialized_start = 603
+    _globals["_LISTENTITIESREQUEST"]._serialized_end = 664
+    _globals["_ENTITYSERVICE"]._serialized_start = 667
+    _globals["_ENTITYSERVICE"]._serialized_end = 1069
 # @@protoc_insertion_point(module_scope)
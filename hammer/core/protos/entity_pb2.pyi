@@ -125,3 +125,113 @@ class GetEntityResponse(google.protobuf.message.Message):
     ) -> None: ...
 
 global___GetEntityResponse = GetEntityResponse
+
+@typing.final
+class BatchCreateEntitiesRequest(google.protobuf.message.Message):
+    """批量创建 Entity 的请求消息, 所有 Entity 在一个事务中写入, 名称已存在时更新 join_keys"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    ENTITIES_FIELD_NUMBER: builtins.int
+    @property
+    def entities(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Entity]: ...
+    def __init__(
+        self,
+        *,
+        entities: collections.abc.Iterable[global___Entity] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["entities", b"entities"]) -> None: ...
+
+global___BatchCreateEntitiesRequest = BatchCreateEntitiesRequest
+
+@typing.final
+class BatchCreateEntitiesResponse(google.protobuf.message.Message):
+    """批量创建 Entity 的响应消息"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SUCCESS_FIELD_NUMBER: builtins.int
+    MESSAGE_FIELD_NUMBER: builtins.int
+    COUNT_FIELD_NUMBER: builtins.int
+    success: builtins.bool
+    message: builtins.str
+    count: builtins.int
+    """写入的条数"""
+    def __init__(
+        self,
+        *,
+        success: builtins.bool = ...,
+        message: builtins.str = ...,
+        count: builtins.int = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["count", b"count", "message", b"message", "success", b"success"]
+    ) -> None: ...
+
+global___BatchCreateEntitiesResponse = BatchCreateEntitiesResponse
+
+@typing.final
+class BatchGetEntitiesRequest(google.protobuf.message.Message):
+    """批量查询 Entity 的请求消息"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    NAMES_FIELD_NUMBER: builtins.int
+    @property
+    def names(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        names: collections.abc.Iterable[builtins.str] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["names", b"names"]) -> None: ...
+
+global___BatchGetEntitiesRequest = BatchGetEntitiesRequest
+
+@typing.final
+class BatchGetEntitiesResponse(google.protobuf.message.Message):
+    """批量查询 Entity 的响应消息"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    ENTITIES_FIELD_NUMBER: builtins.int
+    MISSING_FIELD_NUMBER: builtins.int
+    @property
+    def entities(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Entity]: ...
+    @property
+    def missing(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]:
+        """不存在的名称"""
+
+    def __init__(
+        self,
+        *,
+        entities: collections.abc.Iterable[global___Entity] | None = ...,
+        missing: collections.abc.Iterable[builtins.str] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["entities", b"entities", "missing", b"missing"]) -> None: ...
+
+global___BatchGetEntitiesResponse = BatchGetEntitiesResponse
+
+@typing.final
+class ListEntitiesRequest(google.protobuf.message.Message):
+    """按名称顺序分页遍历 Entity 的请求消息"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    PAGE_SIZE_FIELD_NUMBER: builtins.int
+    START_AFTER_FIELD_NUMBER: builtins.int
+    page_size: builtins.int
+    """每次查询数据库的条数, 默认 1000"""
+    start_after: builtins.str
+    """键集分页的起点, 只返回 name > start_after 的 Entity"""
+    def __init__(
+        self,
+        *,
+        page_size: builtins.int = ...,
+        start_after: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["page_size", b"page_size", "start_after", b"start_after"]
+    ) -> None: ...
+
+global___ListEntitiesRequest = ListEntitiesRequest
@@ -47,6 +47,24 @@ class EntityServiceStub(object):
             response_deserializer=entity__pb2.GetEntityResponse.FromString,
             _registered_method=True,
         )
+        self.BatchCreateEntities = channel.unary_unary(
+            "/entity.EntityService/BatchCreateEntities",
+            request_serializer=entity__pb2.BatchCreateEntitiesRequest.SerializeToString,
+            response_deserializer=entity__pb2.BatchCreateEntitiesResponse.FromString,
+            _registered_method=True,
+        )
+        self.BatchGetEntities = channel.unary_unary(
+            "/entity.EntityService/BatchGetEntities",
+            request_serializer=entity__pb2.BatchGetEntitiesRequest.SerializeToString,
+            response_deserializer=entity__pb2.BatchGetEntitiesResponse.FromString,
+            _registered_method=True,
+        )
+        self.ListEntities = channel.unary_stream(
+            "/entity.EntityService/ListEntities",
+            request_serializer=entity__pb2.ListEntitiesRequest.SerializeToString,
+            response_deserializer=entity__pb2.Entity.FromString,
+            _registered_method=True,
+        )
 
 
 class EntityServiceServicer(object):
@@ -64,6 +82,24 @@ class EntityServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def BatchCreateEntities(self, request, context):
+        """批量创建 Entity"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def BatchGetEntities(self, request, context):
+        """批量查询 Entity"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def ListEntities(self, request, context):
+        """按名称顺序流式返回所有 Entity"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_EntityServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -77,6 +113,21 @@ def add_EntityServiceServicer_to_server(servicer, server):
             request_deserializer=entity__pb2.GetEntityRequest.FromString,
             response_serializer=entity__pb2.GetEntityResponse.SerializeToString,
         ),
+        "BatchCreateEntities": grpc.unary_unary_rpc_method_handler(
+            servicer.BatchCreateEntities,
+            request_deserializer=entity__pb2.BatchCreateEntitiesRequest.FromString,
+            response_serializer=entity__pb2.BatchCreateEntitiesResponse.SerializeToString,
+        ),
+        "BatchGetEntities": grpc.unary_unary_rpc_method_handler(
+            servicer.BatchGetEntities,
+            request_deserializer=entity__pb2.BatchGetEntitiesRequest.FromString,
+            response_serializer=entity__pb2.BatchGetEntitiesResponse.SerializeToString,
+        ),
+        "ListEntities": grpc.unary_stream_rpc_method_handler(
+            servicer.ListEntities,
+            request_deserializer=entity__pb2.ListEntitiesRequest.FromString,
+            response_serializer=entity__pb2.Entity.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler("entity.EntityService", rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
@@ -146,3 +197,93 @@ class EntityService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def BatchCreateEntities(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/entity.EntityService/BatchCreateEntities",
+            entity__pb2.BatchCreateEntitiesRequest.SerializeToString,
+            entity__pb2.BatchCreateEntitiesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def BatchGetEntities(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/entity.EntityService/BatchGetEntities",
+            entity__pb2.BatchGetEntitiesRequest.SerializeToString,
+            entity__pb2.BatchGetEntitiesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def ListEntities(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/entity.EntityService/ListEntities",
+            entity__pb2.ListEntitiesRequest.SerializeToString,
+            entity__pb2.Entity.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -2,7 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # NO CHECKED-IN PROTOBUF GENCODE
 # source: protos/feature.proto
-# Protobuf Python Version: 5.29.3
+# Protobuf Python Version: 5.29.0
 """Generated protocol buffer code."""
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
@@ -10,14 +10,17 @@ from google.protobuf import runtime_version as _runtime_version
 from google.protobuf import symbol_database as _symbol_database
 from google.protobuf.internal import builder as _builder
 
-_runtime_version.ValidateProtobufRuntimeVersion(_runtime_version.Domain.PUBLIC, 5, 29, 3, "", "protos/feature.proto")
+_runtime_version.ValidateProtobufRuntimeVersion(_runtime_version.Domain.PUBLIC, 5, 29, 0, "", "protos/feature.proto")
 # @@protoc_insertion_point(imports)
 
 _sym_db = _symbol_database.Default()
 
 
+from . import entity_pb2 as protos_dot_entity__pb2  # noqa: E402, F401
+from . import source_pb2 as protos_dot_source__pb2  # noqa: E402, F401
+
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x14protos/feature.proto\x12\x07\x66\x65\x61ture\x1a\x13protos/source.proto\x1a\x13protos/entity.proto"\xc9\x03\n\x07\x46\x65\x61ture\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x1e\n\x06source\x18\x03 \x01(\x0b\x32\x0e.source.Source\x12\x1e\n\x06\x65ntity\x18\x04 \x01(\x0b\x32\x0e.entity.Entity\x12\x1d\n\x15\x65vent_timestamp_field\x18\x05 \x01(\t\x12\x1c\n\x14start_event_datetime\x18\x06 \x01(\t\x12\x1a\n\x12\x65nd_event_datetime\x18\x07 \x01(\t\x12\x0b\n\x03ttl\x18\x08 \x01(\x03\x12,\n\x06schema\x18\t \x03(\x0b\x32\x1c.feature.Feature.SchemaEntry\x12(\n\x04sink\x18\n \x03(\x0b\x32\x1a.feature.Feature.SinkEntry\x12\x11\n\ttransform\x18\x0b \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x0c \x01(\t\x12\r\n\x05owner\x18\r \x01(\t\x12\x0e\n\x06status\x18\x0e \x01(\t\x1a-\n\x0bSchemaEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a+\n\tSinkEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x62\x06proto3'
+    b'\n\x14protos/feature.proto\x12\x07\x66\x65\x61ture\x1a\x13protos/source.proto\x1a\x13protos/entity.proto"\xc9\x03\n\x07\x46\x65\x61ture\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x1e\n\x06source\x18\x03 \x01(\x0b\x32\x0e.source.Source\x12\x1e\n\x06\x65ntity\x18\x04 \x01(\x0b\x32\x0e.entity.Entity\x12\x1d\n\x15\x65vent_timestamp_field\x18\x05 \x01(\t\x12\x1c\n\x14start_event_datetime\x18\x06 \x01(\t\x12\x1a\n\x12\x65nd_event_datetime\x18\x07 \x01(\t\x12\x0b\n\x03ttl\x18\x08 \x01(\x03\x12,\n\x06schema\x18\t \x03(\x0b\x32\x1c.feature.Feature.SchemaEntry\x12(\n\x04sink\x18\n \x03(\x0b\x32\x1a.feature.Feature.SinkEntry\x12\x11\n\ttransform\x18\x0b \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x0c \x01(\t\x12\r\n\x05owner\x18\r \x01(\t\x12\x0e\n\x06status\x18\x0e \x01(\t\x1a-\n\x0bSchemaEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a+\n\tSinkEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01"\x1b\n\tEntityKey\x12\x0e\n\x06values\x18\x01 \x03(\t"y\n\rFeatureColumn\x12\x13\n\x0b\x62ool_values\x18\x01 \x03(\x08\x12\x14\n\x0cint64_values\x18\x02 \x03(\x03\x12\x15\n\rdouble_values\x18\x03 \x03(\x01\x12\x15\n\rstring_values\x18\x04 \x03(\t\x12\x0f\n\x07is_null\x18\x05 \x03(\x08"Z\n\x18GetOnlineFeaturesRequest\x12\'\n\x0b\x65ntity_keys\x18\x01 \x03(\x0b\x32\x12.feature.EntityKey\x12\x15\n\rfeature_names\x18\x02 \x03(\t"k\n\x19GetOnlineFeaturesResponse\x12\x15\n\rfeature_names\x18\x01 \x03(\t\x12(\n\x08\x66\x65\x61tures\x18\x02 \x03(\x0b\x32\x16.feature.FeatureColumn\x12\r\n\x05\x66ound\x18\x03 \x03(\x08\x32l\n\x0e\x46\x65\x61tureService\x12Z\n\x11GetOnlineFeatures\x12!.feature.GetOnlineFeaturesRequest\x1a".feature.GetOnlineFeaturesResponseb\x06proto3'
 )
 
 _globals = globals()
@@ -35,4 +38,14 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_FEATURE_SCHEMAENTRY"]._serialized_end = 488
     _globals["_FEATURE_SINKENTRY"]._serialized_start = 490
     _globals["_FEATURE_SINKENTRY"]._serialized_end = 533
+    _globals["_ENTITYKEY"]._serialized_start = 535
+    _globals["_ENTITYKEY"]._serialized_end = 562
+    _globals["_FEATURECOLUMN"]._serialized_start = 564
+    _globals["_FEATURECOLUMN"]._serialized_end = 685
+    _globals["_GETONLINEFEATURESREQUEST"]._serialized_start = 687
+    _globals["_GETONLINEFEATURESREQUEST"]._serialized_end = 777
+    _globals["_GETONLINEFEATURESRESPONSE"]._serialized_start = 779
+    _globals["_GETONLINEFEATURESRESPONSE"]._serialized_end = 886
+    _globals["_FEATURESERVICE"]._serialized_start = 888
+    _globals["_FEATURESERVICE"]._serialized_end = 996
 # @@protoc_insertion_point(module_scope)
@@ -156,3 +156,134 @@ class Feature(google.protobuf.message.Message):
     ) -> None: ...
 
 global___Feature = Feature
+
+@typing.final
+class EntityKey(google.protobuf.message.Message):
+    """实体主键的取值, 与 Entity.join_keys 的顺序一致, 统一使用字符串表示"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    VALUES_FIELD_NUMBER: builtins.int
+    @property
+    def values(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    def __init__(
+        self,
+        *,
+        values: collections.abc.Iterable[builtins.str] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["values", b"values"]) -> None: ...
+
+global___EntityKey = EntityKey
+
+@typing.final
+class FeatureColumn(google.protobuf.message.Message):
+    """一个特征在所有实体上的取值, 与请求中的 entity_keys 一一对应.
+    按特征的类型只设置一个 *_values, 空值或者实体不存在时 is_null 为 true, *_values 中对应位置为默认值;
+    没有空值时 is_null 为空
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    BOOL_VALUES_FIELD_NUMBER: builtins.int
+    INT64_VALUES_FIELD_NUMBER: builtins.int
+    DOUBLE_VALUES_FIELD_NUMBER: builtins.int
+    STRING_VALUES_FIELD_NUMBER: builtins.int
+    IS_NULL_FIELD_NUMBER: builtins.int
+    @property
+    def bool_values(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.bool]: ...
+    @property
+    def int64_values(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]: ...
+    @property
+    def double_values(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.float]: ...
+    @property
+    def string_values(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    @property
+    def is_null(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.bool]: ...
+    def __init__(
+        self,
+        *,
+        bool_values: collections.abc.Iterable[builtins.bool] | None = ...,
+        int64_values: collections.abc.Iterable[builtins.int] | None = ...,
+        double_values: collections.abc.Iterable[builtins.float] | None = ...,
+        string_values: collections.abc.Iterable[builtins.str] | None = ...,
+        is_null: collections.abc.Iterable[builtins.bool] | None = ...,
+    ) -> None: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "bool_values",
+            b"bool_values",
+            "double_values",
+            b"double_values",
+            "int64_values",
+            b"int64_values",
+            "is_null",
+            b"is_null",
+            "string_values",
+            b"string_values",
+        ],
+    ) -> None: ...
+
+global___FeatureColumn = FeatureColumn
+
+@typing.final
+class GetOnlineFeaturesRequest(google.protobuf.message.Message):
+    """批量查询在线特征的请求消息"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    ENTITY_KEYS_FIELD_NUMBER: builtins.int
+    FEATURE_NAMES_FIELD_NUMBER: builtins.int
+    @property
+    def entity_keys(
+        self,
+    ) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___EntityKey]: ...
+    @property
+    def feature_names(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]:
+        """ "特征视图:列名", 例如 "user_amount:total" """
+
+    def __init__(
+        self,
+        *,
+        entity_keys: collections.abc.Iterable[global___EntityKey] | None = ...,
+        feature_names: collections.abc.Iterable[builtins.str] | None = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["entity_keys", b"entity_keys", "feature_names", b"feature_names"]
+    ) -> None: ...
+
+global___GetOnlineFeaturesRequest = GetOnlineFeaturesRequest
+
+@typing.final
+class GetOnlineFeaturesResponse(google.protobuf.message.Message):
+    """批量查询在线特征的响应消息
+    按列返回, 避免为每个特征值创建一个消息
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    FEATURE_NAMES_FIELD_NUMBER: builtins.int
+    FEATURES_FIELD_NUMBER: builtins.int
+    FOUND_FIELD_NUMBER: builtins.int
+    @property
+    def feature_names(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]: ...
+    @property
+    def features(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FeatureColumn]:
+        """与 feature_names 一一对应"""
+
+    @property
+    def found(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.bool]:
+        """与 entity_keys 一一对应, 在线存储中是否有该实体的任意一个特征"""
+
+    def __init__(
+        self,
+        *,
+        feature_names: collections.abc.Iterable[builtins.str] | None = ...,
+        features: collections.abc.Iterable[global___FeatureColumn] | None = ...,
+        found: collections.abc.Iterable[builtins.bool] | None = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["feature_names", b"feature_names", "features", b"features", "found", b"found"]
+    ) -> None: ...
+
+global___GetOnlineFeaturesResponse = GetOnlineFeaturesResponse
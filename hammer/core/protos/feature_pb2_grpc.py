@@ -3,6 +3,8 @@
 
 import grpc
 
+from . import feature_pb2 as protos_dot_feature__pb2
+
 GRPC_GENERATED_VERSION = "1.71.0"
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
@@ -22,3 +24,78 @@ if _version_not_supported:
         + f" Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}"
         + f" or downgrade your generated code using grpcio-tools<={GRPC_VERSION}."
     )
+
+
+class FeatureServiceStub(object):
+    """Feature 服务定义"""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.GetOnlineFeatures = channel.unary_unary(
+            "/feature.FeatureService/GetOnlineFeatures",
+            request_serializer=protos_dot_feature__pb2.GetOnlineFeaturesRequest.SerializeToString,
+            response_deserializer=protos_dot_feature__pb2.GetOnlineFeaturesResponse.FromString,
+            _registered_method=True,
+        )
+
+
+class FeatureServiceServicer(object):
+    """Feature 服务定义"""
+
+    def GetOnlineFeatures(self, request, context):
+        """批量查询实体最新的特征值"""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+
+def add_FeatureServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+        "GetOnlineFeatures": grpc.unary_unary_rpc_method_handler(
+            servicer.GetOnlineFeatures,
+            request_deserializer=protos_dot_feature__pb2.GetOnlineFeaturesRequest.FromString,
+            response_serializer=protos_dot_feature__pb2.GetOnlineFeaturesResponse.SerializeToString,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler("feature.FeatureService", rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers("feature.FeatureService", rpc_method_handlers)
+
+
+# This class is part of an EXPERIMENTAL API.
+class FeatureService(object):
+    """Feature 服务定义"""
+
+    @staticmethod
+    def GetOnlineFeatures(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/feature.FeatureService/GetOnlineFeatures",
+            protos_dot_feature__pb2.GetOnlineFeaturesRequest.SerializeToString,
+            protos_dot_feature__pb2.GetOnlineFeaturesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
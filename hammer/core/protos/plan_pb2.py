@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protos/plan.proto
+# Protobuf Python Version: 5.29.0
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+
+_runtime_version.ValidateProtobufRuntimeVersion(_runtime_version.Domain.PUBLIC, 5, 29, 0, "", "protos/plan.proto")
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
+    b'\n\x11protos/plan.proto\x12\x04plan"\xcc\x01\n\x05Value\x12\x14\n\nnull_value\x18\x01 \x01(\x08H\x00\x12\x14\n\nbool_value\x18\x02 \x01(\x08H\x00\x12\x13\n\tint_value\x18\x03 \x01(\x12H\x00\x12\x16\n\x0c\x64ouble_value\x18\x04 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x05 \x01(\rH\x00\x12%\n\nlist_value\x18\x06 \x01(\x0b\x32\x0f.plan.ValueListH\x00\x12#\n\tmap_value\x18\x07 \x01(\x0b\x32\x0e.plan.ValueMapH\x00\x42\x06\n\x04kind":\n\tValueList\x12\x1b\n\x06values\x18\x01 \x03(\x0b\x32\x0b.plan.Value\x12\x10\n\x08is_tuple\x18\x02 \x01(\x08"5\n\x08ValueMap\x12\x0c\n\x04keys\x18\x01 \x03(\r\x12\x1b\n\x06values\x18\x02 \x03(\x0b\x32\x0b.plan.Value";\n\x08\x44\x61taNode\x12\x0c\n\x04name\x18\x01 \x01(\r\x12\x11\n\tdata_type\x18\x02 \x01(\r\x12\x0e\n\x06source\x18\x03 \x01(\r"\xc7\x01\n\rOperationNode\x12\x15\n\rfunction_name\x18\x01 \x01(\r\x12$\n\x0fpositional_args\x18\x02 \x01(\x0b\x32\x0b.plan.Value\x12!\n\x0ckeyword_args\x18\x03 \x01(\x0b\x32\x0b.plan.Value\x12\x1f\n\ntarget_ops\x18\x04 \x01(\x0b\x32\x0b.plan.Value\x12\x15\n\x08udf_name\x18\x05 \x01(\rH\x00\x88\x01\x01\x12\x11\n\tudf_block\x18\x06 \x01(\rB\x0b\n\t_udf_name"\xb1\x01\n\x04Plan\x12\x0f\n\x07strings\x18\x01 \x03(\t\x12\x1c\n\x04\x64\x61ta\x18\x02 \x03(\x0b\x32\x0e.plan.DataNode\x12 \n\x03ops\x18\x03 \x03(\x0b\x32\x13.plan.OperationNode\x12\x12\n\nnode_names\x18\x04 \x03(\r\x12"\n\nnode_types\x18\x05 \x03(\x0e\x32\x0e.plan.NodeType\x12\x11\n\tnode_objs\x18\x06 \x03(\r\x12\r\n\x05\x65\x64ges\x18\x07 \x03(\r*-\n\x08NodeType\x12\x08\n\x04NONE\x10\x00\x12\x08\n\x04\x44\x41TA\x10\x01\x12\r\n\tOPERATION\x10\x02\x62\x06proto3'
+)
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "protos.plan_pb2", _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+    DESCRIPTOR._loaded_options = None
+    _globals["_NODETYPE"]._serialized_start = 792
+    _globals["_NODETYPE"]._serialized_end = 837
+    _globals["_VALUE"]._serialized_start = 28
+    _globals["_VALUE"]._serialized_end = 232
+    _globals["_VALUELIST"]._serialized_start = 234
+    _globals["_VALUELIST"]._serialized_end = 292
+    _globals["_VALUEMAP"]._serialized_start = 294
+    _globals["_VALUEMAP"]._serialized_end = 347
+    _globals["_DATANODE"]._serialized_start = 349
+    _globals["_DATANODE"]._serialized_end = 408
+    _globals["_OPERATIONNODE"]._serialized_start = 411
+    _globals["_OPERATIONNODE"]._serialized_end = 610
+    _globals["_PLAN"]._serialized_start = 613
+    _globals["_PLAN"]._serialized_end = 790
+# @@protoc_insertion_point(module_scope)
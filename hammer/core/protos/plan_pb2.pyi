@@ -0,0 +1,334 @@
+"""
+@generated by mypy-protobuf.  Do not edit manually!
+isort:skip_file
+"""
+
+import builtins
+import collections.abc
+import google.protobuf.descriptor
+import google.protobuf.internal.containers
+import google.protobuf.internal.enum_type_wrapper
+import google.protobuf.message
+import sys
+import typing
+
+if sys.version_info >= (3, 10):
+    import typing as typing_extensions
+else:
+    import typing_extensions
+
+DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
+
+class _NodeType:
+    ValueType = typing.NewType("ValueType", builtins.int)
+    V: typing_extensions.TypeAlias = ValueType
+
+class _NodeTypeEnumTypeWrapper(
+    google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[_NodeType.ValueType], builtins.type
+):
+    DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    NONE: _NodeType.ValueType  # 0
+    """没有属性的节点, 例如数据文件路径"""
+    DATA: _NodeType.ValueType  # 1
+    OPERATION: _NodeType.ValueType  # 2
+
+class NodeType(_NodeType, metaclass=_NodeTypeEnumTypeWrapper): ...
+
+NONE: NodeType.ValueType  # 0
+"""没有属性的节点, 例如数据文件路径"""
+DATA: NodeType.ValueType  # 1
+OPERATION: NodeType.ValueType  # 2
+global___NodeType = NodeType
+
+@typing.final
+class Value(google.protobuf.message.Message):
+    """LogicalPlan 的二进制格式, 节点名, 算子名等字符串都保存在 Plan.strings 中, 其他位置只保存下标"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    NULL_VALUE_FIELD_NUMBER: builtins.int
+    BOOL_VALUE_FIELD_NUMBER: builtins.int
+    INT_VALUE_FIELD_NUMBER: builtins.int
+    DOUBLE_VALUE_FIELD_NUMBER: builtins.int
+    STRING_VALUE_FIELD_NUMBER: builtins.int
+    LIST_VALUE_FIELD_NUMBER: builtins.int
+    MAP_VALUE_FIELD_NUMBER: builtins.int
+    null_value: builtins.bool
+    """None"""
+    bool_value: builtins.bool
+    int_value: builtins.int
+    double_value: builtins.float
+    string_value: builtins.int
+    """Plan.strings 的下标"""
+    @property
+    def list_value(self) -> global___ValueList: ...
+    @property
+    def map_value(self) -> global___ValueMap: ...
+    def __init__(
+        self,
+        *,
+        null_value: builtins.bool = ...,
+        bool_value: builtins.bool = ...,
+        int_value: builtins.int = ...,
+        double_value: builtins.float = ...,
+        string_value: builtins.int = ...,
+        list_value: global___ValueList | None = ...,
+        map_value: global___ValueMap | None = ...,
+    ) -> None: ...
+    def HasField(
+        self,
+        field_name: typing.Literal[
+            "bool_value",
+            b"bool_value",
+            "double_value",
+            b"double_value",
+            "int_value",
+            b"int_value",
+            "kind",
+            b"kind",
+            "list_value",
+            b"list_value",
+            "map_value",
+            b"map_value",
+            "null_value",
+            b"null_value",
+            "string_value",
+            b"string_value",
+        ],
+    ) -> builtins.bool: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "bool_value",
+            b"bool_value",
+            "double_value",
+            b"double_value",
+            "int_value",
+            b"int_value",
+            "kind",
+            b"kind",
+            "list_value",
+            b"list_value",
+            "map_value",
+            b"map_value",
+            "null_value",
+            b"null_value",
+            "string_value",
+            b"string_value",
+        ],
+    ) -> None: ...
+    def WhichOneof(
+        self, oneof_group: typing.Literal["kind", b"kind"]
+    ) -> (
+        typing.Literal[
+            "null_value", "bool_value", "int_value", "double_value", "string_value", "list_value", "map_value"
+        ]
+        | None
+    ): ...
+
+global___Value = Value
+
+@typing.final
+class ValueList(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    VALUES_FIELD_NUMBER: builtins.int
+    IS_TUPLE_FIELD_NUMBER: builtins.int
+    is_tuple: builtins.bool
+    @property
+    def values(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Value]: ...
+    def __init__(
+        self,
+        *,
+        values: collections.abc.Iterable[global___Value] | None = ...,
+        is_tuple: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["is_tuple", b"is_tuple", "values", b"values"]) -> None: ...
+
+global___ValueList = ValueList
+
+@typing.final
+class ValueMap(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    KEYS_FIELD_NUMBER: builtins.int
+    VALUES_FIELD_NUMBER: builtins.int
+    @property
+    def keys(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]:
+        """Plan.strings 的下标"""
+
+    @property
+    def values(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Value]: ...
+    def __init__(
+        self,
+        *,
+        keys: collections.abc.Iterable[builtins.int] | None = ...,
+        values: collections.abc.Iterable[global___Value] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["keys", b"keys", "values", b"values"]) -> None: ...
+
+global___ValueMap = ValueMap
+
+@typing.final
+class DataNode(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    NAME_FIELD_NUMBER: builtins.int
+    DATA_TYPE_FIELD_NUMBER: builtins.int
+    SOURCE_FIELD_NUMBER: builtins.int
+    name: builtins.int
+    data_type: builtins.int
+    source: builtins.int
+    def __init__(
+        self,
+        *,
+        name: builtins.int = ...,
+        data_type: builtins.int = ...,
+        source: builtins.int = ...,
+    ) -> None: ...
+    def ClearField(
+        self, field_name: typing.Literal["data_type", b"data_type", "name", b"name", "source", b"source"]
+    ) -> None: ...
+
+global___DataNode = DataNode
+
+@typing.final
+class OperationNode(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    FUNCTION_NAME_FIELD_NUMBER: builtins.int
+    POSITIONAL_ARGS_FIELD_NUMBER: builtins.int
+    KEYWORD_ARGS_FIELD_NUMBER: builtins.int
+    TARGET_OPS_FIELD_NUMBER: builtins.int
+    UDF_NAME_FIELD_NUMBER: builtins.int
+    UDF_BLOCK_FIELD_NUMBER: builtins.int
+    function_name: builtins.int
+    udf_name: builtins.int
+    udf_block: builtins.int
+    @property
+    def positional_args(self) -> global___Value: ...
+    @property
+    def keyword_args(self) -> global___Value: ...
+    @property
+    def target_ops(self) -> global___Value: ...
+    def __init__(
+        self,
+        *,
+        function_name: builtins.int = ...,
+        positional_args: global___Value | None = ...,
+        keyword_args: global___Value | None = ...,
+        target_ops: global___Value | None = ...,
+        udf_name: builtins.int | None = ...,
+        udf_block: builtins.int = ...,
+    ) -> None: ...
+    def HasField(
+        self,
+        field_name: typing.Literal[
+            "_udf_name",
+            b"_udf_name",
+            "keyword_args",
+            b"keyword_args",
+            "positional_args",
+            b"positional_args",
+            "target_ops",
+            b"target_ops",
+            "udf_name",
+            b"udf_name",
+        ],
+    ) -> builtins.bool: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "_udf_name",
+            b"_udf_name",
+            "function_name",
+            b"function_name",
+            "keyword_args",
+            b"keyword_args",
+            "positional_args",
+            b"positional_args",
+            "target_ops",
+            b"target_ops",
+            "udf_block",
+            b"udf_block",
+            "udf_name",
+            b"udf_name",
+        ],
+    ) -> None: ...
+    def WhichOneof(
+        self, oneof_group: typing.Literal["_udf_name", b"_udf_name"]
+    ) -> typing.Literal["udf_name"] | None: ...
+
+global___OperationNode = OperationNode
+
+@typing.final
+class Plan(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    STRINGS_FIELD_NUMBER: builtins.int
+    DATA_FIELD_NUMBER: builtins.int
+    OPS_FIELD_NUMBER: builtins.int
+    NODE_NAMES_FIELD_NUMBER: builtins.int
+    NODE_TYPES_FIELD_NUMBER: builtins.int
+    NODE_OBJS_FIELD_NUMBER: builtins.int
+    EDGES_FIELD_NUMBER: builtins.int
+    @property
+    def strings(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]:
+        """字符串表"""
+
+    @property
+    def data(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___DataNode]:
+        """数据节点表, 属性相同的节点只保存一次"""
+
+    @property
+    def ops(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___OperationNode]:
+        """算子表, 参数相同的算子只保存一次"""
+
+    @property
+    def node_names(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]:
+        """节点名在 strings 中的下标"""
+
+    @property
+    def node_types(
+        self,
+    ) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[global___NodeType.ValueType]: ...
+    @property
+    def node_objs(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]:
+        """节点属性在 data 或者 ops 中的下标"""
+
+    @property
+    def edges(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]:
+        """边的两个端点在节点中的下标, 依次排列"""
+
+    def __init__(
+        self,
+        *,
+        strings: collections.abc.Iterable[builtins.str] | None = ...,
+        data: collections.abc.Iterable[global___DataNode] | None = ...,
+        ops: collections.abc.Iterable[global___OperationNode] | None = ...,
+        node_names: collections.abc.Iterable[builtins.int] | None = ...,
+        node_types: collections.abc.Iterable[global___NodeType.ValueType] | None = ...,
+        node_objs: collections.abc.Iterable[builtins.int] | None = ...,
+        edges: collections.abc.Iterable[builtins.int] | None = ...,
+    ) -> None: ...
+    def ClearField(
+        self,
+        field_name: typing.Literal[
+            "data",
+            b"data",
+            "edges",
+            b"edges",
+            "node_names",
+            b"node_names",
+            "node_objs",
+            b"node_objs",
+            "node_types",
+            b"node_types",
+            "ops",
+            b"ops",
+            "strings",
+            b"strings",
+        ],
+    ) -> None: ...
+
+global___Plan = Plan
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import text
+
+_MISSING = object()
+
+
+class TTLCache(object):
+    """有容量上限的 TTL + LRU 缓存, 用于 gRPC 服务中很少变化的元数据查询.
+
+    条目超过 ttl 秒后失效, 条目数超过 maxsize 时淘汰最久没有被访问的条目. 写操作需要调用 invalidate,
+    多副本部署时通过 PostgreSQL 的 LISTEN/NOTIFY 通知其他副本 (见 listen_invalidations).
+    命中和未命中次数通过 stats 获取, report_stats 定期把它们写入日志.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300, timer: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING and item[0] > self.timer():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self.timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, keys: Optional[Iterable[Hashable]] = None) -> None:
+        """删除指定的条目, keys 为空时清空缓存"""
+        with self._lock:
+            if keys is None:
+                self._data.clear()
+                return
+            for key in keys:
+                self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+        }
+
+
+async def report_stats(cache: TTLCache, name: str, interval: float = 60) -> None:
+    """每隔 interval 秒把缓存的命中统计写入日志. 该协程一直运行直到被取消."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info(f"Cache {name} stats: {cache.stats()}")
+
+
+async def notify_invalidation(session: Any, channel: str, key: str) -> None:
+    """在 session 当前的事务中发送失效通知.
+
+    调用方需要在写操作所在的事务提交之前调用: PostgreSQL 在事务提交时才投递通知, 回滚时丢弃,
+    因此其他副本收到通知时新数据已经可见, 也不会出现写入成功但通知丢失的情况.
+    """
+    await session.execute(text("SELECT pg_notify(:channel, :key)"), {"channel": channel, "key": key})
+
+
+async def listen_invalidations(dsn: str, channel: str, cache: TTLCache) -> None:
+    """监听 channel 上的失效通知并删除对应的缓存条目, 通知内容是缓存的 key. 该协程一直运行直到被取消."""
+    connection = await asyncpg.connect(dsn)
+
+    def on_notify(connection, pid, channel, payload):
+        logger.debug(f"Invalidate cache {payload} from pid {pid}")
+        cache.invalidate([payload])
+
+    await connection.add_listener(channel, on_notify)
+    try:
+        await asyncio.Future()
+    finally:
+        await connection.remove_listener(channel, on_notify)
+        await connection.close()
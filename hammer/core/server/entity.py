@@ -1,3 +1,6 @@
+import asyncio
+from typing import List
+
 import grpc
 from grpc import aio
 from sqlalchemy import select
@@ -6,6 +9,7 @@ from ...config import CONF
 from ...core.engine_utils import Postgres
 from ..datahub.entity import Entity as EntityORM
 from ..protos import entity_pb2, entity_pb2_grpc
+from .cache import TTLCache, listen_invalidations, notify_invalidation, report_stats
 
 db_config = CONF.infra["postgresql"]["hammer_meta"]
 DB_NAME = "hammer"
@@ -13,39 +17,121 @@ db = Postgres(**db_config, database=DB_NAME)
 
 
 class EntityService(entity_pb2_grpc.EntityServiceServicer):
+    """Entity 元数据服务, 查询结果缓存在进程内, 写操作使对应的缓存失效.
+
+    notify_channel 不为空时, 写操作还会在同一个事务中通过 pg_notify 通知其他副本, 其他副本需要运行
+    listen_invalidations. 本副本的缓存在事务提交后失效; 提交前读到旧值并写回缓存的并发查询最多保留 ttl 秒.
+    """
+
+    def __init__(self, cache: TTLCache = None, notify_channel: str = None):
+        self.cache = cache if cache is not None else TTLCache()
+        self.notify_channel = notify_channel
+
+    async def _notify(self, session, names: List[str]) -> None:
+        """在写操作的事务提交前调用, 通知随事务一起提交"""
+        if self.notify_channel:
+            for name in names:
+                await notify_invalidation(session, self.notify_channel, name)
+
     async def CreateEntity(self, request: entity_pb2.CreateEntityRequest, context) -> entity_pb2.CreateEntityResponse:
         async with db.get_db_session() as session:
             # 创建新实体
             new_entity = EntityORM(name=request.entity.name, join_keys=list(request.entity.join_keys))
             session.add(new_entity)
+            await self._notify(session, [request.entity.name])
             await session.commit()
             await session.refresh(new_entity)
+        self.cache.invalidate([request.entity.name])
 
-            # 返回响应
-            return entity_pb2.CreateEntityResponse(
-                success=True,
-                message="创建成功!",
-                entity=entity_pb2.Entity(name=request.entity.name, join_keys=list(request.entity.join_keys)),
-            )
+        # 返回响应
+        return entity_pb2.CreateEntityResponse(
+            success=True,
+            message="创建成功!",
+            entity=entity_pb2.Entity(name=request.entity.name, join_keys=list(request.entity.join_keys)),
+        )
 
     async def GetEntity(self, request: entity_pb2.GetEntityRequest, context) -> entity_pb2.GetEntityResponse:
-        async with db.get_db_session() as session:
-            # 根据查询条件构建查询
-            stmt = select(EntityORM).where(EntityORM.name == request.name)
-            result = await session.execute(stmt)
-            entity = result.scalar_one_or_none()
+        join_keys = self.cache.get(request.name)
+        if join_keys is None:
+            async with db.get_db_session() as session:
+                # 根据查询条件构建查询
+                stmt = select(EntityORM).where(EntityORM.name == request.name)
+                result = await session.execute(stmt)
+                entity = result.scalar_one_or_none()
 
             # 如果未找到实体
             if entity is None:
                 await context.abort(grpc.StatusCode.NOT_FOUND, "Entity not found")
+            join_keys = list(entity.join_keys)
+            self.cache.set(request.name, join_keys)
+
+        # 返回响应
+        return entity_pb2.GetEntityResponse(entity=entity_pb2.Entity(name=request.name, join_keys=join_keys))
+
+    async def BatchCreateEntities(
+        self, request: entity_pb2.BatchCreateEntitiesRequest, context
+    ) -> entity_pb2.BatchCreateEntitiesResponse:
+        # 同一条 INSERT ... ON CONFLICT 中不能出现重复的主键, 同名的 Entity 保留最后一个
+        entities = {entity.name: list(entity.join_keys) for entity in request.entities}
+        if not entities:
+            return entity_pb2.BatchCreateEntitiesResponse(success=True, message="没有需要创建的 Entity", count=0)
+        data = [{"name": name, "join_keys": join_keys} for name, join_keys in entities.items()]
+        async with db.get_db_session() as session:
+            count = await db.write(EntityORM.__tablename__, data, upsert=True, session=session)
+            await self._notify(session, list(entities))
+            await session.commit()
+        self.cache.invalidate(list(entities))
+        return entity_pb2.BatchCreateEntitiesResponse(success=True, message="创建成功!", count=count)
+
+    async def BatchGetEntities(
+        self, request: entity_pb2.BatchGetEntitiesRequest, context
+    ) -> entity_pb2.BatchGetEntitiesResponse:
+        names = list(dict.fromkeys(request.names))
+        found = {}
+        for name in names:
+            join_keys = self.cache.get(name)
+            if join_keys is not None:
+                found[name] = join_keys
+        misses = [name for name in names if name not in found]
+        if misses:
+            async with db.get_db_session() as session:
+                result = await session.execute(select(EntityORM).where(EntityORM.name.in_(misses)))
+                for entity in result.scalars():
+                    found[entity.name] = list(entity.join_keys)
+                    self.cache.set(entity.name, found[entity.name])
+        return entity_pb2.BatchGetEntitiesResponse(
+            entities=[entity_pb2.Entity(name=n, join_keys=found[n]) for n in names if n in found],
+            missing=[n for n in names if n not in found],
+        )
 
-            # 返回响应
-            return entity_pb2.GetEntityResponse(entity=entity_pb2.Entity(name=entity.name, join_keys=entity.join_keys))
+    async def ListEntities(self, request: entity_pb2.ListEntitiesRequest, context):
+        """按名称的键集分页, 每页一次查询, 不使用 OFFSET, 翻页代价与页码无关"""
+        page_size = request.page_size or 1000
+        last_name = request.start_after
+        while True:
+            async with db.get_db_session() as session:
+                stmt = select(EntityORM).where(EntityORM.name > last_name).order_by(EntityORM.name).limit(page_size)
+                entities = (await session.execute(stmt)).scalars().all()
+            for entity in entities:
+                yield entity_pb2.Entity(name=entity.name, join_keys=entity.join_keys)
+            if len(entities) < page_size:
+                break
+            last_name = entities[-1].name
 
 
-async def entity_serve():
+async def entity_serve(notify_channel: str = None):
+    service = EntityService(notify_channel=notify_channel)
     server = aio.server()
-    entity_pb2_grpc.add_EntityServiceServicer_to_server(EntityService(), server)
+    entity_pb2_grpc.add_EntityServiceServicer_to_server(service, server)
     server.add_insecure_port("[::]:50051")
     await server.start()
-    await server.wait_for_termination()
+    reporter = asyncio.create_task(report_stats(service.cache, "entity"))
+    if notify_channel:
+        # 接收其他副本的写操作通知
+        listener = asyncio.create_task(listen_invalidations(db.dsn, notify_channel, service.cache))
+    try:
+        await server.wait_for_termination()
+    finally:
+        reporter.cancel()
+        if notify_channel:
+            listener.cancel()
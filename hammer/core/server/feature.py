@@ -0,0 +1,58 @@
+from typing import Any, List
+
+import grpc
+from grpc import aio
+
+from ...feature.online_store import SQLiteOnlineStore, entity_key
+from ..protos import feature_pb2, feature_pb2_grpc
+
+# 空值在 *_values 中的占位值
+_DEFAULTS = {"bool": False, "int64": 0, "double": 0.0, "string": ""}
+
+
+def _to_column(values: List[Any], kind: str) -> feature_pb2.FeatureColumn:
+    column = {}
+    if None in values:
+        # 没有空值时不设置 is_null, 减少需要构造和序列化的字段
+        column["is_null"] = [v is None for v in values]
+        default = _DEFAULTS[kind]
+        values = [default if v is None else v for v in values]
+    if kind == "string":
+        values = [v if isinstance(v, str) else str(v) for v in values]
+    column[f"{kind}_values"] = values
+    return feature_pb2.FeatureColumn(**column)
+
+
+class FeatureService(feature_pb2_grpc.FeatureServiceServicer):
+    """在线特征服务, 从嵌入式的在线存储中批量查询实体最新的特征值.
+
+    在线存储的查询是本地的主键查找, 耗时很短, 因此直接在事件循环中执行; 响应按列组织, 序列化时不需要为每个特征值
+    创建一个消息.
+    """
+
+    def __init__(self, store: SQLiteOnlineStore):
+        self.store = store
+
+    async def GetOnlineFeatures(
+        self, request: feature_pb2.GetOnlineFeaturesRequest, context
+    ) -> feature_pb2.GetOnlineFeaturesResponse:
+        feature_names = list(request.feature_names)
+        keys = [entity_key(key.values) for key in request.entity_keys]
+        try:
+            kinds, columns, found = self.store.lookup(feature_names, keys)
+        except KeyError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e.args[0]))
+        return feature_pb2.GetOnlineFeaturesResponse(
+            feature_names=feature_names,
+            features=[_to_column(values, kind) for values, kind in zip(columns, kinds)],
+            found=found,
+        )
+
+
+async def feature_serve(store_path: str, port: int = 50052):
+    service = FeatureService(SQLiteOnlineStore(store_path))
+    server = aio.server()
+    feature_pb2_grpc.add_FeatureServiceServicer_to_server(service, server)
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    await server.wait_for_termination()
@@ -1,10 +1,69 @@
-from typing import Literal, Union
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Literal, Optional, Union
 
+import numpy as np
+import pandas as pd
 import wrapt
 
 from ..source import DataSource
 from ..table import PandasTable
 from ..table.entity import Entity
+from .materialize import (
+    DONE,
+    FAILED,
+    RUNNING,
+    MaterializedPartition,
+    _materialize_partition,
+    partition_path,
+    partition_ranges,
+)
+from .online_store import SQLiteOnlineStore
+from .point_in_time import point_in_time_join
+
+
+def _bound(values: pd.Series, bound: Any) -> Any:
+    """将时间边界转换为与列可比较的类型"""
+    if bound is None or not pd.api.types.is_datetime64_any_dtype(values):
+        return bound
+    bound = pd.Timestamp(bound)
+    tz = getattr(values.dtype, "tz", None)
+    if tz is not None and bound.tzinfo is None:
+        bound = bound.tz_localize(tz)
+    return bound
+
+
+def time_slice(data: pd.DataFrame, column: str, start: Any = None, end: Any = None) -> pd.DataFrame:
+    """选取 column 在 [start, end] 范围内的行, None 表示不限制.
+
+    column 是有序的索引或者有序的列时用二分查找得到切片, 否则使用向量化的布尔掩码; column 不存在时返回原数据.
+    """
+    if start is None and end is None:
+        return data
+    if data.index.name == column and not isinstance(data.index, pd.MultiIndex):
+        values = data.index.to_series()
+    elif column in data.columns:
+        values = data[column]
+    else:
+        return data
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        # 字符串形式的时间转换后再比较, 避免按字典序比较
+        values = pd.to_datetime(values, errors="coerce")
+    start, end = _bound(values, start), _bound(values, end)
+
+    if values.is_monotonic_increasing:
+        lo = 0 if start is None else values.searchsorted(start, side="left")
+        hi = len(values) if end is None else values.searchsorted(end, side="right")
+        return data.iloc[lo:hi]
+
+    mask = np.ones(len(data), dtype=bool)
+    if start is not None:
+        mask &= (values >= start).to_numpy()
+    if end is not None:
+        mask &= (values <= end).to_numpy()
+    return data[mask]
 
 
 class Feature(object):
@@ -33,6 +92,25 @@ class Feature(object):
         self.description = description
         self.owner = owner
         self._filted_source = None
+        self.transform: Optional[Callable] = None
+
+    def __getstate__(self):
+        # 过滤后的数据不随对象传递; 被装饰的函数在模块中的同名属性是包装器, 无法直接 pickle, 因此按模块名和函数名传递
+        state = dict(self.__dict__, _filted_source=None)
+        transform = self.transform
+        if transform is not None and "<" not in transform.__qualname__:
+            state["transform"] = (transform.__module__, transform.__qualname__)
+        return state
+
+    def __setstate__(self, state):
+        transform = state.get("transform")
+        if isinstance(transform, tuple):
+            module, qualname = transform
+            transform = importlib.import_module(module)
+            for attr in qualname.split("."):
+                transform = getattr(transform, attr)
+            state["transform"] = getattr(transform, "__wrapped__", transform)
+        self.__dict__.update(state)
 
     @property
     def filted_source(self):
@@ -40,31 +118,50 @@ class Feature(object):
             self._filted_source = self.process_source()
         return self._filted_source
 
-    def process_source(self):
-        source = [sr.data if hasattr(sr, "data") else sr for sr in self.source]
-        if self.ttl > 0:
-            # FIXME: 这里的逻辑有问题，应该是根据 event_timestamp_field 进行过滤
-            source = [
-                sr[
-                    (sr[self.event_timestamp_field] >= self.start_event_datetime)
-                    and (sr[self.event_timestamp_field] <= self.end_event_datetime)
-                ]
-                for sr in source
-            ]
+    @property
+    def source_start_datetime(self) -> Optional[pd.Timestamp]:
+        """数据源需要的开始时间: start_event_datetime 向前回溯 ttl 秒, 计算窗口开始时的特征也需要 ttl 内的历史数据"""
+        if self.start_event_datetime is None:
+            return None
+        return pd.Timestamp(self.start_event_datetime) - pd.Timedelta(seconds=self.ttl or 0)
+
+    def process_source(self) -> List:
+        """按时间窗口裁剪数据源: DataSource 将时间范围下推到 sql 中, 内存数据用二分查找或者向量化的掩码过滤.
+
+        时间列不确定在 DataSource 的 select 的列中时无法下推, 拉取数据后再用 time_slice 过滤.
+        """
+        start, end = self.source_start_datetime, self.end_event_datetime
+        if self.event_timestamp_field is None or (start is None and end is None):
+            return [sr.data if hasattr(sr, "data") else sr for sr in self.source]
+
+        source = []
+        for sr in self.source:
+            if isinstance(sr, DataSource):
+                data = sr.time_range(self.event_timestamp_field, start, end).data
+                if not sr.selects(self.event_timestamp_field):
+                    data = time_slice(data, self.event_timestamp_field, start, end)
+                source.append(data)
+            else:
+                data = sr.data if hasattr(sr, "data") else sr
+                source.append(time_slice(data, self.event_timestamp_field, start, end))
         return source
 
     def process_result(self, result: PandasTable):
-        if self.event_timestamp_field in result.columns and self.ttl > 0:
-            return result[
-                (result[self.event_timestamp_field] >= self.start_event_datetime)
-                and (result[self.event_timestamp_field] <= self.end_event_datetime)
-            ]
-        return result
+        if self.event_timestamp_field is None:
+            return result
+        return time_slice(result, self.event_timestamp_field, self.start_event_datetime, self.end_event_datetime)
+
+    def __call__(self, transform: Callable):
+        """作为装饰器使用, 记录特征的计算函数; 被装饰的函数通过 feature 属性获取 Feature 对象"""
+        self.transform = transform
+        wrapper = self._wrap(transform)
+        wrapper.feature = self
+        return wrapper
 
     @wrapt.decorator
-    def __call__(self, wrapped, instance, args, kwargs):
-        # 根据 start_event_datetime, end_event_datetime 过滤需要进行计算的数据
-        source = self.process_source()
+    def _wrap(self, wrapped, instance, args, kwargs):
+        # 根据 start_event_datetime, end_event_datetime 过滤需要进行计算的数据, 过滤结果只计算一次
+        source = self.filted_source
 
         result = wrapped(*source, **kwargs)
 
@@ -80,8 +177,130 @@ class Feature(object):
         # 好处是：可以最大程度复用spark对不同类型数据源的支持能力；
         # 而相比于SQL来说，使用 pandas api 作为 DSL, 仍然不够简单易用；
         if mode == "pandas":
-            return self.__call__(*self.filted_source)
+            if self.transform is None:
+                raise ValueError("Feature 需要先装饰特征计算函数才能计算")
+            return self.process_result(self.transform(*self.filted_source))
         elif mode == "pyspark":
             pass
         else:
             raise ValueError(f"Unsupported mode: {mode}")
+
+    def materialize(
+        self,
+        start: Any,
+        end: Any,
+        partition: Literal["hour", "day", "week", "month"] = "day",
+        *,
+        sink: str = None,
+        max_workers: int = None,
+        on_status: Callable[[pd.Timestamp, pd.Timestamp, str], None] = None,
+        overwrite: bool = False,
+        online_store: SQLiteOnlineStore = None,
+    ) -> List[MaterializedPartition]:
+        """将 [start, end] 内的特征按时间分区计算, 并写入 Parquet 格式的 sink.
+
+        每个分区在进程池中独立计算 (数据源按分区的时间窗口裁剪), 写入 `{sink}/dt=<分区>/part-0.parquet`, 先写临时文件
+        再重命名, 因此文件存在即表示分区已经完成. 再次执行时跳过已经完成的分区, 只重新计算失败或者没有执行的分区.
+
+        Args:
+            start (Any): 开始时间 (包含).
+            end (Any): 结束时间 (包含).
+            partition (str, optional): 分区粒度, hour, day, week 或者 month.
+            sink (str, optional): 输出目录, 默认使用 Feature.sink.
+            max_workers (int, optional): 进程数, 默认为 cpu 核数.
+            on_status (Callable, optional): 分区状态变化时在主进程中调用 on_status(分区开始时间, 分区结束时间, 状态),
+                状态为 running, done 或 failed; 使用 FeatureStatusTable 可以更新元数据库 feature 表的 status.
+            overwrite (bool, optional): 为 True 时重新计算所有分区.
+            online_store (SQLiteOnlineStore, optional): 所有已经完成的分区 (包括被跳过的分区) 写入在线存储, 视图名称为
+                特征计算函数的名称.
+
+        Returns:
+            List[MaterializedPartition]: 各个分区的结果, 按时间排序.
+        """
+        sink = sink or self.sink
+        if sink is None:
+            raise ValueError("Feature 需要指定 sink 才能物化")
+        if self.transform is None:
+            raise ValueError("Feature 需要先装饰特征计算函数才能计算")
+
+        def report(part: MaterializedPartition, status: str):
+            part.status = status
+            if on_status is not None:
+                on_status(part.start, part.end, status)
+
+        partitions = [
+            MaterializedPartition(lo, hi, str(partition_path(sink, label)))
+            for lo, hi, label in partition_ranges(start, end, partition)
+        ]
+        pending = []
+        for part in partitions:
+            if not overwrite and os.path.exists(part.path):
+                report(part, DONE)
+            else:
+                pending.append(part)
+        if pending:
+            # 子进程只需要导入特征所在的模块, 使用 spawn 避免 fork 时继承其他线程持有的锁
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+                futures = {}
+                for part in pending:
+                    futures[pool.submit(_materialize_partition, self, part.start, part.end, part.path)] = part
+                    report(part, RUNNING)
+                for future in as_completed(futures):
+                    part = futures[future]
+                    try:
+                        part.rows = future.result()
+                    except Exception as e:
+                        part.error = repr(e)
+                        report(part, FAILED)
+                    else:
+                        report(part, DONE)
+        if online_store is not None:
+            # 已经完成而被跳过的分区也需要写入; 在线存储只保留事件时间最新的特征, 与分区的写入顺序无关
+            for part in partitions:
+                if part.status == DONE:
+                    online_store.ingest(
+                        self.transform.__name__, part.path, self.entity.join_keys, self.event_timestamp_field
+                    )
+        return partitions
+
+    @classmethod
+    def get_historical_features(
+        cls,
+        spine: pd.DataFrame,
+        features: List["Feature"],
+        *,
+        timestamp_field: str = None,
+        num_partitions: int = 1,
+        max_workers: int = None,
+    ) -> pd.DataFrame:
+        """将多个特征按 point-in-time 规则拼接到 spine 上, 用于生成训练样本.
+
+        spine 的每一行只会拼接到实体相同 (Entity.join_keys), 事件时间不晚于 spine 时间, 且在特征 ttl 有效期内的
+        最新一行特征, 因此不会引入未来的数据.
+
+        Args:
+            spine (pd.DataFrame): 样本表, 包含所有特征实体的 join_keys 和时间列.
+            features (List[Feature]): 需要拼接的特征或者被 Feature 装饰的函数, 特征值由 compute() 计算.
+            timestamp_field (str, optional): spine 中的时间列, 默认与第一个特征的 event_timestamp_field 同名.
+            num_partitions (int, optional): 按实体哈希分区的个数, 分区之间并行计算.
+            max_workers (int, optional): 并行执行的线程数, 默认与分区数相同.
+
+        Returns:
+            pd.DataFrame: 行顺序和索引与 spine 相同, 增加了各个特征的列.
+        """
+        features = [getattr(feature, "feature", feature) for feature in features]
+        timestamp_field = timestamp_field or features[0].event_timestamp_field
+        result = spine
+        for feature in features:
+            result = point_in_time_join(
+                result,
+                feature.compute(),
+                feature.entity.join_keys,
+                timestamp_field,
+                feature.event_timestamp_field,
+                feature.ttl,
+                num_partitions=num_partitions,
+                max_workers=max_workers,
+            )
+        return result
@@ -0,0 +1,119 @@
+import asyncio
+import copy
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from ..core.engine_utils import Postgres
+    from .feature import Feature
+
+# 分区粒度对应的 pandas Period 频率和分区目录名中的时间格式
+PARTITION_FREQS = {"hour": "h", "day": "D", "week": "W", "month": "M"}
+_LABEL_FORMATS = {"hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d", "week": "%Y-%m-%d", "month": "%Y-%m"}
+_PARTITION_KEY = "dt"
+_PART_FILE = "part-0.parquet"
+
+# 分区状态, 与元数据库 feature 表 status 列的取值一致
+TODO, RUNNING, DONE, FAILED = "todo", "running", "done", "failed"
+
+
+@dataclass
+class MaterializedPartition:
+    start: pd.Timestamp
+    end: pd.Timestamp
+    path: str
+    status: str = TODO
+    rows: int = None
+    error: str = None
+
+
+def partition_ranges(start: Any, end: Any, partition: str = "day") -> List[Tuple[pd.Timestamp, pd.Timestamp, str]]:
+    """将 [start, end] 按自然的小时/天/周/月切分为多个闭区间, 返回 (开始时间, 结束时间, 分区标签).
+
+    第一个和最后一个分区会被裁剪到 [start, end] 范围内; 分区的结束时间精确到微秒, 下推到数据库中也不会与下一个分区重叠.
+    """
+    if partition not in PARTITION_FREQS:
+        raise ValueError(f"Unsupported partition: {partition}, expected one of {list(PARTITION_FREQS)}")
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    if start > end:
+        raise ValueError(f"start ({start}) is later than end ({end})")
+    ranges = []
+    for period in pd.period_range(start, end, freq=PARTITION_FREQS[partition]):
+        lo = max(period.start_time, start)
+        hi = min(period.end_time.floor("us"), end)
+        ranges.append((lo, hi, period.start_time.strftime(_LABEL_FORMATS[partition])))
+    return ranges
+
+
+def partition_path(sink: str, label: str) -> Path:
+    return Path(sink) / f"{_PARTITION_KEY}={label}" / _PART_FILE
+
+
+def write_partition(data: pd.DataFrame, path: Path) -> None:
+    """先写临时文件再重命名, 文件存在即表示分区已经完整写入"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        pq.write_table(pa.Table.from_pandas(data), tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _materialize_partition(feature: "Feature", start: pd.Timestamp, end: pd.Timestamp, path: str) -> int:
+    """在子进程中计算一个分区并写入 sink, 返回行数"""
+    feature = copy.copy(feature)
+    feature.start_event_datetime, feature.end_event_datetime = start, end
+    feature._filted_source = None
+    result = feature.compute()
+    write_partition(result, Path(path))
+    return len(result)
+
+
+class FeatureStatusTable(object):
+    """将分区的物化状态写入元数据库的 feature 表.
+
+    每个分区对应 start_event_datetime, end_event_datetime 为分区边界的一行; 传入 columns (source, entity, schema 等
+    非空列) 时不存在的行会被插入, 否则只更新已经注册的行.
+    """
+
+    def __init__(self, db: "Postgres", name: str, version: str, **columns):
+        self.db = db
+        self.name = name
+        self.version = version
+        self.columns = columns
+
+    def __call__(self, start: pd.Timestamp, end: pd.Timestamp, status: str) -> None:
+        asyncio.run(self._update_and_dispose(str(start), str(end), status))
+
+    async def _update_and_dispose(self, start: str, end: str, status: str) -> None:
+        from ..core.engine_utils import dispose_engines
+
+        # 每次状态更新都在新的事件循环中执行, 结束前关闭本循环的连接池
+        try:
+            await self.update(start, end, status)
+        finally:
+            await dispose_engines(self.db.url_with_db)
+
+    async def update(self, start: str, end: str, status: str) -> None:
+        from sqlalchemy import update
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from ..core.datahub.feature import Feature as FeatureORM
+
+        key = {"name": self.name, "version": self.version, "start_event_datetime": start, "end_event_datetime": end}
+        if self.columns:
+            stmt = pg_insert(FeatureORM).values(**key, **self.columns, status=status)
+            stmt = stmt.on_conflict_do_update(index_elements=list(key), set_={"status": status})
+        else:
+            stmt = update(FeatureORM).filter_by(**key).values(status=status)
+        async with self.db.async_engine.begin() as conn:
+            await conn.execute(stmt)
@@ -0,0 +1,212 @@
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 多个 join_keys 的取值用不会出现在普通文本中的分隔符拼接
+_KEY_SEP = "\x1f"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS views (view TEXT PRIMARY KEY, join_keys TEXT NOT NULL, columns TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS features (
+    view TEXT NOT NULL,
+    entity_key TEXT NOT NULL,
+    event_ts INTEGER NOT NULL,
+    vector TEXT NOT NULL,
+    PRIMARY KEY (view, entity_key)
+) WITHOUT ROWID;
+"""
+
+# 只有事件时间不早于已有数据时才覆盖, 分区以任意顺序写入时也保留每个实体最新的特征
+_UPSERT = """
+INSERT INTO features (view, entity_key, event_ts, vector) VALUES (?, ?, ?, ?)
+ON CONFLICT (view, entity_key) DO UPDATE SET event_ts = excluded.event_ts, vector = excluded.vector
+WHERE excluded.event_ts >= features.event_ts
+"""
+
+# 实体主键作为一个 json 数组参数传入, 语句固定, 可以复用 sqlite3 的语句缓存, 也不受参数个数上限的限制
+_MULTI_GET = "SELECT entity_key, vector FROM features WHERE view = ? AND entity_key IN (SELECT value FROM json_each(?))"
+
+
+def _key_part(value: Any) -> str:
+    if type(value) is str:
+        return value
+    if isinstance(value, np.generic):
+        value = value.item()
+    # 整数主键所在的列有空值时会变成浮点数, 1.0 与查询时的 "1" 使用相同的表示
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def entity_key(values: Sequence[Any]) -> str:
+    """实体主键的取值按 join_keys 的顺序转换为字符串后拼接, 写入和查询使用相同的表示.
+
+    numpy 标量转换为对应的 python 值, 整数值的浮点数转换为整数, 比如 np.int64(1), 1.0 和 "1" 得到相同的主键.
+    """
+    return _KEY_SEP.join(map(_key_part, values))
+
+
+def value_kind(dtype) -> str:
+    """特征列的值类型, 与 FeatureColumn 中的 *_values 对应"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int64"
+    if pd.api.types.is_float_dtype(dtype):
+        return "double"
+    return "string"
+
+
+class SQLiteOnlineStore(object):
+    """基于 SQLite 的嵌入式在线特征存储, 保存每个实体最新的特征向量.
+
+    特征按视图 (一个 Feature 的计算结果) 组织, 每个 (视图, 实体主键) 一行, 特征向量按视图的列顺序保存为 json 数组,
+    因此批量查询 n 个实体只需要按主键查找 n 行. 查询时特征名使用 "视图:列名" 的形式.
+    """
+
+    def __init__(self, path: str = ":memory:", mmap_size: int = 1 << 30):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            # WAL 模式下写入不阻塞其他进程的读取, 读取通过 mmap 直接访问页面, 减少拷贝
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._conn.executescript(_SCHEMA)
+        # 视图名 -> [(列名, 值类型)]
+        self._views: Dict[str, List[Tuple[str, str]]] = {}
+        self._load_views()
+
+    def _load_views(self) -> None:
+        rows = self._conn.execute("SELECT view, columns FROM views").fetchall()
+        self._views = {view: [tuple(c) for c in json.loads(columns)] for view, columns in rows}
+
+    def columns(self, view: str) -> List[Tuple[str, str]]:
+        """视图的特征列及其值类型"""
+        if view not in self._views:
+            # 视图可能由其他进程写入
+            with self._lock:
+                self._load_views()
+        if view not in self._views:
+            raise KeyError(f"Feature view not found: {view}")
+        return self._views[view]
+
+    def _register_view(self, view: str, join_keys: List[str], columns: List[Tuple[str, str]]) -> None:
+        existing = self._views.get(view)
+        if existing is not None and existing != columns:
+            raise ValueError(f"Feature view {view} already exists with columns {existing}, got {columns}")
+        self._conn.execute(
+            "INSERT OR IGNORE INTO views (view, join_keys, columns) VALUES (?, ?, ?)",
+            (view, json.dumps(join_keys), json.dumps(columns)),
+        )
+        self._views[view] = columns
+
+    def write(
+        self,
+        view: str,
+        data: pd.DataFrame,
+        join_keys: List[str],
+        event_timestamp_field: str,
+        columns: List[str] = None,
+    ) -> int:
+        """写入特征表中每个实体事件时间最新的一行, 返回写入的实体数.
+
+        Args:
+            view (str): 视图名称.
+            data (pd.DataFrame): 特征表, 比如 Feature.materialize 输出的分区.
+            join_keys (List[str]): 实体的主键.
+            event_timestamp_field (str): 事件时间列.
+            columns (List[str], optional): 需要写入的特征列, 默认是除 join_keys 和事件时间之外的所有列.
+        """
+        if columns is None:
+            columns = [c for c in data.columns if c not in join_keys and c != event_timestamp_field]
+        kinds = [(c, value_kind(data[c].dtype)) for c in columns]
+        latest = data.sort_values(event_timestamp_field, kind="stable").drop_duplicates(join_keys, keep="last")
+        keys = [entity_key(values) for values in zip(*(latest[k].tolist() for k in join_keys))]
+        event_ts = pd.to_datetime(latest[event_timestamp_field]).astype("int64").tolist()
+        values = latest[columns].astype(object)
+        vectors = values.where(values.notna(), None).to_numpy().tolist()
+        rows = [(view, key, ts, json.dumps(vector, default=str)) for key, ts, vector in zip(keys, event_ts, vectors)]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._register_view(view, list(join_keys), kinds)
+                self._conn.executemany(_UPSERT, rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return len(rows)
+
+    def ingest(self, view: str, path: str, join_keys: List[str], event_timestamp_field: str) -> int:
+        """写入 Parquet 文件或者目录 (比如 Feature.materialize 的 sink)"""
+        return self.write(view, pd.read_parquet(path), join_keys, event_timestamp_field)
+
+    def _resolve(self, feature_names: List[str]) -> Dict[str, List[Tuple[int, int]]]:
+        """按视图分组, 返回 视图 -> [(特征在 feature_names 中的位置, 特征在向量中的位置)]"""
+        views: Dict[str, List[Tuple[int, int]]] = {}
+        for i, name in enumerate(feature_names):
+            view, sep, column = name.partition(":")
+            names = [c for c, _ in self.columns(view)]
+            if not sep or column not in names:
+                raise KeyError(f"Feature not found: {name}, expected one of {[f'{view}:{c}' for c in names]}")
+            views.setdefault(view, []).append((i, names.index(column)))
+        return views
+
+    def kinds(self, feature_names: List[str]) -> List[str]:
+        """特征的值类型, 与 feature_names 一一对应"""
+        return self._kinds(self._resolve(feature_names), len(feature_names))
+
+    def _kinds(self, views: Dict[str, List[Tuple[int, int]]], n: int) -> List[str]:
+        result = [None] * n
+        for view, positions in views.items():
+            columns = self.columns(view)
+            for i, j in positions:
+                result[i] = columns[j][1]
+        return result
+
+    def get(self, feature_names: List[str], entity_keys: List[str]) -> Tuple[List[List[Any]], List[bool]]:
+        """批量查询实体的特征值, 每个视图执行一次查询.
+
+        Args:
+            feature_names (List[str]): "视图:列名" 形式的特征名.
+            entity_keys (List[str]): 由 entity_key 生成的实体主键.
+
+        Returns:
+            Tuple[List[List[Any]], List[bool]]: 每个特征在所有实体上的取值 (与 feature_names 一一对应, 每一列与
+                entity_keys 一一对应, 不存在时为 None), 以及每个实体是否在任意一个视图中存在.
+        """
+        return self._get(self._resolve(feature_names), len(feature_names), entity_keys)
+
+    def lookup(self, feature_names: List[str], entity_keys: List[str]) -> Tuple[List[str], List[List[Any]], List[bool]]:
+        """同时返回 kinds 和 get 的结果, 特征名只解析一次"""
+        views = self._resolve(feature_names)
+        n = len(feature_names)
+        return (self._kinds(views, n), *self._get(views, n, entity_keys))
+
+    def _get(
+        self, views: Dict[str, List[Tuple[int, int]]], n: int, entity_keys: List[str]
+    ) -> Tuple[List[List[Any]], List[bool]]:
+        columns: List[List[Any]] = [None] * n
+        found = [False] * len(entity_keys)
+        keys = json.dumps(entity_keys)
+        for view, positions in views.items():
+            with self._lock:
+                fetched = dict(self._conn.execute(_MULTI_GET, (view, keys)).fetchall())
+            hits = [fetched.get(key) for key in entity_keys]
+            # 所有向量拼接为一个 json 数组后只解析一次, 不存在的实体为 null
+            vectors = json.loads("[" + ",".join("null" if v is None else v for v in hits) + "]")
+            empty = [None] * len(self.columns(view))
+            transposed = list(zip(*[empty if v is None else v for v in vectors])) or [()] * len(empty)
+            for i, j in positions:
+                columns[i] = list(transposed[j])
+            found = [f or v is not None for f, v in zip(found, hits)]
+        return columns, found
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 临时列: spine 的原始行号和特征的事件时间, 避免与用户的列重名
+_ROW_COLUMN = "__hammer_row__"
+_EVENT_COLUMN = "__hammer_event_timestamp__"
+
+
+def partition_ids(df: pd.DataFrame, join_keys: List[str], num_partitions: int) -> np.ndarray:
+    """按 join_keys 的哈希值分区, 相同实体的 spine 和特征行落在同一个分区"""
+    return pd.util.hash_pandas_object(df[join_keys], index=False).to_numpy() % num_partitions
+
+
+def _asof_partition(spine: pd.DataFrame, feature: pd.DataFrame, timestamp_field: str, join_keys: List[str], tolerance):
+    spine = spine.sort_values(timestamp_field, kind="stable")
+    feature = feature.sort_values(_EVENT_COLUMN, kind="stable")
+    return pd.merge_asof(
+        spine,
+        feature,
+        left_on=timestamp_field,
+        right_on=_EVENT_COLUMN,
+        by=join_keys,
+        direction="backward",
+        tolerance=tolerance,
+    )
+
+
+def point_in_time_join(
+    spine: pd.DataFrame,
+    feature: pd.DataFrame,
+    join_keys: List[str],
+    timestamp_field: str,
+    event_timestamp_field: str,
+    ttl: int = 0,
+    *,
+    feature_columns: List[str] = None,
+    num_partitions: int = 1,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """point-in-time join: spine 的每一行取相同实体中事件时间 <= spine 时间的最新一行特征.
+
+    两边按 join_keys 的哈希值分区后, 每个分区分别按时间排序做 merge_asof, 分区之间并行执行,
+    内存和计算量与 spine 和特征的行数成线性关系, 而不是笛卡尔积.
+
+    Args:
+        spine (pd.DataFrame): 需要拼接特征的样本表, 包含 join_keys 和 timestamp_field.
+        feature (pd.DataFrame): 特征表, 包含 join_keys 和 event_timestamp_field.
+        join_keys (List[str]): 实体的主键.
+        timestamp_field (str): spine 中的时间列.
+        event_timestamp_field (str): 特征表中的事件时间列.
+        ttl (int, optional): 特征的有效期(秒), 早于 spine 时间 ttl 秒以上的特征不会被使用, 0 表示不限制.
+        feature_columns (List[str], optional): 需要拼接的特征列, 默认是除 join_keys 和事件时间之外的所有列.
+        num_partitions (int, optional): 分区数.
+        max_workers (int, optional): 并行执行的线程数, 默认与分区数相同.
+
+    Returns:
+        pd.DataFrame: 行顺序和索引与 spine 相同, 增加了特征列, 没有匹配到特征的行为空值.
+    """
+    if feature_columns is None:
+        feature_columns = [c for c in feature.columns if c not in join_keys and c != event_timestamp_field]
+    duplicated = [c for c in feature_columns if c in spine.columns]
+    if duplicated:
+        raise ValueError(f"特征列与 spine 中的列重名: {duplicated}")
+
+    left = spine[[*join_keys, timestamp_field]].copy()
+    left[_ROW_COLUMN] = range(len(left))
+    left = left[left[timestamp_field].notna()]
+    right = feature[[*join_keys, event_timestamp_field, *feature_columns]].rename(
+        columns={event_timestamp_field: _EVENT_COLUMN}
+    )
+    right = right[right[_EVENT_COLUMN].notna()]
+    # merge_asof 要求两边 by 列和时间列的类型一致
+    dtypes = {k: left[k].dtype for k in join_keys if right[k].dtype != left[k].dtype}
+    if right[_EVENT_COLUMN].dtype != left[timestamp_field].dtype:
+        dtypes[_EVENT_COLUMN] = left[timestamp_field].dtype
+    right = right.astype(dtypes)
+    tolerance = pd.Timedelta(seconds=ttl) if ttl and ttl > 0 else None
+
+    if num_partitions > 1:
+        left_ids = partition_ids(left, join_keys, num_partitions)
+        right_ids = partition_ids(right, join_keys, num_partitions)
+        pairs = [(left[left_ids == i], right[right_ids == i]) for i in range(num_partitions)]
+        pairs = [(lp, rp) for lp, rp in pairs if len(lp)]
+    else:
+        pairs = [(left, right)]
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(pairs), 1)) as executor:
+        parts = list(
+            executor.map(lambda pair: _asof_partition(pair[0], pair[1], timestamp_field, join_keys, tolerance), pairs)
+        )
+
+    matched = pd.concat(parts, ignore_index=True) if parts else left.assign(**{c: None for c in feature_columns})
+    matched = matched.set_index(_ROW_COLUMN)[feature_columns].reindex(range(len(spine)))
+    matched.index = spine.index
+    return pd.concat([spine, matched], axis=1)
@@ -0,0 +1,16 @@
+from .build_kernels import get_kernel, register_kernel
+from .cache import PlanCache, fingerprint_nodes
+from .executor import PlanExecutor
+from .scheduler import NodeTiming, ParallelPlanExecutor
+from . import pandas_kernels  # noqa: F401  注册 pandas kernel
+
+
+__all__ = [
+    "get_kernel",
+    "register_kernel",
+    "PlanExecutor",
+    "ParallelPlanExecutor",
+    "NodeTiming",
+    "PlanCache",
+    "fingerprint_nodes",
+]
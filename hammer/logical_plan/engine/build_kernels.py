@@ -0,0 +1,21 @@
+from typing import Any, Callable, Dict, Tuple
+
+_KERNEL_REGISTRY: Dict[Tuple[str, str], Callable] = {}
+
+
+def register_kernel(function_name: str, engine: str = "pandas") -> Callable:
+    """注册算子在指定计算引擎上的执行函数, function_name 与 OperationNode.function_name 一一对应"""
+
+    def decorator(func):
+        _KERNEL_REGISTRY[(engine, function_name)] = func
+        return func
+
+    return decorator
+
+
+def get_kernel(function_name: str, engine: str = "pandas") -> Callable[..., Any]:
+    kernel = _KERNEL_REGISTRY.get((engine, function_name))
+    if kernel is None:
+        registered = [name for eng, name in _KERNEL_REGISTRY if eng == engine]
+        raise ValueError(f"引擎 '{engine}' 未注册算子: '{function_name}',\n已经注册的算子有: {registered}")
+    return kernel
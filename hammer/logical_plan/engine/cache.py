@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from ..data_node import DataNode
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+_SERIES_COLUMN = "__hammer_series__"
+_SERIES_META_KEY = b"hammer.series_name"
+
+
+def _digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _file_signature(path: str) -> Optional[List]:
+    """文件的路径, 修改时间和大小, 文件不存在时返回 None"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+
+def _value_signature(value: Any) -> Optional[List]:
+    """外部输入的指纹, 无法计算指纹的输入返回 None, 其下游节点都不会被缓存"""
+    if isinstance(value, str):
+        return ["str", value, _file_signature(value)]
+    if isinstance(value, (int, float, bool)):
+        return ["scalar", value]
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        content = pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes()
+        columns = list(map(str, value.columns)) if isinstance(value, pd.DataFrame) else [str(value.name)]
+        return ["pandas", columns, hashlib.sha256(content).hexdigest()]
+    if hasattr(value, "fetch_data_sql"):
+        # DataSource 与 sql 数据节点相同, 按数据源的标识和下推后的 sql 文本计算指纹
+        return ["source", list(value.__hash_key__), value.fetch_data_sql]
+    return None
+
+
+def _encode_name(name: Any) -> Any:
+    """Series 的名称转换为可以 json 序列化的值, tuple (比如多级列名) 需要与 list 区分"""
+    if isinstance(name, tuple):
+        return {"tuple": [_encode_name(v) for v in name]}
+    return name
+
+
+def _decode_name(name: Any) -> Any:
+    if isinstance(name, dict) and list(name) == ["tuple"]:
+        return tuple(_decode_name(v) for v in name["tuple"])
+    return name
+
+
+def fingerprint_nodes(
+    plan: "LogicalPlan", nodes: Dict[str, List[str]], inputs: Dict[str, Any], input_keys: Dict[str, str]
+) -> Dict[str, Optional[str]]:
+    """计算节点指纹: 算子的 to_dict() + 上游节点的指纹 + 数据源(文件 mtime/size 或者 sql 文本).
+
+    Args:
+        plan (LogicalPlan): 需要计算指纹的 dag.
+        nodes (Dict[str, List[str]]): 按拓扑序排列的节点及其依赖.
+        inputs (Dict[str, Any]): 外部输入.
+        input_keys (Dict[str, str]): 从 inputs 中取值的节点及其在 inputs 中的 key.
+
+    Returns:
+        Dict[str, Optional[str]]: 节点指纹, None 表示节点不能被缓存.
+    """
+    fingerprints: Dict[str, Optional[str]] = {}
+    for node_name, deps in nodes.items():
+        attrs = plan[node_name] or {}
+        obj = attrs.get("obj")
+        if node_name in input_keys:
+            signature = _value_signature(inputs[input_keys[node_name]])
+            payload = None if signature is None else ["input", signature]
+        elif attrs.get("type") == "op":
+            payload = ["op", obj.to_dict()]
+        elif isinstance(obj, DataNode) and obj.data_type == "io" and not deps:
+            payload = ["io", obj.source, _file_signature(obj.source)]
+        elif isinstance(obj, DataNode) and obj.data_type == "sql" and not deps:
+            payload = ["sql", obj.source]
+        elif attrs.get("type") == "data":
+            # 内存数据节点只是上游结果的别名, 指纹与上游相同
+            payload = ["data"]
+        else:
+            payload = ["literal", node_name]
+
+        dep_fingerprints = [fingerprints[dep] for dep in deps]
+        if payload is None or None in dep_fingerprints:
+            fingerprints[node_name] = None
+        else:
+            fingerprints[node_name] = _digest([payload, dep_fingerprints])
+    return fingerprints
+
+
+class PlanCache(object):
+    """按节点指纹寻址的中间结果缓存, 以 parquet 文件保存在本地磁盘, 超过容量时按 LRU 淘汰.
+
+    只缓存 DataFrame 和 Series 类型的结果, 命中时会更新文件的访问时间.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 10 * 1024**3):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.cache_dir / f"{fingerprint}.parquet"
+
+    @staticmethod
+    def cacheable(value: Any) -> bool:
+        return isinstance(value, (pd.DataFrame, pd.Series))
+
+    def __contains__(self, fingerprint: Optional[str]) -> bool:
+        return fingerprint is not None and self._path(fingerprint).exists()
+
+    def load(self, fingerprint: str) -> Union[pd.DataFrame, pd.Series]:
+        path = self._path(fingerprint)
+        table = pq.read_table(path)
+        os.utime(path)  # 更新访问时间, 用于 LRU 淘汰
+        self.hits += 1
+        metadata = table.schema.metadata or {}
+        df = table.to_pandas()
+        if _SERIES_META_KEY in metadata:
+            return df[_SERIES_COLUMN].rename(_decode_name(json.loads(metadata[_SERIES_META_KEY])))
+        return df
+
+    def save(self, fingerprint: str, value: Union[pd.DataFrame, pd.Series]) -> bool:
+        """写入缓存, 返回是否写入成功.
+
+        缓存只是优化, 无法转换为 arrow 的结果 (比如混合类型的 object 列) 或者无法序列化的 Series 名称只记录日志并跳过,
+        不影响 dag 的执行.
+        """
+        self.misses += 1
+        try:
+            if isinstance(value, pd.Series):
+                table = pa.Table.from_pandas(value.to_frame(_SERIES_COLUMN))
+                name = json.dumps(_encode_name(value.name)).encode("utf-8")
+                table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SERIES_META_KEY: name})
+            else:
+                table = pa.Table.from_pandas(value)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError) as e:
+            logger.warning(f"结果无法写入缓存, 跳过 {fingerprint}: {e!r}")
+            return False
+        # 先写临时文件再重命名, 避免并发读到写了一半的文件
+        tmp_path = self.cache_dir / f".{fingerprint}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, self._path(fingerprint))
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """总大小超过 max_bytes 时, 删除最久没有被访问的文件"""
+        entries = [(e.stat().st_mtime_ns, e.stat().st_size, e.path) for e in os.scandir(self.cache_dir)]
+        entries = [e for e in entries if e[2].endswith(".parquet")]
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".parquet"):
+                os.remove(entry.path)
@@ -0,0 +1,178 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+
+import networkx as nx
+
+from ..data_node import DataNode
+from .build_kernels import get_kernel
+from .cache import PlanCache, fingerprint_nodes
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+
+class PlanExecutor(object):
+    """按拓扑序执行 LogicalPlan.
+
+    每个 OperationNode 被分发到所选引擎上注册的 kernel 执行. 节点结果采用引用计数管理:
+    当一个节点的所有下游消费者都执行完毕后, 它的结果立即被释放, 因此内存峰值接近于同时存活的
+    中间结果, 而不是所有中间结果之和.
+
+    传入 cache 时, 内存数据节点的结果按节点指纹缓存到磁盘, 再次执行时只重新计算指纹发生变化的下游节点.
+    """
+
+    def __init__(self, plan: "LogicalPlan", engine: str = "pandas", *, cache: PlanCache = None):
+        self.plan = plan
+        self.engine = engine
+        self.cache = cache
+        self.peak_live_nodes = 0
+        self.fingerprints: Dict[str, Optional[str]] = {}
+        self.cached_nodes: Set[str] = set()
+
+    def resolve_outputs(self, outputs: Union[str, List[str]] = None) -> List[str]:
+        """获取需要返回的节点, 默认是 dag 中没有下游的数据节点"""
+        return self.plan.get_output_nodes(outputs)
+
+    def _input_key(self, node_name: str, inputs: Dict[str, Any]) -> Union[str, None]:
+        """节点可以通过 dag 中的节点名或者变量名(仅限根数据节点)从 inputs 中取值"""
+        if node_name in inputs:
+            return node_name
+        if self.plan.get_root_data_name(node_name) in inputs:
+            return self.plan.get_root_data_name(node_name)
+        return None
+
+    def _op_predecessors(self, node_name: str) -> List[str]:
+        return [n for n in self.plan.get_input_nodes(node_name) if (self.plan[n] or {}).get("type") == "op"]
+
+    def dependencies(self, node_name: str, inputs: Dict[str, Any]) -> List[str]:
+        """节点在执行时实际需要的输入节点, 顺序与 kernel 入参顺序一致"""
+        if self._input_key(node_name, inputs) is not None:
+            return []
+        attrs = self.plan[node_name] or {}
+        node_type = attrs.get("type")
+        if node_type == "op":
+            return self.plan.get_input_nodes(node_name)
+        if node_type == "data":
+            obj: DataNode = attrs["obj"]
+            if obj.data_type == "io":
+                return []
+            # `df2 = df1.sum()` 中 df2 的值来自算子, `df2 = df1` 中 df2 的值来自数据节点
+            op_nodes = self._op_predecessors(node_name)
+            input_nodes = op_nodes or self.plan.get_input_nodes(node_name)
+            return input_nodes[-1:]
+        # 没有属性的节点是字面量, 例如 io 节点上游的文件路径
+        return []
+
+    def _collect_nodes(self, inputs: Dict[str, Any], outputs: List[str], stop: Set[str]) -> Dict[str, List[str]]:
+        deps: Dict[str, List[str]] = {}
+        stack = list(outputs)
+        while stack:
+            node_name = stack.pop()
+            if node_name in deps:
+                continue
+            if not self.plan.has_node(node_name):
+                raise ValueError(f"节点 '{node_name}' 不在 dag 中")
+            deps[node_name] = [] if node_name in stop else self.dependencies(node_name, inputs)
+            stack.extend(deps[node_name])
+        order = nx.topological_sort(self.plan.graph.subgraph(deps))
+        return {n: deps[n] for n in order}
+
+    def _is_cache_node(self, node_name: str) -> bool:
+        """只缓存内存数据节点, 即代码中的变量"""
+        obj = (self.plan[node_name] or {}).get("obj")
+        return isinstance(obj, DataNode) and obj.data_type == "memory"
+
+    def plan_nodes(self, inputs: Dict[str, Any], outputs: List[str]) -> Dict[str, List[str]]:
+        """从输出节点反向遍历, 获取本次执行需要的节点及其依赖, 按拓扑序返回"""
+        nodes = self._collect_nodes(inputs, outputs, stop=set())
+        self.cached_nodes = set()
+        if self.cache is not None:
+            input_keys = {n: self._input_key(n, inputs) for n in nodes}
+            input_keys = {n: key for n, key in input_keys.items() if key is not None}
+            self.fingerprints = fingerprint_nodes(self.plan, nodes, inputs, input_keys)
+            self.cached_nodes = {
+                n
+                for n in nodes
+                if self._is_cache_node(n) and n not in input_keys and self.fingerprints[n] in self.cache
+            }
+            # 命中缓存的节点不再需要上游, 只有指纹变化的部分需要重新计算
+            nodes = self._collect_nodes(inputs, outputs, stop=self.cached_nodes)
+            self.cached_nodes &= nodes.keys()
+        return nodes
+
+    def preset_value(self, node_name: str, inputs: Dict[str, Any]) -> Tuple[bool, Any]:
+        """获取不需要计算的节点值: 外部输入或者缓存"""
+        input_key = self._input_key(node_name, inputs)
+        if input_key is not None:
+            value = inputs[input_key]
+            # DataSource 在执行时才拉取数据, 这样优化器下推的列裁剪和过滤条件才能生效
+            return True, value.data if hasattr(value, "fetch_data_sql") else value
+        if node_name in self.cached_nodes:
+            return True, self.cache.load(self.fingerprints[node_name])
+        return False, None
+
+    def store(self, node_name: str, value: Any) -> None:
+        """将新计算的节点结果写入缓存"""
+        if self.cache is None or node_name in self.cached_nodes or not self._is_cache_node(node_name):
+            return
+        fingerprint = self.fingerprints.get(node_name)
+        if fingerprint is not None and self.cache.cacheable(value):
+            self.cache.save(fingerprint, value)
+
+    def run_node(self, node_name: str, args: List[Any]) -> Any:
+        """执行单个节点, args 为 dependencies 中各节点的值"""
+        attrs = self.plan[node_name] or {}
+        node_type = attrs.get("type")
+        if node_type == "op":
+            op = attrs["obj"]
+            return get_kernel(op.function_name, self.engine)(op, *args)
+        if node_type == "data":
+            if args:
+                return args[-1]
+            obj: DataNode = attrs["obj"]
+            if obj.data_type == "io":
+                return obj.source
+            raise ValueError(f"数据节点 '{node_name}' 没有上游算子, 需要通过 inputs 传入")
+        return node_name
+
+    def execute(self, inputs: Dict[str, Any] = None, outputs: Union[str, List[str]] = None) -> Dict[str, Any]:
+        """执行 dag, 返回输出节点的结果.
+
+        Args:
+            inputs (Dict[str, Any], optional): 外部输入, key 是节点名或者变量名, 例如 {"input_csv": "data.csv"}.
+            outputs (Union[str, List[str]], optional): 需要返回的节点, 默认是 dag 中没有下游的数据节点.
+
+        Returns:
+            Dict[str, Any]: 输出节点名和对应的结果.
+        """
+        inputs = inputs or {}
+        outputs = self.resolve_outputs(outputs)
+        nodes = self.plan_nodes(inputs, outputs)
+        consumers = self.count_consumers(nodes)
+
+        values: Dict[str, Any] = {}
+        self.peak_live_nodes = 0
+        for node_name, deps in nodes.items():
+            is_preset, value = self.preset_value(node_name, inputs)
+            if not is_preset:
+                value = self.run_node(node_name, [values[dep] for dep in deps])
+                self.store(node_name, value)
+            values[node_name] = value
+            self.release(deps, consumers, values, outputs)
+        return {n: values[n] for n in outputs}
+
+    @staticmethod
+    def count_consumers(nodes: Dict[str, List[str]]) -> Dict[str, int]:
+        """引用计数: 节点还有多少个下游消费者没有执行"""
+        consumers = {n: 0 for n in nodes}
+        for deps in nodes.values():
+            for dep in deps:
+                consumers[dep] += 1
+        return consumers
+
+    def release(self, deps: List[str], consumers: Dict[str, int], values: Dict[str, Any], outputs: List[str]):
+        """节点执行完毕后, 释放已经没有消费者的上游结果"""
+        self.peak_live_nodes = max(self.peak_live_nodes, len(values))
+        for dep in deps:
+            consumers[dep] -= 1
+            if consumers[dep] == 0 and dep not in outputs:
+                del values[dep]
@@ -0,0 +1,90 @@
+import textwrap
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from ..operations import (
+    GroupbyOp,
+    LocOp,
+    QueryOp,
+    ReadcsvOp,
+    ReadparquetOp,
+    SelectOp,
+    SumOp,
+    UserDefinedFunctionOp,
+)
+from .build_kernels import register_kernel
+
+
+def _select_key(op: SelectOp | LocOp) -> Any:
+    """df["a"] 返回 Series, df[["a", "b"]] 返回 DataFrame, 因此保留原始的列选择参数"""
+    key = op.function_positional_args
+    if isinstance(key, tuple):
+        key = list(key)
+    if isinstance(key, list) and len(key) == 1 and op.function_name == "select":
+        # parser 对 df["a"] 传入的是字符串, 而手工构建的 plan 常常写成 ["a"]
+        return key[0]
+    return key
+
+
+@register_kernel(ReadcsvOp.function_name)
+def read_csv(op: ReadcsvOp, *inputs) -> pd.DataFrame:
+    kwargs = op.function_keyword_args
+    file_path = kwargs.pop("filepath_or_buffer", None)
+    if inputs:
+        file_path = inputs[0]
+    return pd.read_csv(file_path, **kwargs)
+
+
+@register_kernel(ReadparquetOp.function_name)
+def read_parquet(op: ReadparquetOp, *inputs) -> pd.DataFrame:
+    kwargs = op.function_keyword_args
+    file_path = kwargs.pop("path", None)
+    if inputs:
+        file_path = inputs[0]
+    return pd.read_parquet(file_path, **kwargs)
+
+
+@register_kernel(GroupbyOp.function_name)
+def groupby(op: GroupbyOp, data: pd.DataFrame):
+    return data.groupby(**op.function_keyword_args)
+
+
+@register_kernel(SelectOp.function_name)
+def select(op: SelectOp, data):
+    return data[_select_key(op)]
+
+
+@register_kernel(LocOp.function_name)
+def loc(op: LocOp, data):
+    if op.columns is not None:
+        return data.loc[:, op.function_positional_args[1]]
+    return data.loc[_select_key(op)]
+
+
+@register_kernel(QueryOp.function_name)
+def query(op: QueryOp, data: pd.DataFrame):
+    kwargs = op.function_keyword_args
+    return data.query(kwargs.pop("expr"), **kwargs)
+
+
+@register_kernel(SumOp.function_name)
+def sum_(op: SumOp, data):
+    return data.sum(**op.function_keyword_args)
+
+
+@lru_cache(maxsize=256)
+def compile_udf(udf_name: str, udf_block: str) -> Callable:
+    """编译用户自定义函数, 相同的 udf 只编译一次"""
+    if not udf_block:
+        raise ValueError(f"udf '{udf_name}' 没有函数体, 无法执行")
+    namespace = {"pd": pd, "np": np}
+    exec(textwrap.dedent(udf_block), namespace)
+    return namespace[udf_name]
+
+
+@register_kernel(UserDefinedFunctionOp.function_name)
+def udf(op: UserDefinedFunctionOp, *inputs):
+    return compile_udf(op.udf_name, op.udf_block)(*inputs)
@@ -0,0 +1,158 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Tuple, Union
+
+import pandas as pd
+
+from ..operations import UserDefinedFunctionOp
+from .cache import PlanCache
+from .executor import PlanExecutor
+from .pandas_kernels import compile_udf
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+
+@dataclass
+class NodeTiming:
+    node_name: str
+    start: float  # 相对于本次执行开始的秒数
+    end: float
+    worker: str
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _timed(func: Callable, *args) -> Tuple[Any, float, float, str]:
+    """在 worker 中执行函数并记录起止时间, 进程池中也可以被 pickle"""
+    start = time.time()
+    result = func(*args)
+    worker = f"{threading.current_thread().name}@{os.getpid()}"
+    return result, start, time.time(), worker
+
+
+def _run_udf(udf_name: str, udf_block: str, *args) -> Any:
+    """udf 在子进程中重新编译执行, 只需要传递函数源码而不是函数对象"""
+    return compile_udf(udf_name, udf_block)(*args)
+
+
+class ParallelPlanExecutor(PlanExecutor):
+    """并行执行 LogicalPlan 中相互独立的分支.
+
+    根据入度计数找出所有依赖已经就绪的节点并提交到线程池, 适合释放 GIL 的 pandas/pyarrow kernel;
+    UserDefinedFunctionOp 的函数体是纯 python 代码, 默认提交到进程池. 每个节点的执行时间记录在
+    timeline 中.
+    """
+
+    def __init__(
+        self,
+        plan: "LogicalPlan",
+        engine: str = "pandas",
+        *,
+        max_workers: int = None,
+        udf_pool: Literal["thread", "process"] = "process",
+        cache: PlanCache = None,
+    ):
+        super().__init__(plan, engine=engine, cache=cache)
+        self.max_workers = max_workers or os.cpu_count()
+        self.udf_pool = udf_pool
+        self.timeline: List[NodeTiming] = []
+
+    def _is_process_node(self, node_name: str) -> bool:
+        attrs = self.plan[node_name] or {}
+        return self.udf_pool == "process" and isinstance(attrs.get("obj"), UserDefinedFunctionOp)
+
+    def _submit(self, pool: Executor, node_name: str, args: List[Any]) -> Future:
+        if isinstance(pool, ProcessPoolExecutor):
+            op: UserDefinedFunctionOp = self.plan[node_name]["obj"]
+            return pool.submit(_timed, _run_udf, op.udf_name, op.udf_block, *args)
+        return pool.submit(_timed, self.run_node, node_name, args)
+
+    def execute(self, inputs: Dict[str, Any] = None, outputs: Union[str, List[str]] = None) -> Dict[str, Any]:
+        inputs = inputs or {}
+        outputs = self.resolve_outputs(outputs)
+        nodes = self.plan_nodes(inputs, outputs)
+        consumers = self.count_consumers(nodes)
+
+        # 入度计数: 节点还有多少个依赖没有执行完
+        in_degree = {n: len(deps) for n, deps in nodes.items()}
+        successors: Dict[str, List[str]] = {n: [] for n in nodes}
+        for node_name, deps in nodes.items():
+            for dep in deps:
+                successors[dep].append(node_name)
+
+        values: Dict[str, Any] = {}
+        ready = [n for n, degree in in_degree.items() if degree == 0]
+        running: Dict[Future, str] = {}
+        self.timeline = []
+        self.peak_live_nodes = 0
+        begin = time.time()
+
+        def finish(node_name: str, result: Any, computed: bool = True):
+            if computed:
+                self.store(node_name, result)
+            values[node_name] = result
+            self.release(nodes[node_name], consumers, values, outputs)
+            for succ in successors[node_name]:
+                in_degree[succ] -= 1
+                if in_degree[succ] == 0:
+                    ready.append(succ)
+
+        need_process = any(self._is_process_node(n) for n in nodes)
+        threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hammer")
+        # 调度时线程池已经在运行, fork 出的子进程可能继承被占用的锁, 因此使用 spawn
+        processes = (
+            ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            if need_process
+            else None
+        )
+        try:
+            while ready or running:
+                while ready:
+                    node_name = ready.pop()
+                    is_preset, value = self.preset_value(node_name, inputs)
+                    args = [values[dep] for dep in nodes[node_name]]
+                    # 数据节点和字面量只是传递引用, 直接在调度线程中完成
+                    if is_preset:
+                        finish(node_name, value, computed=False)
+                    elif (self.plan[node_name] or {}).get("type") != "op":
+                        finish(node_name, self.run_node(node_name, args))
+                    else:
+                        pool = processes if self._is_process_node(node_name) else threads
+                        running[self._submit(pool, node_name, args)] = node_name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_name = running.pop(future)
+                    result, start, end, worker = future.result()
+                    self.timeline.append(NodeTiming(node_name, start - begin, end - begin, worker))
+                    finish(node_name, result)
+        finally:
+            for future in running:
+                future.cancel()
+            threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+
+        return {n: values[n] for n in outputs}
+
+    def report(self) -> pd.DataFrame:
+        """以 DataFrame 的形式返回每个算子节点的执行时间线"""
+        columns = ["node_name", "start", "end", "duration", "worker"]
+        rows = [(t.node_name, t.start, t.end, t.duration, t.worker) for t in self.timeline]
+        return pd.DataFrame(rows, columns=columns).sort_values("start", ignore_index=True)
@@ -1,17 +1,37 @@
+import copy
 import json
-from typing import Any, Dict, List, Literal, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 import networkx as nx
 
 from .data_node import DataNode
+from .engine import ParallelPlanExecutor, PlanCache, PlanExecutor
 from .operations import OperationNode, create_ops
 from .operations.build_ops import _OPERATION_REGISTRY
+from .optimizer import PlanOptimizer
+
+# 重名节点的后缀, 例如 df 第二次赋值时节点名为 df_hammer_tag_1
+_TAG = "_hammer_tag_"
+
+
+def _split_tag(node_name: str) -> Tuple[str, int]:
+    """拆分节点名为 (原始节点名, 版本号), 没有后缀的节点版本号为 0"""
+    base, sep, tag = node_name.rpartition(_TAG)
+    if sep and tag.isdigit():
+        return base, int(tag)
+    return node_name, 0
 
 
 class LogicalPlan(object):
     def __init__(self, graph: nx.DiGraph = None):
         """Initializes an empty Directed Acyclic Graph (DAG)."""
         self.graph = graph or nx.DiGraph()
+        # 版本索引: 原始节点名 -> 按版本号排序的同名节点, 避免每次查找最新节点都扫描全图
+        self._versions: Dict[str, List[str]] = {}
+        # 优化器下推了列裁剪和过滤条件的数据源副本, 执行时替换 inputs 中相同 key 的值
+        self.sources: Dict[str, Any] = {}
+        for node_name in sorted(self.graph.nodes, key=lambda n: _split_tag(n)[1]):
+            self._register_node(node_name)
 
     def __eq__(self, other: "LogicalPlan"):
         if not isinstance(other, LogicalPlan):
@@ -63,6 +83,49 @@ class LogicalPlan(object):
 
         return cls(graph)
 
+    def to_bytes(self) -> bytes:
+        """Serialize the LogicalPlan to the compact binary format defined in protos/plan.proto.
+
+        Node names, function names and string arguments are stored once in an interned string table,
+        which makes the result much smaller and faster to build than `to_json` for large plans.
+        """
+        from .serde import plan_to_bytes
+
+        return plan_to_bytes(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LogicalPlan":
+        """Create a LogicalPlan from bytes produced by `to_bytes`."""
+        from .serde import plan_from_bytes
+
+        return cls(plan_from_bytes(data))
+
+    def copy(self) -> "LogicalPlan":
+        """Returns a deep copy of the LogicalPlan, so that rewrites do not touch the original."""
+        plan = LogicalPlan()
+        plan.graph = copy.deepcopy(self.graph)
+        plan._versions = {name: list(versions) for name, versions in self._versions.items()}
+        plan.sources = dict(self.sources)
+        return plan
+
+    def _register_node(self, node_name: str) -> None:
+        """将新加入图中的节点记录到版本索引"""
+        base, _ = _split_tag(node_name)
+        versions = self._versions.setdefault(base, [])
+        if node_name not in versions[-1:]:
+            versions.append(node_name)
+
+    def _add_node(self, node_name: str, **attrs) -> None:
+        self.graph.add_node(node_name, **attrs)
+        self._register_node(node_name)
+
+    def _versions_of(self, node_name: str) -> List[str]:
+        """node_name 的同名节点, 剔除已经从图中删除 (例如被优化器裁剪) 的节点"""
+        versions = self._versions.get(node_name, [])
+        if any(not self.graph.has_node(n) for n in versions[-2:]):
+            versions[:] = [n for n in versions if self.graph.has_node(n)]
+        return versions
+
     def add_data_node(self, name: str, data_type: Literal["io", "memory", "sql"], source: str = None):
         """Adds a data node to the DAG.
 
@@ -71,7 +134,7 @@ class LogicalPlan(object):
             data_type (str): Type of the data node, either "io" (data IO) or "memory" (in-memory data) or "sql" (use sql to fetch data).
             source (str, optional): Data source (file path or database connection), only applicable for IO nodes.
         """
-        self.graph.add_node(self.rename_node(name), type="data", obj=DataNode(name, data_type=data_type, source=source))
+        self._add_node(self.rename_node(name), type="data", obj=DataNode(name, data_type=data_type, source=source))
 
     def add_operation_node(
         self,
@@ -92,7 +155,7 @@ class LogicalPlan(object):
             if self.has_node(udf_name):
                 udf_block = self[udf_name]["obj"].udf_block
 
-            self.graph.add_node(
+            self._add_node(
                 self.rename_node(node_name),
                 type="op",
                 obj=create_ops(
@@ -102,7 +165,7 @@ class LogicalPlan(object):
 
         # 处理 pandas 内置函数的注册
         else:
-            self.graph.add_node(
+            self._add_node(
                 self.rename_node(node_name),
                 type="op",
                 obj=create_ops(
@@ -121,12 +184,17 @@ class LogicalPlan(object):
 
             if isinstance(input_nodes, list):
                 for input_node in input_nodes:
-                    self.graph.add_edge(self.get_last_node(input_node), self.get_last_node(node_name))
+                    self.add_edge(input_node, node_name)
             else:
                 raise ValueError
 
     def add_edge(self, from_node: str, to_node: str, has_duplicated_var: bool = False):
-        self.graph.add_edge(self.get_last_node(from_node), self.get_last_node(to_node))
+        from_node, to_node = self.get_last_node(from_node), self.get_last_node(to_node)
+        # 边的端点可能是新节点, 例如数据文件路径
+        new_nodes = [n for n in (from_node, to_node) if not self.graph.has_node(n)]
+        self.graph.add_edge(from_node, to_node)
+        for node_name in new_nodes:
+            self._register_node(node_name)
 
     def visualize(self):
         """Visualizes the DAG using matplotlib."""
@@ -170,6 +238,27 @@ class LogicalPlan(object):
         """获取节点的输出节点个数"""
         return self.graph.out_degree(node_name)
 
+    def get_output_nodes(self, outputs: Union[str, List[str]] = None) -> List[str]:
+        """获取输出节点的最新节点名, 默认是 dag 中没有下游的数据节点"""
+        if outputs is None:
+            return [
+                n
+                for n, attrs in self.graph.nodes(data=True)
+                if attrs.get("type") == "data" and self.get_out_degree(n) == 0
+            ]
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        return [self.get_last_node(n) for n in outputs]
+
+    def get_root_data_name(self, node_name: str) -> Optional[str]:
+        """没有上游算子的数据节点返回其变量名, 这类节点的值可以由外部输入或者数据源提供"""
+        attrs = self[node_name] or {}
+        if attrs.get("type") != "data":
+            return None
+        if any((self[n] or {}).get("type") == "op" for n in self.get_input_nodes(node_name)):
+            return None
+        return attrs["obj"].name
+
     def rename_node(self, node_name: str) -> str:
         """重新命名节点, 防止因为重名节点造成dag出现环"""
         # 重名名的条件: 节点已经存在，而且 (有输入节点，或者， 有输出节点）
@@ -181,24 +270,63 @@ class LogicalPlan(object):
                 node_type == "op" and self.get_out_degree(last_node) == 0
             ):
                 return last_node
-            return f"{node_name}_hammer_tag_{len(self.get_duplicated_nodes(node_name))}"
+            return f"{node_name}{_TAG}{_split_tag(last_node)[1] + 1}"
         return node_name
 
     def get_duplicated_nodes(self, node_name: str) -> List[str]:
-        """获取 node_name 同名节点"""
-        if self.has_node(node_name):
-            nodes = list(set(self.node_startswith(f"{node_name}_hammer_tag_")))
-            return sorted([node_name, *nodes])
-        return [node_name]
+        """获取 node_name 同名节点, 按版本号排序"""
+        return [n for n in self._versions_of(node_name) if self.graph.has_node(n)] or [node_name]
 
     def get_last_node(self, node_name: str) -> str:
         """获取 node_name 同名节点中最新节点名, 若不存在则返回查询的节点名"""
-        return self.get_duplicated_nodes(node_name)[-1]
+        versions = self._versions_of(node_name)
+        return versions[-1] if versions else node_name
 
     def get_second_to_last_node(self, node_name: str) -> str:
         """获取 node_name 同名节点中倒数第二节点名, 若不存在则返回查询的节点名"""
-        nodes = self.get_duplicated_nodes(node_name)
-        return nodes[-2] if len(nodes) > 1 else node_name
+        versions = self._versions_of(node_name)
+        return versions[-2] if len(versions) > 1 else node_name
+
+    def execute(
+        self,
+        inputs: Dict[str, Any] = None,
+        engine: Literal["pandas"] = "pandas",
+        outputs: Union[str, List[str]] = None,
+        *,
+        max_workers: int = 1,
+        cache: PlanCache = None,
+    ) -> Dict[str, Any]:
+        """Executes the DAG in-process in topological order.
+
+        Args:
+            inputs (Dict[str, Any], optional): External inputs keyed by node name or variable name.
+            engine (str): Engine whose registered kernels run the operation nodes.
+            outputs (Union[str, List[str]], optional): Nodes to return, defaults to the sink data nodes.
+            max_workers (int): Run independent branches concurrently when greater than 1.
+            cache (PlanCache, optional): On-disk cache of intermediate results keyed by node fingerprint.
+
+        Returns:
+            Dict[str, Any]: Results of the output nodes.
+        """
+        inputs = {**(inputs or {}), **self.sources}
+        if max_workers > 1:
+            executor = ParallelPlanExecutor(self, engine=engine, max_workers=max_workers, cache=cache)
+        else:
+            executor = PlanExecutor(self, engine=engine, cache=cache)
+        return executor.execute(inputs, outputs)
+
+    def optimize(self, outputs: Union[str, List[str]] = None, sources: Dict[str, Any] = None) -> "LogicalPlan":
+        """Returns an optimized copy of the DAG: dead nodes removed, projections and predicates pushed down.
+
+        Args:
+            outputs (Union[str, List[str]], optional): Nodes whose results are needed, defaults to the sink data nodes.
+            sources (Dict[str, Any], optional): DataSource bound to root data nodes. They are not modified:
+                pushdowns go to copies kept in the optimized plan's `sources` and used by `execute`.
+
+        Returns:
+            LogicalPlan: The optimized DAG.
+        """
+        return PlanOptimizer().optimize(self, outputs, sources)
 
     def to_pyspark(self, start_node: str, end_node: str):
         """Converts the DAG to PySpark code."""
@@ -1,9 +1,9 @@
 from .build_ops import create_ops, register_op
-from .io_ops import ReadcsvOp
+from .io_ops import ReadcsvOp, ReadparquetOp
 from .groupby_ops import GroupbyOp
 from .agg_ops import SumOp
 from .operation import OperationNode
-from .select_ops import SelectOp, LocOp
+from .select_ops import SelectOp, LocOp, QueryOp
 from .udf_ops import UserDefinedFunctionOp
 
 
@@ -12,9 +12,11 @@ __all__ = [
     "register_op",
     "OperationNode",
     "ReadcsvOp",
+    "ReadparquetOp",
     "GroupbyOp",
     "SumOp",
     "SelectOp",
     "LocOp",
+    "QueryOp",
     "UserDefinedFunctionOp",
 ]
@@ -6,6 +6,7 @@ from .operation import OperationNode
 
 @register_op()
 class SumOp(OperationNode):
+    __slots__ = ()
     function_name: str = "sum"
 
     def __init__(self):
@@ -1,10 +1,30 @@
 import inspect
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, Dict, List, Set
 
+from .operation import OperationNode
 from .udf_ops import UserDefinedFunctionOp
 
 _OPERATION_REGISTRY: Dict[str, type] = {}
 _DATA_METHOD_OPERATION: Set[str] = set()
+# 算子的构造函数适配器: (function_positional_args, function_keyword_args, target_ops) -> OperationNode
+_OPERATION_CONSTRUCTORS: Dict[str, Callable[[List, Dict[str, Any], Dict], OperationNode]] = {}
+
+
+def _constructor_adapter(op_cls: type) -> Callable[[List, Dict[str, Any], Dict], OperationNode]:
+    """根据构造函数的入参生成统一的构造方式, 只在注册时调用一次 inspect.signature"""
+    params = inspect.signature(op_cls).parameters
+    has_args = "function_positional_args" in params
+    has_kwargs = "function_keyword_args" in params
+    if has_args and has_kwargs and "target_ops" in params:
+        return lambda args, kwargs, target_ops: op_cls(args, kwargs, target_ops=target_ops)
+    elif has_args and has_kwargs:
+        return lambda args, kwargs, target_ops: op_cls(args, kwargs)
+    elif has_args:
+        return lambda args, kwargs, target_ops: op_cls(args)
+    elif has_kwargs:
+        return lambda args, kwargs, target_ops: op_cls(kwargs)
+    else:
+        return lambda args, kwargs, target_ops: op_cls()
 
 
 def register_op() -> type:
@@ -14,6 +34,7 @@ def register_op() -> type:
         if cls.function_name != "udf":
             # 注册 pandas 中的内置方法
             _OPERATION_REGISTRY[cls.function_name] = cls
+            _OPERATION_CONSTRUCTORS[cls.function_name] = _constructor_adapter(cls)
         # udf 只有给定入参 udf_name 和 udf_block 之后才能实例化，因此不走注册。
         # 注册方法链的方法
         if cls.is_data_method:
@@ -39,23 +60,9 @@ def create_ops(
     pandas_func_name = kwargs.get("function_name") or pandas_func_name
 
     if udf_name is None:
-        op_cls = _OPERATION_REGISTRY.get(pandas_func_name)
-        if op_cls is None:
+        constructor = _OPERATION_CONSTRUCTORS.get(pandas_func_name)
+        if constructor is None:
             raise ValueError(f"未注册算子: '{pandas_func_name}',\n已经注册的算子有: {_OPERATION_REGISTRY}")
-        sig = inspect.signature(op_cls)
-        if (
-            "function_positional_args" in sig.parameters
-            and "function_keyword_args" in sig.parameters
-            and "target_ops" in sig.parameters
-        ):
-            return op_cls(function_positional_args, function_keyword_args, target_ops=target_ops)
-        elif "function_positional_args" in sig.parameters and "function_keyword_args" in sig.parameters:
-            return op_cls(function_positional_args, function_keyword_args)
-        elif "function_positional_args" in sig.parameters:
-            return op_cls(function_positional_args)
-        elif "function_keyword_args" in sig.parameters:
-            return op_cls(function_keyword_args)
-        else:
-            return op_cls()
+        return constructor(function_positional_args, function_keyword_args, target_ops)
     else:
         return UserDefinedFunctionOp(udf_name, udf_block, *function_positional_args, **function_keyword_args)
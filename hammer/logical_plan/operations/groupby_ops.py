@@ -6,6 +6,7 @@ from .operation import OperationNode
 
 @register_op()
 class GroupbyOp(OperationNode):
+    __slots__ = ("by",)
     function_name: str = "groupby"
 
     def __init__(
@@ -6,6 +6,7 @@ from .operation import OperationNode
 
 @register_op()
 class ReadcsvOp(OperationNode):
+    __slots__ = ("file_path",)
     # 设置 function_name 类属性, 作为注册时的标识.
     function_name: str = "pd.read_csv"
 
@@ -27,3 +28,28 @@ class ReadcsvOp(OperationNode):
 
     def to_pyspark(self) -> str:
         return f'spark.read.load({self.file_path}, format="csv", header=True)'
+
+
+@register_op()
+class ReadparquetOp(OperationNode):
+    __slots__ = ("file_path",)
+    function_name: str = "pd.read_parquet"
+
+    def __init__(
+        self,
+        function_positional_args: List,
+        function_keyword_args: Dict[str, Any] = None,
+    ):
+        super().__init__("pd.read_parquet", function_positional_args, function_keyword_args)
+        self.file_path = self.function_keyword_args.get("path")
+
+    @property
+    def is_data_method(self) -> bool:
+        return False
+
+    @property
+    def positional_args_name(self) -> List[str]:
+        return ["path"]
+
+    def to_pyspark(self) -> str:
+        return f"spark.read.parquet({self.file_path})"
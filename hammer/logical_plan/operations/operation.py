@@ -4,6 +4,10 @@ from typing import Any, Dict, List
 
 
 class OperationNode(object):
+    # function_name 是子类的类属性 (注册时的标识), 不放在实例上; 子类同样需要定义 __slots__
+    __slots__ = ("function_positional_args", "_function_keyword_args", "target_ops")
+    function_name: str = None
+
     def __init__(
         self,
         function_name: str,
@@ -13,7 +17,10 @@ class OperationNode(object):
         target_ops: Dict = {},
         **kwargs,
     ):
-        self.function_name = function_name  # name from pandas.
+        if function_name != self.function_name:  # name from pandas.
+            raise ValueError(
+                f"{self.__class__.__name__} 的 function_name 是 '{self.function_name}', 传入的是 '{function_name}'"
+            )
         self.function_positional_args = function_positional_args or []
         self._function_keyword_args = function_keyword_args or {}
         self.target_ops = target_ops
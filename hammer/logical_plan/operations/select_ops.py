@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .build_ops import register_op
 from .operation import OperationNode
@@ -6,6 +6,7 @@ from .operation import OperationNode
 
 @register_op()
 class LocOp(OperationNode):
+    __slots__ = ("_select_cols",)
     function_name: str = "loc"
 
     def __init__(
@@ -28,12 +29,21 @@ class LocOp(OperationNode):
     def positional_args_name(self) -> List[str]:
         return []
 
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """df.loc[:, cols] 在 plan 中记为 [None, cols], 返回选择的列; 其他形式是按行选择, 返回 None"""
+        key = self.function_positional_args
+        if isinstance(key, (list, tuple)) and len(key) == 2 and key[0] is None:
+            return [key[1]] if isinstance(key[1], str) else list(key[1])
+        return None
+
     def to_pyspark(self) -> str:
         return f"select({self._select_cols})"
 
 
 @register_op()
 class SelectOp(OperationNode):
+    __slots__ = ("_select_cols",)
     function_name: str = "select"
 
     def __init__(
@@ -56,5 +66,37 @@ class SelectOp(OperationNode):
     def positional_args_name(self) -> List[str]:
         return []
 
+    @property
+    def columns(self) -> Optional[List[str]]:
+        """选择的列, 非字符串的选择条件(例如布尔索引)返回 None"""
+        if self._select_cols and all(isinstance(col, str) for col in self._select_cols):
+            return list(self._select_cols)
+        return None
+
     def to_pyspark(self) -> str:
         return f"select({self._select_cols})"
+
+
+@register_op()
+class QueryOp(OperationNode):
+    __slots__ = ("expr",)
+    function_name: str = "query"
+
+    def __init__(
+        self,
+        function_positional_args: List,
+        function_keyword_args: Dict[str, Any] = None,
+    ):
+        super().__init__("query", function_positional_args, function_keyword_args)
+        self.expr = self.function_keyword_args.get("expr")
+
+    @property
+    def is_data_method(self) -> bool:
+        return True
+
+    @property
+    def positional_args_name(self) -> List[str]:
+        return ["expr"]
+
+    def to_pyspark(self) -> str:
+        return f'filter("{self.expr}")'
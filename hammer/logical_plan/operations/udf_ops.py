@@ -4,6 +4,7 @@ from .operation import OperationNode
 
 
 class UserDefinedFunctionOp(OperationNode):
+    __slots__ = ("udf_name", "udf_block")
     function_name: str = "udf"
 
     def __init__(self, udf_name: str, udf_block: str, *args, **kwargs):
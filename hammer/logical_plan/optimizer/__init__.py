@@ -0,0 +1,16 @@
+from .cse import eliminate_common_subexpressions
+from .optimizer import OptimizerPass, PlanOptimizer
+from .prune import bypass_node, prune_dead_nodes
+from .pushdown import push_down_predicates, push_down_projection, required_columns
+
+
+__all__ = [
+    "OptimizerPass",
+    "PlanOptimizer",
+    "bypass_node",
+    "eliminate_common_subexpressions",
+    "prune_dead_nodes",
+    "push_down_predicates",
+    "push_down_projection",
+    "required_columns",
+]
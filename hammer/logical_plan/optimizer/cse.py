@@ -0,0 +1,73 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+
+from ..data_node import DataNode
+from .prune import prune_dead_nodes
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+
+def _op_signature(obj: Any) -> Optional[str]:
+    """算子的结构指纹: function_name, 参数, target_ops 以及 udf 定义; 参数不能序列化时返回 None, 不参与合并"""
+    try:
+        return json.dumps(obj.to_dict(), sort_keys=True)
+    except TypeError:
+        return None
+
+
+def _value_node(plan: "LogicalPlan", node_name: str) -> Optional[str]:
+    """内存数据节点只是上游结果的别名, 返回其值的来源节点, 规则与执行时的 dependencies 相同"""
+    input_nodes = plan.get_input_nodes(node_name)
+    op_nodes = [n for n in input_nodes if (plan[n] or {}).get("type") == "op"]
+    input_nodes = op_nodes or input_nodes
+    return input_nodes[-1] if input_nodes else None
+
+
+def _replace_input(plan: "LogicalPlan", node_name: str, old: str, new: str) -> None:
+    """将 node_name 的输入 old 替换为 new, 并保持输入顺序 (即 kernel 入参顺序) 不变"""
+    input_nodes = plan.get_input_nodes(node_name)
+    plan.graph.remove_edges_from([(n, node_name) for n in input_nodes])
+    plan.graph.add_edges_from([(new if n == old else n, node_name) for n in input_nodes])
+
+
+def eliminate_common_subexpressions(plan: "LogicalPlan", outputs: List[str], sources: Dict[str, Any] = None) -> None:
+    """公共子表达式消除: 合并结构相同的算子, 使重复的读取和聚合只执行一次.
+
+    按拓扑序为每个算子计算 (算子指纹, 输入节点) 作为 key, 内存数据节点视为其上游结果的别名, 因此 `df2 = df1`
+    之后 `df1.sum()` 和 `df2.sum()` 也会被合并. key 相同的算子保留先出现的一个, 后出现的算子的下游改为连接到
+    保留的算子上, 然后删除不再被输出用到的节点. 数据节点 (变量) 本身不会被合并, 仍然可以通过变量名获取结果.
+    """
+    canonical: Dict[str, str] = {}
+    seen: Dict[Tuple, str] = {}
+    for node_name in list(nx.topological_sort(plan.graph)):
+        attrs = plan[node_name] or {}
+        obj = attrs.get("obj")
+        canonical[node_name] = node_name
+        if isinstance(obj, DataNode):
+            value_node = _value_node(plan, node_name) if obj.data_type == "memory" else None
+            if value_node is not None:
+                canonical[node_name] = canonical[value_node]
+            continue
+        if attrs.get("type") != "op":
+            continue
+
+        signature = _op_signature(obj)
+        if signature is None:
+            continue
+        key = (signature, tuple(canonical[n] for n in plan.get_input_nodes(node_name)))
+        kept = seen.setdefault(key, node_name)
+        if kept == node_name or node_name in outputs:
+            continue
+        output_nodes = list(plan.graph.successors(node_name))
+        # 下游已经以保留的算子为输入时, 合并会丢失一条边 (即一个入参), 这种情况不合并
+        if any(plan.graph.has_edge(kept, n) for n in output_nodes):
+            continue
+        for output_node in output_nodes:
+            _replace_input(plan, output_node, node_name, kept)
+        plan.graph.remove_node(node_name)
+        canonical[node_name] = kept
+
+    prune_dead_nodes(plan, outputs)
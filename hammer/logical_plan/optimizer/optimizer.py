@@ -0,0 +1,53 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+
+from .cse import eliminate_common_subexpressions
+from .prune import prune_dead_nodes
+from .pushdown import push_down_predicates, push_down_projection
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+# 优化规则的入参: dag, 输出节点, 数据源绑定. 规则直接修改传入的 dag.
+OptimizerPass = Callable[["LogicalPlan", List[str], Dict[str, Any]], None]
+
+
+class PlanOptimizer(object):
+    """按顺序对 LogicalPlan 执行一组优化规则.
+
+    默认规则依次是: 删除到达不了输出的节点, 公共子表达式消除, 谓词下推, 列裁剪下推. 公共子表达式消除在下推之前,
+    这样合并后的读取算子会读取所有下游需要的列; 谓词下推在列裁剪之前, 这样被下推到数据源的过滤条件用到的列
+    就不需要再被读取.
+    """
+
+    default_passes: List[OptimizerPass] = [
+        prune_dead_nodes,
+        eliminate_common_subexpressions,
+        push_down_predicates,
+        push_down_projection,
+    ]
+
+    def __init__(self, passes: List[OptimizerPass] = None):
+        self.passes = list(passes or self.default_passes)
+
+    def optimize(
+        self, plan: "LogicalPlan", outputs: Union[str, List[str]] = None, sources: Dict[str, Any] = None
+    ) -> "LogicalPlan":
+        """返回优化后的 dag, 原 dag 和 sources 中的数据源都不会被修改.
+
+        列裁剪和过滤条件下推到数据源的副本中, 副本保存在优化后 dag 的 sources 中, 执行时会替换 inputs 中相同 key 的值,
+        因此同一个数据源可以被多次优化, 下推的条件不会累积.
+
+        Args:
+            plan (LogicalPlan): 需要优化的 dag.
+            outputs (Union[str, List[str]], optional): 输出节点, 默认是 dag 中没有下游的数据节点.
+            sources (Dict[str, Any], optional): 根数据节点绑定的 DataSource, key 是节点名或者变量名.
+
+        Returns:
+            LogicalPlan: 优化后的 dag.
+        """
+        outputs = plan.get_output_nodes(outputs)
+        plan = plan.copy()
+        plan.sources.update({key: source.copy() for key, source in (sources or {}).items()})
+        for optimizer_pass in self.passes:
+            optimizer_pass(plan, outputs, plan.sources)
+        return plan
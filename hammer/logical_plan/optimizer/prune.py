@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import networkx as nx
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+
+def prune_dead_nodes(plan: "LogicalPlan", outputs: List[str], sources: Dict[str, Any] = None) -> None:
+    """删除结果到达不了输出节点的节点"""
+    alive = set(outputs)
+    for node_name in outputs:
+        alive |= nx.ancestors(plan.graph, node_name)
+    plan.graph.remove_nodes_from([n for n in list(plan.graph.nodes) if n not in alive])
+
+
+def bypass_node(plan: "LogicalPlan", node_name: str) -> bool:
+    """删除只有一个输入的节点, 并把它的下游直接连接到它的输入上.
+
+    下游节点如果还有其他输入, 重新连边会改变其入参顺序, 这种情况不做处理并返回 False.
+    """
+    input_nodes = plan.get_input_nodes(node_name)
+    output_nodes = list(plan.graph.successors(node_name))
+    if len(input_nodes) != 1 or any(len(plan.get_input_nodes(n)) != 1 for n in output_nodes):
+        return False
+    for output_node in output_nodes:
+        plan.graph.add_edge(input_nodes[0], output_node)
+    plan.graph.remove_node(node_name)
+    return True
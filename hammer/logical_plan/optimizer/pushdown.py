@@ -0,0 +1,115 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+import networkx as nx
+
+from ...utils.predicate import query_columns, query_to_filters, query_to_sql
+from ..operations import GroupbyOp, LocOp, QueryOp, ReadcsvOp, ReadparquetOp, SelectOp
+from .prune import bypass_node
+
+if TYPE_CHECKING:
+    from ..logical_plan import LogicalPlan
+
+# 读取算子中用于列裁剪的参数名
+_PROJECTION_ARGS = {ReadcsvOp: "usecols", ReadparquetOp: "columns"}
+
+
+def _source_of(plan: "LogicalPlan", node_name: str, sources: Dict[str, Any]) -> Optional[Any]:
+    """获取根数据节点绑定的数据源, 绑定方式与执行时的 inputs 相同: 节点名或者变量名"""
+    if node_name in sources:
+        return sources[node_name]
+    return sources.get(plan.get_root_data_name(node_name))
+
+
+def _demand(plan: "LogicalPlan", consumer: str, required: Dict[str, Optional[Set[str]]]) -> Optional[Set[str]]:
+    """consumer 需要用到其输入的哪些列, None 表示需要全部列"""
+    attrs = plan[consumer] or {}
+    obj = attrs.get("obj")
+    if attrs.get("type") == "data":
+        return required[consumer]
+    if isinstance(obj, (SelectOp, LocOp)):
+        return None if obj.columns is None else set(obj.columns)
+    if isinstance(obj, GroupbyOp) and required[consumer] is not None:
+        by = obj.function_keyword_args.get("by")
+        if isinstance(by, str):
+            return {by} | required[consumer]
+        if isinstance(by, list) and all(isinstance(col, str) for col in by):
+            return set(by) | required[consumer]
+        return None
+    if isinstance(obj, QueryOp) and required[consumer] is not None:
+        columns = query_columns(obj.expr)
+        return None if columns is None else columns | required[consumer]
+    return None
+
+
+def required_columns(plan: "LogicalPlan", outputs: List[str]) -> Dict[str, Optional[Set[str]]]:
+    """自下而上计算每个节点的结果中被下游用到的列, None 表示需要全部列"""
+    required: Dict[str, Optional[Set[str]]] = {}
+    for node_name in reversed(list(nx.topological_sort(plan.graph))):
+        consumers = list(plan.graph.successors(node_name))
+        if node_name in outputs or not consumers:
+            required[node_name] = None
+            continue
+        columns: Optional[Set[str]] = set()
+        for consumer in consumers:
+            demand = _demand(plan, consumer, required)
+            if demand is None:
+                columns = None
+                break
+            columns |= demand
+        required[node_name] = columns
+    return required
+
+
+def push_down_projection(plan: "LogicalPlan", outputs: List[str], sources: Dict[str, Any] = None) -> None:
+    """将下游的列选择下推到读取算子 (read_csv 的 usecols, read_parquet 的 columns) 和数据源的 select 中"""
+    sources = sources or {}
+    required = required_columns(plan, outputs)
+    for node_name, columns in required.items():
+        if not columns:
+            continue
+        obj = (plan[node_name] or {}).get("obj")
+        arg_name = _PROJECTION_ARGS.get(type(obj))
+        if arg_name is not None and arg_name not in obj.function_keyword_args:
+            obj._function_keyword_args[arg_name] = sorted(columns)
+        source = _source_of(plan, node_name, sources)
+        if source is not None:
+            source.push_down(columns=sorted(columns))
+
+
+def _producer(plan: "LogicalPlan", node_name: str) -> Optional[str]:
+    """沿着只有一个下游的数据节点向上, 找到产生 node_name 输入的算子"""
+    input_nodes = plan.get_input_nodes(node_name)
+    while len(input_nodes) == 1 and plan.get_out_degree(input_nodes[0]) == 1:
+        attrs = plan[input_nodes[0]] or {}
+        if attrs.get("type") == "op":
+            return input_nodes[0]
+        input_nodes = plan.get_input_nodes(input_nodes[0])
+    return None
+
+
+def push_down_predicates(plan: "LogicalPlan", outputs: List[str], sources: Dict[str, Any] = None) -> None:
+    """将 df.query 过滤条件下推到数据源的 where 子句和 read_parquet 的 filters 参数中, 并删除对应的 query 算子.
+
+    parquet 的 filters 在读取时过滤, 结果的索引会被重置, 而不是保留原始的行号.
+    """
+    sources = sources or {}
+    query_nodes = [n for n, attrs in plan.graph.nodes(data=True) if isinstance(attrs.get("obj"), QueryOp)]
+    for node_name in query_nodes:
+        if node_name in outputs:
+            continue
+        op: QueryOp = plan[node_name]["obj"]
+        if set(op.function_keyword_args) != {"expr"} or len(plan.get_input_nodes(node_name)) != 1:
+            continue
+        input_node = plan.get_input_nodes(node_name)[0]
+        source = _source_of(plan, input_node, sources)
+        if source is not None:
+            if plan.get_out_degree(input_node) == 1 and query_to_sql(op.expr) is not None:
+                if bypass_node(plan, node_name):
+                    source.push_down(predicate=op.expr)
+            continue
+
+        producer = _producer(plan, node_name)
+        reader = (plan[producer] or {}).get("obj") if producer else None
+        filters = query_to_filters(op.expr)
+        if isinstance(reader, ReadparquetOp) and filters is not None and bypass_node(plan, node_name):
+            reader._function_keyword_args["filters"] = [*reader.function_keyword_args.get("filters", []), *filters]
@@ -1,18 +1,31 @@
 import ast
-import re
-from pprint import pprint
-from typing import Dict, List, Literal, Tuple
+import textwrap
+from typing import Any, Dict, List, Literal, Optional
 
-from ...table.source import SUPPORT_FIEL_TYPES
+from ...source import SUPPORT_FIEL_TYPES
 from ..logical_plan import LogicalPlan
-from ..operations.build_ops import _DATA_METHOD_OPERATION
+from ..operations.build_ops import _DATA_METHOD_OPERATION, _OPERATION_REGISTRY
+
+# 不能转换为参数值的表达式
+_UNSUPPORTED = object()
 
 
 class PandasParser(ast.NodeVisitor):
+    """将 pandas 脚本解析为 LogicalPlan.
+
+    整个脚本只调用一次 ast.parse, 然后按语句顺序单次遍历: 先计算赋值语句右侧的表达式 (方法链由内向外),
+    再创建左侧的数据节点, 因此同名变量的重新赋值和重复出现的算子都会连接到正确版本的节点上.
+    多行语句和函数定义由 ast 直接处理, 函数定义注册为 udf 算子.
+    """
+
     def __init__(self, start_node_name: List[str], end_node_name: str = None):
         self.dag = LogicalPlan()
         self.start_node_name = [start_node_name] if isinstance(start_node_name, str) else start_node_name
         self._end_node_name = end_node_name
+        self._code = ""
+        self._udfs: Dict[str, str] = {}
+        # 赋值为常量 (非文件路径) 的变量, 作为算子参数时直接替换为常量值
+        self._constants: Dict[str, Any] = {}
 
     @property
     def end_node_name(self) -> str:
@@ -48,138 +61,144 @@ class PandasParser(ast.NodeVisitor):
             node_name = f"pd.{node_name}"
         return node_name
 
-    def visit_Assign(self, node) -> Tuple:
-        """解析变量赋值，记录变量名及其来源"""
-        if isinstance(node.targets[0], ast.Name):
-            var_name = node.targets[0].id  # 变量名
-            source = self._get_source(node.value)
-            return var_name, source, node
-
-    def visit_Call(self, node) -> List[str]:
-        """解析函数调用，例如 pd.read_csv(input_csv)"""
-        func_name = self._get_func_name(node.func)
-        func_name = self.update_node_name(func_name)
-        func_args = [self._get_arg_value(arg) for arg in node.args]
-        func_keywords = {kw.arg: self._get_arg_value(kw.value) for kw in node.keywords}
-
-        # dag
-        func_args = [func_args] if isinstance(func_args, str) else func_args
-        input_nodes = [n for n in func_args if self.dag.has_node(n)]
-        self.dag.add_operation_node(func_name, func_name, func_args, func_keywords, input_nodes=input_nodes)
-        # 返回入参中的数据节点
-        return [n for n in input_nodes if self.dag[n]["type"] == "data"]
-
-    def visit_Subscript(self, node) -> List[str]:
-        """解析 DataFrame 列选择，例如 df["value"]"""
-        col_name = self._get_arg_value(node.slice)
-        #
-        obj = self._get_source(node.value)
-        # dag
-        self.dag.add_operation_node("select", "select", col_name, input_nodes=obj)
-        # 返回obj[x]中的obj
-        return [obj]
-
-    def _get_func_name(self, node):
-        """获取函数名"""
-        if isinstance(node, ast.Attribute):
-            # obj.x 模式表示 df.count(), df.sum()之类的`对象.属性`代码。obj == node.value, x == node.attr；
-            # df.x(): obj.x 中，当obj是 Dataframe 之类的python变量，而.x是是方法链函数时
-            if node.attr in _DATA_METHOD_OPERATION and isinstance(node.value, ast.Name):
-                self.dag.add_edge(node.value.id, node.attr)
-            # ["col"].x(): 当obj是Subscript类型，而.x是是方法链函数，默认obj为 select算子
-            elif node.attr in _DATA_METHOD_OPERATION and isinstance(node.value, ast.Subscript):
-                self.dag.add_edge("select", node.attr)
-            return node.attr
-        # node为变量名
-        elif isinstance(node, ast.Name):
-            return node.id
-        return None
-
-    def _get_arg_value(self, node):
-        """获取参数值，可能是字符串、数字或变量"""
-        if isinstance(node, ast.Constant):
-            return node.value
-        elif isinstance(node, ast.Name):
-            return node.id
-        return None
-
-    def _get_source(self, node):
-        """获取赋值来源"""
+    def parse(self, code: str, verbose: bool = False) -> LogicalPlan:
+        self._code = textwrap.dedent(code)
+        tree = ast.parse(self._code)
+        # udf 可以在被调用之后才定义, 先注册顶层的函数定义
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                self.visit_FunctionDef(node)
+        for node in tree.body:
+            if not isinstance(node, ast.FunctionDef):
+                self.visit(node)
+                if verbose and isinstance(node, ast.Assign):
+                    self.dag.visualize()
+        return self.dag
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """用户自定义的函数注册为 udf 算子"""
+        if node.name in self._udfs:
+            return
+        udf_block = ast.get_source_segment(self._code, node) + "\n"
+        self._udfs[node.name] = udf_block
+        self.dag.add_operation_node(node.name, "udf", udf_name=node.name, udf_block=udf_block)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        pass
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        pass
+
+    def visit_Expr(self, node: ast.Expr) -> None:
+        """没有赋值的表达式, 例如 df.sum(), 同样加入 dag"""
+        self._expr(node.value)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """解析变量赋值: 先构建右侧表达式的算子, 再创建左侧变量的数据节点"""
+        if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name):
+            return
+        var_name = node.targets[0].id
+        value = node.value
+
+        if isinstance(value, ast.Constant):
+            if isinstance(value.value, str) and value.value.endswith(SUPPORT_FIEL_TYPES):
+                self._constants.pop(var_name, None)
+                self.dag.add_data_node(var_name, data_type="io", source=value.value)
+                self.dag.add_edge(value.value, var_name)
+            else:
+                self._constants[var_name] = value.value
+            return
+
+        source = self._expr(value)
+        if source is None:
+            return
+        self._constants.pop(var_name, None)
+        self.dag.add_data_node(var_name, data_type="memory")
+        self.dag.add_edge(source, var_name)
+
+    def _expr(self, node: ast.expr) -> Optional[str]:
+        """构建表达式对应的算子, 返回产生表达式结果的节点名, 不能加入 dag 的表达式返回 None"""
+        if isinstance(node, ast.Name):
+            return self.dag.get_last_node(node.id) if self.dag.has_node(node.id) else None
         if isinstance(node, ast.Call):
-            return self._get_func_name(node.func)
-        elif isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Constant):
-            return node.value
-        elif isinstance(node, ast.Subscript):
-            return "select"
+            return self._call(node)
+        if isinstance(node, ast.Subscript):
+            return self._subscript(node)
         return None
 
-    def _get_parent_var(self, node):
-        """获取赋值变量名称"""
-        parent = node.parent if hasattr(node, "parent") else None
-        if isinstance(parent, ast.Assign) and isinstance(parent.targets[0], ast.Name):
-            return parent.targets[0].id
-        return None
+    def _call(self, node: ast.Call) -> Optional[str]:
+        """解析函数调用, 例如 pd.read_csv(input_csv), df.groupby("a"), udf(df)"""
+        input_nodes = []
+        if isinstance(node.func, ast.Attribute):
+            # obj.x(): obj 是 dag 中的节点时 x 是方法链中的方法, 否则是模块函数, 例如 pd.read_csv
+            receiver = self._expr(node.func.value)
+            func_name = node.func.attr if receiver else self.update_node_name(node.func.attr)
+            if receiver:
+                input_nodes.append(receiver)
+            if func_name not in _DATA_METHOD_OPERATION and func_name not in _OPERATION_REGISTRY:
+                return None
+        elif isinstance(node.func, ast.Name):
+            func_name = node.func.id
+            if func_name not in self._udfs and func_name not in _OPERATION_REGISTRY:
+                return None
+        else:
+            return None
+
+        func_args = []
+        for arg in node.args:
+            value = self._arg_value(arg)
+            func_args.append(None if value is _UNSUPPORTED else value)
+            if isinstance(arg, ast.Name) and self.dag.has_node(arg.id):
+                # 入参中的变量是 dag 中的数据节点
+                input_nodes.append(self.dag.get_last_node(arg.id))
+            elif isinstance(arg, (ast.Call, ast.Subscript)):
+                arg_node = self._expr(arg)
+                if arg_node is not None:
+                    input_nodes.append(arg_node)
+        func_keywords = {}
+        for kw in node.keywords:
+            value = self._arg_value(kw.value)
+            func_keywords[kw.arg] = None if value is _UNSUPPORTED else value
 
-    def parse_line(self, line):
-        try:
-            tree = ast.parse(line)
-            var_name, source, assign_node, right_var_names = None, None, None, []
-            for node in ast.walk(tree):
-                for child in ast.iter_child_nodes(node):
-                    child.parent = node  # 给AST节点添加父节点信息
-                if isinstance(node, ast.Assign):
-                    var_name, source, assign_node = self.visit_Assign(node)
-                elif isinstance(node, ast.Call):
-                    right_var_names.extend(self.visit_Call(node))
-                elif isinstance(node, ast.Subscript):
-                    right_var_names.extend(self.visit_Subscript(node))
-            return var_name, source, right_var_names, assign_node
-        except SyntaxError:
-            print(f"语法错误: {line}")
-            return var_name, source, right_var_names, assign_node
-
-    def add_data_node(self, var_name, source, assign_node: ast.Assign):
-        source = self.update_node_name(source)
-        if source:
-            if not isinstance(assign_node.value, ast.Constant):
-                self.dag.add_data_node(var_name, data_type="memory")
-            elif source.endswith(SUPPORT_FIEL_TYPES):
-                self.dag.add_data_node(var_name, data_type="io", source=source)
-
-    @staticmethod
-    def parse_function(code: str) -> Tuple[str, Dict]:
-        """解析用户自定义的函数"""
-        function_pattern = re.compile(r"def\s+(\w+)\(.*?\):\s*\n(?:[ \t]+.*\n)*")
-        # 查找所有匹配的函数
-        function_blocks = function_pattern.finditer(code)
-        function_dict = {}
-        for match in function_blocks:
-            func_name = match.group(1)
-            func_code = match.group(0)
-            function_dict[func_name] = func_code
-        non_function_code = function_pattern.sub("", code)
-        return non_function_code, function_dict
-
-    def parse_udf(self, code: str) -> Tuple[str, Dict]:
-        non_function_code, function_dict = self.parse_function(code)
-        for udf_name, udf_block in function_dict.items():
-            self.dag.add_operation_node(udf_name, "udf", udf_name=udf_name, udf_block=udf_block)
-        pprint(f"User define function :\n{function_dict}")
-        return non_function_code
-
-    def parse(self, code: str, verbose: bool = False):
-        pipeline_code = self.parse_udf(code)
-        lines = pipeline_code.strip().split("\n")
-        for line in lines:
-            if line.strip():  # 忽略空行
-                var_name, source, right_var_names, assign_node = self.parse_line(line.strip())
-                if var_name:
-                    # create right var_name as data node
-                    self.add_data_node(var_name, source, assign_node)
-                    self.dag.add_edge(
-                        self.update_node_name(source), self.update_node_name(var_name), var_name in right_var_names
-                    )
-                    if verbose:
-                        self.dag.visualize()
+        self.dag.add_operation_node(func_name, func_name, func_args, func_keywords, input_nodes=input_nodes)
+        return self.dag.get_last_node(func_name)
+
+    def _subscript(self, node: ast.Subscript) -> Optional[str]:
+        """解析列选择, 例如 df["value"], df[["a", "b"]], df.loc[:, ["a", "b"]]"""
+        if isinstance(node.value, ast.Attribute) and node.value.attr == "loc":
+            receiver = self._expr(node.value.value)
+            func_name = "loc"
+        else:
+            receiver = self._expr(node.value)
+            func_name = "select"
+        if receiver is None:
+            return None
+
+        key = self._arg_value(node.slice)
+        if key is _UNSUPPORTED:
+            return None
+        if func_name == "loc":
+            key = list(key) if isinstance(key, tuple) else [key]
+        self.dag.add_operation_node(func_name, func_name, key, input_nodes=receiver)
+        return self.dag.get_last_node(func_name)
+
+    def _arg_value(self, node: ast.expr) -> Any:
+        """获取参数值: 常量, 变量名, 常量组成的 list/tuple/dict, 以及切片 `:` (用 None 表示)"""
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self._constants.get(node.id, node.id)
+        if isinstance(node, ast.Slice) and node.lower is None and node.upper is None and node.step is None:
+            return None
+        if isinstance(node, (ast.List, ast.Tuple)):
+            values = [self._arg_value(elt) for elt in node.elts]
+            if _UNSUPPORTED in values:
+                return _UNSUPPORTED
+            return values if isinstance(node, ast.List) else tuple(values)
+        if isinstance(node, ast.Dict) and None not in node.keys:
+            items = [(self._arg_value(k), self._arg_value(v)) for k, v in zip(node.keys, node.values)]
+            if any(_UNSUPPORTED in item for item in items):
+                return _UNSUPPORTED
+            return dict(items)
+        # 嵌套的表达式 (Call, Subscript) 作为入参时, 其结果通过 dag 中的边传入
+        return _UNSUPPORTED
@@ -0,0 +1,166 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+import networkx as nx
+
+from ..core.protos import plan_pb2
+from .data_node import DataNode
+from .operations import OperationNode, UserDefinedFunctionOp, create_ops
+
+if TYPE_CHECKING:
+    from .logical_plan import LogicalPlan
+
+
+class _StringTable(object):
+    """字符串表: 节点名, 算子名等重复出现的字符串只保存一次, 其他位置使用下标引用"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _encode_value(value: Any, table: _StringTable, msg: plan_pb2.Value) -> plan_pb2.Value:
+    """将算子参数编码为 Value, 支持 None, bool, int, float, str 以及由它们组成的 list/tuple/dict"""
+    if value is None:
+        msg.null_value = True
+    elif isinstance(value, bool):
+        msg.bool_value = value
+    elif isinstance(value, int):
+        msg.int_value = value
+    elif isinstance(value, float):
+        msg.double_value = value
+    elif isinstance(value, str):
+        msg.string_value = table.intern(value)
+    elif isinstance(value, (list, tuple)):
+        msg.list_value.is_tuple = isinstance(value, tuple)
+        msg.list_value.SetInParent()
+        for item in value:
+            _encode_value(item, table, msg.list_value.values.add())
+    elif isinstance(value, dict):
+        msg.map_value.SetInParent()
+        _encode_map(value, table, msg.map_value)
+    else:
+        raise TypeError(f"不支持序列化的参数类型: {type(value).__name__}")
+    return msg
+
+
+def _encode_map(value: Dict[str, Any], table: _StringTable, msg: plan_pb2.ValueMap) -> None:
+    for key, item in value.items():
+        if not isinstance(key, str):
+            raise TypeError(f"字典参数的键必须是 str, 实际为: {type(key).__name__}")
+        msg.keys.append(table.intern(key))
+        _encode_value(item, table, msg.values.add())
+
+
+def _decode_value(msg: plan_pb2.Value, strings: List[str]) -> Any:
+    kind = msg.WhichOneof("kind")
+    if kind is None or kind == "null_value":
+        return None
+    if kind == "string_value":
+        return strings[msg.string_value]
+    if kind == "list_value":
+        values = [_decode_value(item, strings) for item in msg.list_value.values]
+        return tuple(values) if msg.list_value.is_tuple else values
+    if kind == "map_value":
+        return {
+            strings[key]: _decode_value(item, strings) for key, item in zip(msg.map_value.keys, msg.map_value.values)
+        }
+    return getattr(msg, kind)
+
+
+def _op_key(obj: OperationNode) -> Tuple:
+    """参数相同的算子共用 Plan.ops 中的一项, repr 可以区分 list/tuple 和 int/float 等类型"""
+    return (
+        obj.function_name,
+        repr(obj.function_positional_args),
+        repr(obj._function_keyword_args),
+        repr(obj.target_ops),
+        getattr(obj, "udf_name", None),
+        getattr(obj, "udf_block", None),
+    )
+
+
+def _encode_op(obj: OperationNode, table: _StringTable, op: plan_pb2.OperationNode) -> None:
+    op.function_name = table.intern(obj.function_name)
+    _encode_value(obj.function_positional_args, table, op.positional_args)
+    _encode_value(obj._function_keyword_args, table, op.keyword_args)
+    _encode_value(obj.target_ops, table, op.target_ops)
+    if isinstance(obj, UserDefinedFunctionOp):
+        op.udf_name = table.intern(obj.udf_name)
+        op.udf_block = table.intern(obj.udf_block or "")
+
+
+def plan_to_bytes(plan: "LogicalPlan") -> bytes:
+    table = _StringTable()
+    msg = plan_pb2.Plan()
+    data_index: Dict[Tuple, int] = {}
+    op_index: Dict[Tuple, int] = {}
+    node_index: Dict[str, int] = {}
+    node_names, node_types, node_objs = [], [], []
+    for node_name, attrs in plan.graph.nodes(data=True):
+        node_index[node_name] = len(node_names)
+        node_names.append(table.intern(node_name))
+        obj = attrs.get("obj")
+        if isinstance(obj, DataNode):
+            key = (obj.name, obj.data_type, obj.source)
+            if key not in data_index:
+                data_index[key] = len(msg.data)
+                msg.data.add(
+                    name=table.intern(obj.name), data_type=table.intern(obj.data_type), source=table.intern(obj.source)
+                )
+            node_types.append(plan_pb2.DATA)
+            node_objs.append(data_index[key])
+        elif obj is not None:
+            key = _op_key(obj)
+            if key not in op_index:
+                op_index[key] = len(msg.ops)
+                _encode_op(obj, table, msg.ops.add())
+            node_types.append(plan_pb2.OPERATION)
+            node_objs.append(op_index[key])
+        else:
+            node_types.append(plan_pb2.NONE)
+            node_objs.append(0)
+    msg.node_names.extend(node_names)
+    msg.node_types.extend(node_types)
+    msg.node_objs.extend(node_objs)
+    msg.edges.extend(node_index[n] for edge in plan.graph.edges for n in edge)
+    msg.strings.extend(table.strings)
+    return msg.SerializeToString()
+
+
+def _decode_op(op: plan_pb2.OperationNode, strings: List[str]) -> OperationNode:
+    has_udf = op.HasField("udf_name")
+    return create_ops(
+        strings[op.function_name],
+        _decode_value(op.positional_args, strings),
+        _decode_value(op.keyword_args, strings),
+        target_ops=_decode_value(op.target_ops, strings),
+        udf_name=strings[op.udf_name] if has_udf else None,
+        udf_block=strings[op.udf_block] if has_udf else None,
+    )
+
+
+def plan_from_bytes(data: bytes) -> nx.DiGraph:
+    msg = plan_pb2.Plan.FromString(data)
+    strings = list(msg.strings)
+    data_nodes = [(strings[d.name], strings[d.data_type], strings[d.source]) for d in msg.data]
+    graph = nx.DiGraph()
+    node_names = [strings[i] for i in msg.node_names]
+    for node_name, node_type, index in zip(node_names, msg.node_types, msg.node_objs):
+        if node_type == plan_pb2.DATA:
+            name, data_type, source = data_nodes[index]
+            graph.add_node(node_name, type="data", obj=DataNode(name, data_type=data_type, source=source))
+        elif node_type == plan_pb2.OPERATION:
+            # 每个节点都重新解码参数, 避免不同节点共用同一个可变的参数对象
+            graph.add_node(node_name, type="op", obj=_decode_op(msg.ops[index], strings))
+        else:
+            graph.add_node(node_name)
+    edges = msg.edges
+    graph.add_edges_from((node_names[edges[i]], node_names[edges[i + 1]]) for i in range(0, len(edges), 2))
+    return graph
@@ -22,6 +22,11 @@ class Field:
     def from_torch(self, obj) -> Any:
         return self.dtype.from_torch(obj)
 
+    def to_dict(self) -> Dict[str, str]:
+        """dump field to dict, like: {'Y': 'int, target'}"""
+        dtype = self.dtype.name if isinstance(self.dtype, Datatype) else self.dtype
+        return {self.name: f"{dtype}, {self.tag}" if self.tag else dtype}
+
     @classmethod
     def from_dict(cls, field: Dict) -> "Field":
         """load field from string, like: {'Y': 'int, target'}"""
@@ -1,3 +1,4 @@
+import json
 from dataclasses import dataclass, field
 from typing import Dict, List
 
@@ -66,6 +67,17 @@ class TableSchema:
         fields = [Field.from_string(f) for f in data_schema.split(";")]
         return cls(fields)
 
+    def to_list(self) -> List[Dict[str, str]]:
+        """dump schema to List[Dict], the inverse of from_list"""
+        return [f.to_dict() for f in self.fields]
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_list())
+
+    @classmethod
+    def from_json(cls, data_schema: str) -> "TableSchema":
+        return cls.from_list(json.loads(data_schema))
+
     def to_dict(self) -> dict:
         return {f.name: f.dtype for f in self.fields}
 
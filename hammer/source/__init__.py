@@ -1,6 +1,7 @@
 from .files import SUPPORT_FIEL_TYPES
 from .base import ClientBase, DataSource
 from .batch import BatchSource
+from .snapshot import SnapshotCache
 
 
 __all__ = [
@@ -8,4 +9,5 @@ __all__ = [
     "ClientBase",
     "DataSource",
     "BatchSource",
+    "SnapshotCache",
 ]
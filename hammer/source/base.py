@@ -1,4 +1,7 @@
-from typing import Dict, Literal, Optional
+import copy
+from typing import Any, Dict, List, Literal, Optional
+
+import pandas as pd
 
 from hammer.config import CONF
 from hammer.core.protos.source_pb2 import Source as SourceProto
@@ -7,6 +10,8 @@ from hammer.utils.client.clickhouse import ClickHouseClient
 from hammer.utils.client.client import ClientBase
 from hammer.utils.client.postgres import PostgresClient
 
+from .snapshot import SnapshotCache
+
 
 class DataSource(object):
     """创建批数据源, 生成元数据信息"""
@@ -25,6 +30,14 @@ class DataSource(object):
         description: str = None,
         config: Dict = None,
         use_copy: bool = False,
+        partition_column: str = None,
+        num_partitions: int = 1,
+        snapshot_dir: str = None,
+        snapshot_ttl: float = None,
+        freshness_probe: str = None,
+        incremental_column: str = None,
+        lateness: Any = None,
+        dedup_keys: List[str] = None,
     ):
         self.name = name
         self.version = version
@@ -48,6 +61,19 @@ class DataSource(object):
         self._data: PandasTable = None
         self._fetch_data_sql = None
         self._use_copy = use_copy
+        # 按 partition_column 的取值范围切分为 num_partitions 个查询并发读取
+        self.partition_column = partition_column
+        self.num_partitions = num_partitions
+        # 本地 parquet 快照, freshness_probe 为 "count" 时比较行数, 为列名时比较该列的最大值 (比如 updated_at)
+        self.snapshot = SnapshotCache(snapshot_dir, ttl=snapshot_ttl) if snapshot_dir else None
+        self.freshness_probe = freshness_probe
+        # 快照失效时只拉取 incremental_column 大于水位线 (快照中的最大值减去 lateness) 的数据, 按 dedup_keys 去重后合并
+        self.incremental_column = incremental_column
+        self.lateness = lateness
+        self.dedup_keys = dedup_keys
+        # 优化器下推的列裁剪和过滤条件
+        self._columns: List[str] = None
+        self._predicates: List[str] = []
 
     @property
     def __hash_key__(self):
@@ -69,10 +95,61 @@ class DataSource(object):
             return False
         return self.__hash_key__ == value.__hash_key__
 
+    def __getstate__(self):
+        # 数据库连接不能跨进程传递, 在子进程中重新创建; copy.copy 也会调用此方法
+        return dict(self.__dict__, _client=None)
+
     @property
     def fetch_data_sql(self) -> str:
         raise NotImplementedError
 
+    def push_down(self, columns: List[str] = None, predicate: str = None) -> None:
+        """下推列裁剪和过滤条件, 使其在数据库中执行.
+
+        Args:
+            columns (List[str], optional): 需要拉取的列, 使用 field_mapping 之后的列名.
+            predicate (str, optional): pandas query 形式的过滤条件, 例如 "value > 10".
+        """
+        raise NotImplementedError
+
+    def copy(self) -> "DataSource":
+        """返回可以独立下推列裁剪和过滤条件的副本, 副本的下推不会影响原数据源"""
+        source = copy.copy(self)
+        source._predicates = list(self._predicates)
+        # 副本共用数据库连接, 已经拉取的数据不包含之后下推的条件, 需要重新拉取
+        source._client, source._data = self._client, None
+        return source
+
+    def time_range(self, column: str, start: Any = None, end: Any = None) -> "DataSource":
+        """返回只拉取 column 在 [start, end] 范围内数据的副本, 时间范围作为过滤条件下推到 fetch_data_sql 中.
+
+        原数据源不受影响, 因此同一个数据源可以被时间窗口不同的多个特征使用. column 不确定在 select 的列中时
+        (见 selects) 不下推, 返回的副本拉取全部数据, 需要调用方在拉取后过滤.
+
+        Args:
+            column (str): 时间列, 使用 field_mapping 之后的列名.
+            start (Any, optional): 开始时间 (包含), None 表示不限制.
+            end (Any, optional): 结束时间 (包含), None 表示不限制.
+        """
+        conditions = []
+        if start is not None:
+            conditions.append(f"{column} >= {str(pd.Timestamp(start))!r}")
+        if end is not None:
+            conditions.append(f"{column} <= {str(pd.Timestamp(end))!r}")
+        source = self.copy()
+        if conditions and self.selects(column):
+            source.push_down(predicate=" and ".join(conditions))
+        return source
+
+    def selects(self, column: str) -> bool:
+        """column 是否确定在 fetch_data_sql 的 select 的列中, 即 field_mapping 映射后的列或者下推的列.
+
+        select * 时无法确定数据表中是否有这一列, 也返回 False.
+        """
+        if self.field_mapping:
+            return column in self.field_mapping.values() and (not self._columns or column in self._columns)
+        return column in (self._columns or [])
+
     @property
     def client(self) -> ClientBase:
         if self._client is None:
@@ -84,12 +161,45 @@ class DataSource(object):
                 raise NotImplementedError
         return self._client
 
+    def _fetch(self) -> PandasTable:
+        if self.partition_column and self.num_partitions > 1:
+            return self.read_partitions()
+        return self.client.read(self.fetch_data_sql, use_copy=self._use_copy)
+
     @property
     def data(self) -> PandasTable:
         if self._data is None:
-            self._data = self.client.read(self.fetch_data_sql, use_copy=self._use_copy)
+            if self.snapshot is None:
+                self._data = self._fetch()
+                return self._data
+            probe = self.probe() if self.freshness_probe else None
+            self._data = self.snapshot.load(self, probe)
+            if self._data is None and self.incremental_column and self.snapshot.meta(self) is not None:
+                self._data = self.refresh_incremental(probe)
+            elif self._data is None:
+                self._data = self._fetch()
+                self.snapshot.save(self, self._data, probe)
         return self._data
 
+    def refresh_incremental(self, probe: Any = None) -> PandasTable:
+        """增量更新快照, 由子类实现"""
+        raise NotImplementedError
+
+    def refresh(self) -> PandasTable:
+        """丢弃内存中的数据和本地快照, 重新从数据库拉取"""
+        self._data = None
+        if self.snapshot is not None:
+            self.snapshot.invalidate(self)
+        return self.data
+
+    def probe(self) -> Any:
+        """数据源新鲜度探针, 由子类实现"""
+        raise NotImplementedError
+
+    def read_partitions(self) -> PandasTable:
+        """分区并发读取, 由子类实现"""
+        raise NotImplementedError
+
     def to_dict(self):
         return {
             "name": self.name,
@@ -1,6 +1,13 @@
-from typing import List
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 from hammer.table.table import PandasTable
+from hammer.utils.predicate import query_to_sql
 
 from .base import DataSource
 
@@ -9,24 +16,104 @@ class BatchSource(DataSource):
     _schema: PandasTable = None
     _nulls_count: PandasTable = None
 
+    @property
+    def _from_clause(self) -> str:
+        return (
+            f"\nfrom {self.database}.{self.table_name}"
+            if self.infra_type != "postgres"
+            else f"\nfrom {self.database}.public.{self.table_name}"
+        )
+
+    def _where_clause(self, predicates: List[str]) -> str:
+        if self.filter_conditions and predicates:
+            return f"\nwhere ({self.filter_conditions}) and {' and '.join(predicates)}"
+        elif self.filter_conditions:
+            return f"\nwhere {self.filter_conditions}"
+        elif predicates:
+            return f"\nwhere {' and '.join(predicates)}"
+        return ""
+
+    def _select_clause(self) -> str:
+        if self.field_mapping:
+            fields = [f"{k} as {v}" for k, v in self.field_mapping.items() if not self._columns or v in self._columns]
+            return f"select {','.join(fields)}"
+        elif self._columns:
+            return f"select {','.join(self._columns)}"
+        return "select *"
+
     @property
     def fetch_data_sql(self) -> str:
         if self._fetch_data_sql is None:
-            self._fetch_data_sql = "select *"
+            self._fetch_data_sql = self._select_clause() + self._from_clause + self._where_clause(self._predicates)
+        return self._fetch_data_sql
 
-            if self.field_mapping:
-                self._fetch_data_sql = f"select {','.join([f'{k} as {v}' for k, v in self.field_mapping.items()])}"
+    @property
+    def partition_sqls(self) -> List[str]:
+        """按 partition_column 的 min/max 等分为 num_partitions 个范围, 每个范围一个查询"""
+        column = self.partition_column
+        sql = f"select min({column}) as lo, max({column}) as hi" + self._from_clause
+        bounds = self.client.read(sql + self._where_clause(self._predicates))
+        predicates = range_predicates(column, bounds["lo"].iloc[0], bounds["hi"].iloc[0], self.num_partitions)
+        select = self._select_clause() + self._from_clause
+        return [select + self._where_clause([*self._predicates, p]) for p in predicates]
 
-            self._fetch_data_sql += (
-                f"\nfrom {self.database}.{self.table_name}"
-                if self.infra_type != "postgres"
-                else f"\nfrom {self.database}.public.{self.table_name}"
-            )
+    def probe(self) -> Any:
+        """比 fetch_data_sql 代价小得多的查询, 结果变化说明数据源已经更新"""
+        if self.freshness_probe == "count":
+            sql = "select count(*) as probe"
+        else:
+            sql = f"select max({self.freshness_probe}) as probe"
+        return self.client.read(sql + self._from_clause + self._where_clause(self._predicates))["probe"].iloc[0]
 
-            if self.filter_conditions:
-                self._fetch_data_sql += f"\nwhere {self.filter_conditions}"
+    def refresh_incremental(self, probe: Any = None) -> PandasTable:
+        """只拉取水位线之后的数据, 与本地快照合并.
 
-        return self._fetch_data_sql
+        水位线是快照中 incremental_column 的最大值减去 lateness, 用于包含迟到的数据. 合并时按 dedup_keys
+        去重并保留新拉取的行; 没有 dedup_keys 时用新数据替换快照中水位线之后的行.
+        """
+        column = (self.field_mapping or {}).get(self.incremental_column, self.incremental_column)
+        snapshot = self.snapshot.read(self)
+        watermark = snapshot[column].max()
+        if pd.isna(watermark):
+            data = self._fetch()
+        else:
+            lower = _watermark_bound(watermark, self.lateness)
+            predicate = f"{self.incremental_column} >= {_sql_literal(lower)}"
+            sql = self._select_clause() + self._from_clause + self._where_clause([*self._predicates, predicate])
+            delta = self.client.read(sql, use_copy=self._use_copy)
+            if self.dedup_keys:
+                data = pd.concat([snapshot, delta], ignore_index=True)
+                data = data.drop_duplicates(subset=self.dedup_keys, keep="last", ignore_index=True)
+            else:
+                data = pd.concat([snapshot[snapshot[column] < lower], delta], ignore_index=True)
+            data = PandasTable(data, copy=False)
+        self.snapshot.save(self, data, probe, watermark=data[column].max())
+        return data
+
+    def read_partitions(self) -> PandasTable:
+        """各分区的查询通过客户端的连接池并发执行, arrow 结果合并后再转换为 PandasTable.
+
+        并发数不超过连接池的大小, 否则 psycopg2 的连接池会因为连接耗尽报错; 各分区推断出的列类型可能不同
+        (比如某个分区中全是整数), 合并时按 permissive 规则提升为共同的类型.
+        """
+        sqls = self.partition_sqls
+        max_workers = min(len(sqls), getattr(self.client, "_pool_size", None) or len(sqls))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tables = list(executor.map(lambda sql: self.client.read_arrow(sql, use_copy=self._use_copy), sqls))
+        return PandasTable(pa.concat_tables(tables, promote_options="permissive").to_pandas(), copy=False)
+
+    def push_down(self, columns: List[str] = None, predicate: str = None) -> None:
+        if columns is not None:
+            self._columns = sorted(columns)
+        if predicate is not None:
+            # where 中不能使用 select 中的别名, 需要映射回数据库中的字段名
+            mapping = {v: k for k, v in (self.field_mapping or {}).items()}
+            condition = query_to_sql(predicate, mapping)
+            if condition is None:
+                raise ValueError(f"无法将过滤条件转换为 sql: {predicate}")
+            self._predicates.append(condition)
+        self._fetch_data_sql = None
+        self._data = None
 
     def head(self, n=5) -> PandasTable:
         sql = (
@@ -131,3 +218,61 @@ class BatchSource(DataSource):
 
     def count_nulls(self) -> PandasTable:
         return self.nulls_count
+
+
+def _watermark_bound(watermark: Any, lateness: Any) -> Any:
+    """水位线减去 lateness 作为增量拉取的下界, sql 和快照的过滤使用同一个下界.
+
+    时间类型的下界精确到微秒 (数据库中时间的最高精度); DATE 列的水位线是 datetime.date, 减去 lateness 后向下取整到天.
+    """
+    lower = watermark
+    if isinstance(watermark, datetime.date):
+        lower = pd.Timestamp(watermark)
+        if lateness is not None:
+            lower -= pd.Timedelta(lateness)
+        return lower.floor("us") if isinstance(watermark, datetime.datetime) else lower.date()
+    return lower if lateness is None else lower - lateness
+
+
+def _sql_literal(value: Any) -> str:
+    if isinstance(value, datetime.datetime):
+        value = pd.Timestamp(value)
+        # 有小于秒的部分时保留到微秒, 否则与快照中的值比较时会重复拉取或者遗漏数据
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond or value.nanosecond else "%Y-%m-%d %H:%M:%S"
+        return f"'{value.strftime(fmt)}'"
+    if isinstance(value, datetime.date):
+        return f"'{value.isoformat()}'"
+    return repr(value)
+
+
+def range_predicates(column: str, lo: Any, hi: Any, num_partitions: int) -> List[str]:
+    """将 [lo, hi] 等分为 num_partitions 个左闭右开的范围, 最后一个范围包含 hi, 第一个范围包含空值.
+
+    支持整数, 浮点数和时间类型的列, 整数和时间的边界取整 (时间取整到秒) 后去重, 因此范围个数可能少于 num_partitions.
+    """
+    if pd.isna(lo) or pd.isna(hi):
+        return [f"{column} is null"]
+    if isinstance(lo, (datetime.date, np.datetime64)):
+        lo, hi = pd.Timestamp(lo), pd.Timestamp(hi)
+        values = np.linspace(lo.value, hi.value, num_partitions + 1)
+        edges = list(dict.fromkeys(pd.Timestamp(int(v)).floor("s") for v in values))
+        # 最后一个边界向上取整到秒以包含 hi; lo 和 hi 在同一秒内时只有一个边界, 需要追加而不是替换
+        if len(edges) > 1:
+            edges[-1] = hi.ceil("s")
+        elif hi.ceil("s") > edges[0]:
+            edges.append(hi.ceil("s"))
+    elif isinstance(lo, (int, np.integer)):
+        edges = np.unique(np.linspace(int(lo), int(hi), num_partitions + 1).astype(np.int64)).tolist()
+    elif isinstance(lo, (float, np.floating)):
+        edges = np.linspace(float(lo), float(hi), num_partitions + 1).tolist()
+    else:
+        raise ValueError(f"分区列 {column} 的类型不支持按范围切分: {type(lo).__name__}")
+
+    if len(edges) < 2:
+        return [f"({column} = {_sql_literal(edges[0])} or {column} is null)"]
+    predicates = []
+    for i, (start, end) in enumerate(zip(edges[:-1], edges[1:])):
+        upper = "<=" if i == len(edges) - 2 else "<"
+        predicate = f"{column} >= {_sql_literal(start)} and {column} {upper} {_sql_literal(end)}"
+        predicates.append(f"(({predicate}) or {column} is null)" if i == 0 else f"({predicate})")
+    return predicates
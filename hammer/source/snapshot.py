@@ -0,0 +1,176 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from hammer.table.table import PandasTable
+
+if TYPE_CHECKING:
+    from .base import DataSource
+
+_META_FILE = "_meta.json"
+_CURRENT_FILE = "CURRENT"
+_LOCK_FILE = ".lock"
+# 每个分片文件的最大行数, 分片可以被 pyarrow 并行读取, 也避免单个文件过大
+_ROWS_PER_PART = 1_000_000
+_READ_ATTEMPTS = 5
+
+
+class SnapshotCache(object):
+    """DataSource 拉取结果的本地 parquet 快照, 新的进程可以直接读取快照而不需要重新访问数据库.
+
+    快照按 <cache_dir>/<name>/<version>/<key>/ 分目录保存, key 由 __hash_key__ 和 fetch_data_sql 计算,
+    下推的列裁剪或者过滤条件不同时使用不同的快照. 每次写入生成一个新的版本目录, 数据按行数切分为多个
+    part-<i>.parquet 分片; 写完后通过原子替换 CURRENT 文件切换到新版本, 因此并发的读取总能读到一个完整的版本.
+    切换 CURRENT 和清理旧版本在文件锁中进行, CURRENT 只会指向更新的版本. 快照在以下情况下失效:
+        - 超过 ttl 秒
+        - 数据源的 freshness_probe 结果与写入快照时不同
+        - 调用 invalidate (DataSource.refresh)
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], ttl: Optional[float] = None, rows_per_part: int = _ROWS_PER_PART):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.rows_per_part = rows_per_part
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source: "DataSource") -> str:
+        payload = json.dumps([source.__hash_key__, source.fetch_data_sql], default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _dir(self, source: "DataSource") -> Path:
+        return self.cache_dir / str(source.name) / str(source.version) / self.key(source)
+
+    def _current(self, source: "DataSource") -> Optional[Path]:
+        """CURRENT 指向的版本目录, 没有快照时返回 None"""
+        target = self._dir(source)
+        try:
+            return target / (target / _CURRENT_FILE).read_text().strip()
+        except OSError:
+            return None
+
+    def meta(self, source: "DataSource") -> Optional[Dict[str, Any]]:
+        current = self._current(source)
+        if current is None:
+            return None
+        try:
+            with open(current / _META_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, source: "DataSource", probe: Any = None) -> bool:
+        meta = self.meta(source)
+        if meta is None:
+            return False
+        if self.ttl is not None and time.time() - meta["created_at"] > self.ttl:
+            return False
+        return probe is None or meta["probe"] == _probe_value(probe)
+
+    def load(self, source: "DataSource", probe: Any = None) -> Optional[PandasTable]:
+        """读取新鲜的快照, 没有快照或者快照已经失效时返回 None"""
+        if not self.is_fresh(source, probe):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.read(source)
+
+    def read(self, source: "DataSource") -> PandasTable:
+        """读取快照, 不检查是否新鲜.
+
+        读取期间其他进程写入了多个新版本时, 正在读取的旧版本可能被删除, 此时重新读取 CURRENT 指向的版本.
+        """
+        for attempt in range(_READ_ATTEMPTS):
+            current = self._current(source)
+            if current is None:
+                raise FileNotFoundError(f"数据源 {source.name} 没有快照")
+            try:
+                # 按 _meta.json 中记录的分片数读取, 版本目录被删除时会报错, 而不是读到不完整的数据
+                with open(current / _META_FILE) as f:
+                    parts = json.load(f)["parts"]
+                tables = [pq.read_table(current / f"part-{i}.parquet") for i in range(parts)]
+                return PandasTable(pa.concat_tables(tables).to_pandas(), copy=False)
+            except OSError:
+                if attempt == _READ_ATTEMPTS - 1:
+                    raise
+
+    def save(self, source: "DataSource", data: PandasTable, probe: Any = None, **meta) -> None:
+        target = self._dir(source)
+        # 先写完整的版本目录, 再原子地替换 CURRENT, 其他进程不会读到写了一半或者被删除的快照
+        version = f"v-{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        version_dir = target / version
+        version_dir.mkdir(parents=True)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        starts = range(0, max(table.num_rows, 1), self.rows_per_part)
+        for i, start in enumerate(starts):
+            pq.write_table(table.slice(start, self.rows_per_part), version_dir / f"part-{i}.parquet")
+        meta = {
+            "hash_key": list(source.__hash_key__),
+            "sql": source.fetch_data_sql,
+            "created_at": time.time(),
+            "probe": _probe_value(probe),
+            "nrows": len(data),
+            "parts": len(starts),
+            **meta,
+        }
+        with open(version_dir / _META_FILE, "w") as f:
+            json.dump(meta, f, default=str)
+        with self._lock(target):
+            current = self._current(source)
+            if current is not None and current.name > version:
+                # 其他进程已经发布了更新的版本, CURRENT 只向前移动
+                shutil.rmtree(version_dir, ignore_errors=True)
+                return
+            tmp_file = target / f".{_CURRENT_FILE}.{uuid.uuid4().hex}.tmp"
+            tmp_file.write_text(version)
+            os.replace(tmp_file, target / _CURRENT_FILE)
+            self._cleanup(target, version, keep=1)
+
+    @staticmethod
+    @contextmanager
+    def _lock(target: Path):
+        """同一个快照目录的 CURRENT 切换和旧版本清理在进程间互斥"""
+        with open(target / _LOCK_FILE, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _cleanup(target: Path, current: str, keep: int) -> None:
+        """在锁中调用, 删除比 current 旧的版本, 只保留其中最新的 keep 个, 刚被替换的版本可能还在被其他进程读取.
+
+        比 current 新的版本还在被其他进程写入, 写完后由写入的进程发布或者删除.
+        """
+        versions = sorted(p for p in target.iterdir() if p.name.startswith("v-") and p.name < current)
+        for path in versions[: len(versions) - keep]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def invalidate(self, source: "DataSource") -> None:
+        target = self._dir(source)
+        if not target.exists():
+            return
+        with self._lock(target):
+            current = self._current(source)
+            if current is None:
+                return
+            os.remove(target / _CURRENT_FILE)
+            self._cleanup(target, current.name, keep=0)
+            shutil.rmtree(current, ignore_errors=True)
+
+
+def _probe_value(probe: Any) -> Optional[str]:
+    """探针结果统一转换为字符串, 以便与 json 中保存的值比较"""
+    return None if probe is None else str(probe)
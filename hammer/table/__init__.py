@@ -1,6 +1,7 @@
 from .table import PandasTable
 from .table_base import TableBase
 from .entity import Entity
+from .streaming import KMVSketch, StreamingStats
 
 
-__all__ = ["TableBase", "PandasTable", "Entity"]
+__all__ = ["TableBase", "PandasTable", "Entity", "KMVSketch", "StreamingStats"]
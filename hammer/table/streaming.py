@@ -0,0 +1,111 @@
+from typing import Any, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+class KMVSketch(object):
+    """K-Minimum-Values 基数估计, 用固定的内存估计一列的 nunique, 多个分块的 sketch 可以合并.
+
+    保存所有值哈希后最小的 k 个, 不同值个数小于 k 时结果是精确的, 否则相对误差约为 1/sqrt(k).
+    """
+
+    def __init__(self, k: int = 4096):
+        self.k = k
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def _add_hashes(self, hashes: np.ndarray) -> None:
+        if len(self._hashes) >= self.k:
+            # 已经保存了 k 个哈希值, 只有更小的值才可能进入 sketch
+            hashes = hashes[hashes < self._hashes[-1]]
+        self._hashes = np.unique(np.concatenate([self._hashes, hashes]))[: self.k]
+
+    def update(self, values: pd.Series) -> "KMVSketch":
+        values = values.dropna()
+        if len(values):
+            self._add_hashes(pd.util.hash_pandas_object(values, index=False).to_numpy())
+        return self
+
+    def merge(self, other: "KMVSketch") -> "KMVSketch":
+        assert self.k == other.k, "只能合并 k 相同的 sketch"
+        self._add_hashes(other._hashes)
+        return self
+
+    def estimate(self) -> float:
+        if len(self._hashes) < self.k:
+            return float(len(self._hashes))
+        return (self.k - 1) / ((float(self._hashes[-1]) + 1) / 2.0**64)
+
+
+class StreamingStats(object):
+    """对分块读取的数据做增量统计, 内存占用与行数无关, 不同分块或者不同文件的统计结果可以合并.
+
+    Examples:
+        >>> stats = StreamingStats.from_chunks(PandasTable.iter_csv(path, schema, chunk_rows=1_000_000))
+        >>> stats.mean()
+    """
+
+    def __init__(self, missing_val: Dict[str, Any] = None, sketch_k: int = 4096):
+        self.missing_val = missing_val or {}
+        self.sketch_k = sketch_k
+        self.nrows = 0
+        self._sum = pd.Series(dtype="float64")
+        self._count = pd.Series(dtype="int64")
+        self._missing = pd.Series(dtype="int64")
+        self._sketches: Dict[str, KMVSketch] = {}
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame], **kwargs) -> "StreamingStats":
+        stats = cls(**kwargs)
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingStats":
+        self.nrows += len(chunk)
+        numeric = chunk.select_dtypes(include="number", exclude="timedelta")
+        self._sum = self._sum.add(numeric.sum(), fill_value=0)
+        self._count = self._count.add(chunk.count(), fill_value=0).astype("int64")
+
+        missing = chunk.isna().sum()
+        for col_name, null_val in self.missing_val.items():
+            if col_name in chunk.columns:
+                missing[col_name] += (chunk[col_name] == null_val).sum()
+        self._missing = self._missing.add(missing, fill_value=0).astype("int64")
+
+        for col_name in chunk.columns:
+            sketch = self._sketches.setdefault(col_name, KMVSketch(self.sketch_k))
+            sketch.update(chunk[col_name])
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        self.nrows += other.nrows
+        self._sum = self._sum.add(other._sum, fill_value=0)
+        self._count = self._count.add(other._count, fill_value=0).astype("int64")
+        self._missing = self._missing.add(other._missing, fill_value=0).astype("int64")
+        for col_name, sketch in other._sketches.items():
+            self._sketches.setdefault(col_name, KMVSketch(self.sketch_k)).merge(sketch)
+        return self
+
+    def sum(self) -> pd.Series:
+        return self._sum.copy()
+
+    def count(self) -> pd.Series:
+        return self._count.copy()
+
+    def mean(self) -> pd.Series:
+        return self._sum / self._count[self._sum.index]
+
+    def nunique(self) -> pd.Series:
+        """近似的不同值个数"""
+        return pd.Series({col_name: round(sketch.estimate()) for col_name, sketch in self._sketches.items()})
+
+    def missing_info(self) -> pd.DataFrame:
+        """与 PandasTable.missing_info 一致, 缺失值包括空值和 missing_val 中指定的值"""
+        return pd.DataFrame(
+            {
+                "missing_counts": self._missing,
+                "nrows": self.nrows,
+                "missing_percent": (self._missing / max(self.nrows, 1) * 100).round(1),
+            }
+        )
@@ -1,17 +1,13 @@
-from collections.abc import Hashable, Sequence
 from pprint import pprint
-from typing import Any, Callable, Dict, List, Sequence, Union  # noqa
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Union  # noqa
 
-import numpy as np
 import pandas as pd
-from pandas._libs import lib
-from pandas._typing import Axis, CorrelationMethod, IndexLabel, Level, TakeIndexer
-from pandas.core.groupby import DataFrameGroupBy
-from pandas.core.groupby.groupby import GroupByPlot
-from pandas.core.indexing import _LocIndexer
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
 
 from ..schema import TableSchema
-from ..utils.schema import init_schema
+from ..utils.schema import CastReport, SchemaCaster, init_schema
 from .table_base import TableBase
 from .table_utiles import (
     interaction_bar,
@@ -21,215 +17,59 @@ from .table_utiles import (
     reduce_memory,
 )
 
+# to_arrow 时 TableSchema 在 arrow schema metadata 中的 key
+_ARROW_SCHEMA_KEY = b"hammer.table_schema"
 
-def wrape_result(result: Any):
-    if isinstance(result, pd.DataFrame):
-        result = PandasTable(data=result)
-    elif isinstance(result, pd.Series):
-        result = PandasSeries(result)
-    return result
-
-
-class PandasTableGroupBy(object):
-    """
-    这是一个包装类，用于将 groupby 的结果转换为 PandasTableGroupBy。
-    它不是直接继承 DataFrameGroupBy, 而是将 groupby 的结果封装在内部。
-    """
 
-    def __init__(self, groupby_result: DataFrameGroupBy, by):
-        self.groupby_result: DataFrameGroupBy = groupby_result
-        self.by = by
+def _read_with_caster(caster: SchemaCaster, reader: Callable, file_path: str, **kwargs) -> pd.DataFrame:
+    """csv 在读取时按 schema 解析类型, 类型不匹配时放宽类型重新读取"""
+    if reader is not pd.read_csv:
+        return reader(file_path, **kwargs)
+    kwargs = caster.reader_kwargs(**kwargs)
+    try:
+        return reader(file_path, **kwargs)
+    except ValueError:
+        return reader(file_path, **caster.lenient_kwargs(**kwargs))
 
-    def __getitem__(self, key):
-        """
-        允许通过列名选择特定的列，例如 df.groupby("merchant_id")["label"]。
-        """
-        if isinstance(key, str):
-            # 通过列名选择对应的列
-            return PandasTableGroupBy(self.groupby_result[key], self.by)
-        else:
-            raise KeyError(f"Key '{key}' is not valid for PandasTableGroupBy.")
 
-    def mean(self, **kwargs) -> "PandasSeries":
-        """
-        计算每个组的均值，并返回 PandasTable 类型的结果。
-        """
-        result = self.groupby_result.mean(**kwargs)
-        return wrape_result(result)
+def _log_cast_report(file_path: str, report: CastReport) -> None:
+    if not report.ok:
+        logger.warning(f"{file_path} 与 schema 不一致: {report}")
 
-    def sum(self, **kwargs) -> "PandasSeries":
-        result = self.groupby_result.sum(**kwargs)
-        return wrape_result(result)
 
-    def count(self, **kwargs) -> "PandasSeries":
-        result = self.groupby_result.count(**kwargs)
-        return wrape_result(result)
+def wrape_result(result: Any):
+    """将 pandas 的结果转换为 PandasTable/PandasSeries, 只创建新的对象引用原来的数据, 不做拷贝.
 
-    def agg(self, func=None, *args, engine=None, engine_kwargs=None, **kwargs) -> "PandasTable":
-        return wrape_result(self.groupby_result.agg(func, *args, engine, engine_kwargs, **kwargs))
+    BlockManager 做浅拷贝, 数据块仍然共享, 但在结果上增删列不会影响原来的对象.
+    """
+    if type(result) is pd.DataFrame:
+        mgr = result._mgr.copy(deep=False)
+        result = PandasTable._from_mgr(mgr, axes=mgr.axes)
+    elif type(result) is pd.Series:
+        mgr = result._mgr.copy(deep=False)
+        result = PandasSeries._from_mgr(mgr, axes=mgr.axes)
+    return result
 
-    def apply(self, func, **kwargs) -> Union["PandasSeries", "PandasTable"]:
-        """
-        应用自定义函数并返回 PandasTable 类型的结果。
-        """
-        result = self.groupby_result.apply(func, **kwargs)
-        return wrape_result(result)
-
-    def transform(self, func, *args, engine=None, engine_kwargs=None, **kwargs) -> Union["PandasSeries", "PandasTable"]:
-        result = self.groupby_result.transform(func, *args, engine, engine_kwargs, **kwargs)
-        return wrape_result(result)
-
-    def filter(self, func, dropna: bool = True, *args, **kwargs) -> Union["PandasSeries", "PandasTable"]:
-        result = self.groupby_result.filter(func, dropna, *args, **kwargs)
-        return wrape_result(result)
-
-    def nunique(self, dropna: bool = True) -> Union["PandasSeries", "PandasTable"]:
-        result = self.groupby_result.nunique(dropna)
-        return wrape_result(result)
-
-    def value_counts(
-        self,
-        subset=None,
-        normalize: bool = False,
-        sort: bool = True,
-        ascending: bool = False,
-        dropna: bool = True,
-    ) -> Union["PandasSeries", "PandasTable"]:
-        result = self.groupby_result.value_counts(subset, normalize, sort, ascending, dropna)
-        return wrape_result(result)
-
-    def fillna(
-        self,
-        value: pd.Series | pd.DataFrame | None = None,
-        method: None = None,
-        axis: None | lib.NoDefault = lib.no_default,
-        inplace: bool = False,
-        limit: int | None = None,
-        downcast=lib.no_default,
-    ) -> Union["PandasTable", None]:
-        result = self.groupby_result.fillna(value, method, axis, inplace, limit, downcast)
-        return wrape_result(result)
-
-    def take(
-        self,
-        indices: TakeIndexer,
-        axis: Axis | None | lib.NoDefault = lib.no_default,
-        **kwargs,
-    ) -> "PandasTable":
-        result = self.groupby_result.take(indices, axis, **kwargs)
-        return wrape_result(result)
-
-    def skew(
-        self,
-        axis: Axis | None | lib.NoDefault = lib.no_default,
-        skipna: bool = True,
-        numeric_only: bool = False,
-        **kwargs,
-    ) -> "PandasTable":
-        result = self.groupby_result.skew(axis, skipna, numeric_only, **kwargs)
-        return wrape_result(result)
 
-    @property
-    def plot(self) -> "GroupByPlot":
-        result = self.groupby_result.plot
-        return result
-
-    def corr(
-        self,
-        method: str | Callable[[np.ndarray, np.ndarray], float] = "pearson",
-        min_periods: int = 1,
-        numeric_only: bool = False,
-    ) -> "PandasTable":
-        result = self.groupby_result.corr(method, min_periods, numeric_only)
-        return wrape_result(result)
-
-    def cov(
-        self,
-        min_periods: int | None = None,
-        ddof: int | None = 1,
-        numeric_only: bool = False,
-    ) -> "PandasTable":
-        result = self.groupby_result.cov(min_periods, ddof, numeric_only)
-        return wrape_result(result)
-
-    def hist(
-        self,
-        column: IndexLabel | None = None,
-        by=None,
-        grid: bool = True,
-        xlabelsize: int | None = None,
-        xrot: float | None = None,
-        ylabelsize: int | None = None,
-        yrot: float | None = None,
-        ax=None,
-        sharex: bool = False,
-        sharey: bool = False,
-        figsize: tuple[int, int] | None = None,
-        layout: tuple[int, int] | None = None,
-        bins: int | Sequence[int] = 10,
-        backend: str | None = None,
-        legend: bool = False,
-        **kwargs,
-    ):
-        self.groupby_result.hist(
-            column,
-            by,
-            grid,
-            xlabelsize,
-            xrot,
-            ylabelsize,
-            yrot,
-            ax,
-            sharex,
-            sharey,
-            figsize,
-            layout,
-            bins,
-            backend,
-            legend,
-            **kwargs,
-        )
+class PandasSeries(pd.Series):
+    """pd.Series 的子类, 运算结果通过 _constructor 直接创建为 PandasSeries, 取 DataFrame 时为 PandasTable"""
 
     @property
-    def dtypes(self) -> pd.Series:
-        return self.groupby_result.dtypes
-
-    def corrwith(
-        self,
-        other: pd.DataFrame | pd.Series | Union["PandasSeries", "PandasTable"],
-        axis: Axis | lib.NoDefault = lib.no_default,
-        drop: bool = False,
-        method: CorrelationMethod = "pearson",
-        numeric_only: bool = False,
-    ) -> "PandasTable":
-        result = self.groupby_result.corrwith(other, axis, drop, method, numeric_only)
-        return wrape_result(result)
-
-
-class PandasTableLocIndexer(_LocIndexer):
-    """
-    自定义 _LocIndexer, 确保 loc 操作返回 PandasTable 类型。
-    """
+    def _constructor(self):
+        return PandasSeries
 
-    def __init__(self, name: str, df):
-        self._df = df
-        super().__init__(name, df)
-
-    def __getitem__(self, key) -> Union["PandasSeries", "PandasTable"]:
-        """
-        重写索引操作，确保结果是 PandasTable 类型。
-        """
-        result = super(PandasTableLocIndexer, self).__getitem__(key)
-        return wrape_result(result)
+    def _constructor_from_mgr(self, mgr, axes) -> "PandasSeries":
+        # 直接在 manager 上创建子类对象, 不经过 __init__, 也不拷贝数据
+        ser = PandasSeries._from_mgr(mgr, axes=axes)
+        ser._name = None  # 与 pandas 相同, 由调用方设置 name
+        return ser
 
+    @property
+    def _constructor_expanddim(self):
+        return PandasTable
 
-class PandasSeries(pd.Series):
-    def __finalize__(self, other, method=None, **kwargs):
-        """
-        重写 __finalize__ 方法，以确保链式操作时能够保持自定义属性。
-        """
-        result = super(PandasSeries, self).__finalize__(other, method=method, **kwargs)
-        return result
+    def _constructor_expanddim_from_mgr(self, mgr, axes) -> "PandasTable":
+        return PandasTable._from_mgr(mgr, axes=axes)
 
     def custom_method(self):
         """
@@ -237,32 +77,6 @@ class PandasSeries(pd.Series):
         """
         return self.sum()  # 返回所有元素的和，您可以根据需要修改该方法
 
-    def reset_index(
-        self,
-        level: IndexLabel | None = None,
-        *,
-        drop: bool = False,
-        name: Level = None,
-        inplace: bool = False,
-        allow_duplicates: bool = False,
-    ) -> "PandasTable":
-        return wrape_result(
-            super().reset_index(level, drop=drop, inplace=inplace, allow_duplicates=allow_duplicates, name=self.name)
-        )
-
-    def __getitem__(self, key):
-        """
-        重写 __getitem__ 方法，确保自定义属性也能随之传递。
-        """
-        result = super(PandasSeries, self).__getitem__(key)
-        if isinstance(result, pd.Series):
-            result = PandasSeries(result)
-        return result
-
-    @property
-    def loc(self):
-        return PandasTableLocIndexer("loc", self)
-
     def missing_info(self, missing_val: Any = None) -> None:
         missing_len = self.isna().sum()
         if missing_val is not None:
@@ -284,47 +98,41 @@ class PandasSeries(pd.Series):
 
 
 class PandasTable(pd.DataFrame, TableBase):
+    """pd.DataFrame 的子类.
+
+    pandas 的运算通过 _constructor/_constructor_sliced 直接创建 PandasTable/PandasSeries (包括 loc, groupby 等的结果),
+    新对象只是引用运算结果的 manager, 不经过 __init__, 也不拷贝数据; _schema 通过 _metadata 在 __finalize__ 中传递,
+    不会重新解析.
+    """
+
     _metadata = ["_schema"]  # 保留自定义属性
+    _schema: TableSchema = None
 
     def __init__(self, *args, **kwargs):
         schema = kwargs.pop("schema", None)  # 从 kwargs 中取出 schema
         super(PandasTable, self).__init__(*args, **kwargs)
         if schema is not None:
             self._schema = init_schema(schema)
-        else:
-            self._schema = None
 
-    def __finalize__(self, other, method=None, **kwargs) -> Union["PandasTable", Any]:
-        """
-        覆盖 __finalize__ 以确保链式操作返回 PandasTable, 而不是 pd.DataFrame。
-        """
-        # 确保从 `other`（可能是一个 pd.DataFrame）中继承元数据
-        # 但返回的对象仍然是 PandasTable 类型
-        result = super(PandasTable, self).__finalize__(other, method=method, **kwargs)
+    @property
+    def _constructor(self):
+        return PandasTable
 
-        # 保留自定义的 schema 属性
-        if hasattr(other, "_schema"):
-            result._schema = other._schema
+    def _constructor_from_mgr(self, mgr, axes) -> "PandasTable":
+        return PandasTable._from_mgr(mgr, axes=axes)
 
-        return wrape_result(result)
+    @property
+    def _constructor_sliced(self):
+        return PandasSeries
+
+    def _constructor_sliced_from_mgr(self, mgr, axes) -> PandasSeries:
+        ser = PandasSeries._from_mgr(mgr, axes=axes)
+        ser._name = None  # 与 pandas 相同, 由调用方设置 name
+        return ser
 
     def __str__(self):
         return super().__str__() + f"\n{self.table_schema}"
 
-    def __getitem__(self, key):
-        """
-        重写 __getitem__ 以确保通过索引操作返回 PandasTable 类型。
-        """
-        result = super(PandasTable, self).__getitem__(key)
-        return wrape_result(result)
-
-    def __setitem__(self, key, value):
-        """
-        重写 __setitem__ 以确保在设置值时返回 PandasTable 类型。
-        """
-        super(PandasTable, self).__setitem__(key, value)
-        return self
-
     @property
     def table_schema(self) -> TableSchema:
         if self._schema is None:
@@ -341,48 +149,128 @@ class PandasTable(pd.DataFrame, TableBase):
             self._schema = TableSchema.from_list(table_schema)
         raise ValueError(f"Error value for table_schema: {table_schema}, only support str or list[dict]")
 
-    @property
-    def loc(self):
-        """
-        覆盖 loc 函数，确保 loc 操作返回 PandasTable 类型。
-        """
-        return PandasTableLocIndexer("loc", self)
-
-    def groupby(self, by, *args, **kwargs):
-        """
-        重写 groupby 方法，确保返回 PandasTable。
-        """
-        # 返回的是 PandasTable 而不是 GroupBy 对象
-        groupby_result = super(PandasTable, self).groupby(by, *args, **kwargs)
-
-        # 由于 groupby 返回的是 GroupBy 对象，我们通过 apply 强制转换回 PandasTable
-        return PandasTableGroupBy(groupby_result, by)
-
     @classmethod
     def _from_file(
-        cls, file_path: str, schema: Union[str, List[Dict], TableSchema], reader: callable, **kwargs
+        cls,
+        file_path: str,
+        schema: Union[str, List[Dict], TableSchema],
+        reader: callable,
+        cast: bool = True,
+        **kwargs,
     ) -> "TableBase":
         schema = init_schema(schema)
-        df = reader(file_path, **kwargs)
-        # df = apply_schema_to_pd(df, schema)
+        if not cast:
+            return cls(reader(file_path, **kwargs), schema=schema)
+        caster = SchemaCaster(schema, dtype_backend=kwargs.get("dtype_backend", "numpy"))
+        df = caster.cast(_read_with_caster(caster, reader, file_path, **kwargs))
+        _log_cast_report(file_path, caster.report)
         return cls(df, schema=schema)
 
     @classmethod
     def from_csv(
         cls, file_path: str, schema: Union[str, List[Dict], TableSchema], sep: str = ",", **kwargs
     ) -> "PandasTable":
+        """读取 csv 文件, cast=True (默认) 时按 schema 在读取时解析列类型"""
         return cls._from_file(file_path, schema, pd.read_csv, sep=sep, **kwargs)
 
     @classmethod
     def from_big_csv(
         cls, file_path: str, schema: Union[str, List[Dict], TableSchema], sep: str = ",", **kwargs
     ) -> "PandasTable":
-        return cls._from_file(file_path, schema, pd.read_csv, sep=sep, engine="pyarrow", dtype_backend="pyarrow")
+        kwargs = {"engine": "pyarrow", "dtype_backend": "pyarrow", **kwargs}
+        return cls._from_file(file_path, schema, pd.read_csv, sep=sep, **kwargs)
 
     @classmethod
     def from_parquet(cls, file_path: str, schema: Union[str, List[Dict], TableSchema], **kwargs) -> "PandasTable":
         return cls._from_file(file_path, schema, pd.read_parquet, **kwargs)
 
+    @classmethod
+    def iter_csv(
+        cls,
+        file_path: str,
+        schema: Union[str, List[Dict], TableSchema],
+        chunk_rows: int = 1_000_000,
+        sep: str = ",",
+        cast: bool = True,
+        **kwargs,
+    ) -> Iterator["PandasTable"]:
+        """分块读取 csv 文件, 每次返回 chunk_rows 行, 可以处理比内存更大的文件.
+
+        所有分块共用一个 SchemaCaster, 日期格式只在第一个分块中推断一次. 后面的分块中出现空值或者非法值时无法
+        放宽类型重新读取, 因此读取时只指定字符串类型, 其余列由 cast 转换.
+        """
+        schema = init_schema(schema)
+        caster = SchemaCaster(schema) if cast else None
+        if caster is not None:
+            kwargs = caster.lenient_kwargs(**caster.reader_kwargs(**kwargs))
+        with pd.read_csv(file_path, sep=sep, chunksize=chunk_rows, **kwargs) as reader:
+            for chunk in reader:
+                yield cls(caster.cast(chunk) if caster is not None else chunk, schema=schema)
+        if caster is not None:
+            _log_cast_report(file_path, caster.report)
+
+    @classmethod
+    def iter_parquet(
+        cls,
+        file_path: str,
+        schema: Union[str, List[Dict], TableSchema],
+        columns: List[str] = None,
+        cast: bool = True,
+        **kwargs,
+    ) -> Iterator["PandasTable"]:
+        """按 row group 分块读取 parquet 文件, 每次只有一个 row group 在内存中"""
+        schema = init_schema(schema)
+        caster = SchemaCaster(schema) if cast else None
+        parquet_file = pq.ParquetFile(file_path)
+        for i in range(parquet_file.num_row_groups):
+            chunk = parquet_file.read_row_group(i, columns=columns).to_pandas(**kwargs)
+            yield cls(caster.cast(chunk) if caster is not None else chunk, schema=schema)
+
+    @classmethod
+    def from_arrow(cls, table: pa.Table, schema: Union[str, List[Dict], TableSchema] = None) -> "PandasTable":
+        """将 pyarrow.Table 转换为 ArrowDtype 列, 列数据直接引用 arrow 的内存, 不做拷贝.
+
+        schema 为空时使用 to_arrow_ipc 写入 arrow schema metadata 中的 TableSchema.
+        """
+        metadata = table.schema.metadata or {}
+        if schema is None and _ARROW_SCHEMA_KEY in metadata:
+            schema = TableSchema.from_json(metadata[_ARROW_SCHEMA_KEY].decode("utf-8"))
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        return cls(df, schema=schema)
+
+    def to_arrow(self, preserve_index: bool = None) -> pa.Table:
+        """转换为 pyarrow.Table, TableSchema 保存在 arrow schema metadata 中"""
+        table = pa.Table.from_pandas(self, preserve_index=preserve_index)
+        metadata = {**(table.schema.metadata or {}), _ARROW_SCHEMA_KEY: self.table_schema.to_json().encode("utf-8")}
+        return table.replace_schema_metadata(metadata)
+
+    @classmethod
+    def from_arrow_ipc(
+        cls,
+        file_path: str,
+        schema: Union[str, List[Dict], TableSchema] = None,
+        mmap: bool = True,
+        columns: List[str] = None,
+    ) -> "PandasTable":
+        """读取 arrow ipc (feather v2) 文件.
+
+        mmap=True 时文件被映射到内存, 列数据是 OS page cache 的零拷贝视图, 同一台机器上的多个进程打开
+        同一个文件时共享物理内存, 只有被访问到的页才会被读入. 文件需要以无压缩的格式写入.
+        """
+        source = pa.memory_map(file_path, "r") if mmap else pa.OSFile(file_path, "r")
+        with source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        return cls.from_arrow(table, schema=schema)
+
+    def to_arrow_ipc(self, file_path: str, compression: str = None, preserve_index: bool = None) -> None:
+        """写入 arrow ipc (feather v2) 文件, 需要被 mmap 零拷贝读取时不要压缩"""
+        table = self.to_arrow(preserve_index=preserve_index)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(file_path, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+
     def missing_info(self, missing_val: Dict[str, Any] = None) -> None:
         missing_info(self, missing_val)
 
@@ -406,43 +294,3 @@ class PandasTable(pd.DataFrame, TableBase):
 
     def reduce_memory(self) -> "PandasTable":
         reduce_memory(self)
-
-    def copy(self, deep=...):
-        df = super().copy(deep)
-        return PandasTable(df, schema=self._schema)
-
-    def __getattr__(
-        self, name
-    ):  # 在 属性不存在 时才会被调用, __getattribute__ 拦截所有属性和函数, 可能会影响 Python 内置方法，比如 df.shape、df.columns.
-        """
-        允许通过 `table.列名` 访问列数据，同时保留 DataFrame 自身的属性访问。
-        """
-        try:
-            return wrape_result(super().__getattr__(name))  # 尝试访问 DataFrame 本身的属性
-        except AttributeError:
-            if name in self.columns:  # 如果是列名，则返回对应的 Series
-                return PandasSeries(self[name])
-            raise  # 继续抛出原始的 AttributeError，避免影响 DataFrame 其他属性
-
-    def reset_index(
-        self,
-        level: Level | Sequence[Level] = None,
-        *,
-        drop: bool = False,
-        col_level: int | str = None,
-        col_fill: Hashable = None,
-        inplace: bool = False,
-        allow_duplicates: bool = False,
-        names: Hashable | Sequence[Hashable] = None,
-    ) -> "PandasTable":
-        return wrape_result(
-            super().reset_index(
-                level,
-                drop=drop,
-                col_level=col_level,
-                col_fill=col_fill,
-                inplace=inplace,
-                allow_duplicates=allow_duplicates,
-                names=names,
-            )
-        )
@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import Iterator, Optional
 
 import clickhouse_connect
 import pandas as pd
+import pyarrow as pa
 from clickhouse_connect.driver.client import Client
 from urllib3 import PoolManager
 
@@ -44,6 +45,8 @@ class ClickHouseClient(ClientBase):
             password=self._password,
             database=self._database,
             pool_mgr=pool_mgr,
+            # 同一个 session 中不能并发执行查询, 不使用 session 以便多个线程共用同一个客户端
+            autogenerate_session_id=False,
         )
 
     def connect(self) -> Client:
@@ -52,4 +55,18 @@ class ClickHouseClient(ClientBase):
 
     def _read(self, connection: Client, query_or_file_path: str, *args, **kwargs) -> pd.DataFrame:
         """使用 ClickHouse 连接执行查询并返回 DataFrame"""
+        kwargs.pop("use_copy", None)
         return connection.query_df(query_or_file_path, *args, **kwargs)
+
+    def _read_arrow(self, connection: Client, query_or_file_path: str, *args, **kwargs) -> pa.Table:
+        """以 ArrowStream 格式查询, 结果直接解码为 pyarrow.Table, 不经过 pandas"""
+        kwargs.pop("use_copy", None)
+        kwargs.setdefault("use_strings", True)
+        return connection.query_arrow(query_or_file_path, *args, **kwargs)
+
+    def _iter_arrow(self, connection: Client, query_or_file_path: str, *args, **kwargs) -> Iterator[pa.RecordBatch]:
+        """按 ClickHouse 返回的 block 流式读取"""
+        kwargs.pop("use_copy", None)
+        kwargs.setdefault("use_strings", True)
+        with connection.query_arrow_stream(query_or_file_path, *args, **kwargs) as stream:
+            yield from stream
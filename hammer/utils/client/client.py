@@ -1,7 +1,8 @@
 from functools import cached_property
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_fixed
 
@@ -74,6 +75,16 @@ class ClientBase(object):
         """使用连接读取数据，必须由子类实现"""
         raise NotImplementedError
 
+    def _read_arrow(self, connection: Any, query_or_file_path: str, *args, **kwargs) -> pa.Table:
+        """以 arrow 格式读取数据, 子类没有原生 arrow 接口时由 _read 的结果转换"""
+        return pa.Table.from_pandas(self._read(connection, query_or_file_path, *args, **kwargs), preserve_index=False)
+
+    def _iter_arrow(
+        self, connection: Any, query_or_file_path: str, *args, **kwargs
+    ) -> Iterator[Union[pa.Table, pa.RecordBatch]]:
+        """分块读取 arrow 数据, 子类没有原生流式接口时一次读取后再切分"""
+        yield from self._read_arrow(connection, query_or_file_path, *args, **kwargs).to_batches()
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_fixed(2),
@@ -82,7 +93,33 @@ class ClientBase(object):
     def read(self, query_or_file_path: str, *args, **kwargs) -> PandasTable:
         logger.info(f"Read data by \n{query_or_file_path}")
         with self.connect() as connection:
-            return PandasTable(self._read(connection, query_or_file_path, *args, **kwargs))
+            return PandasTable(self._read(connection, query_or_file_path, *args, **kwargs), copy=False)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_fixed(2),
+        retry=lambda exception: isinstance(exception, ConnectionRefusedError),
+    )
+    def read_arrow(
+        self, query_or_file_path: str, *args, to_pandas: bool = False, **kwargs
+    ) -> Union[pa.Table, PandasTable]:
+        """读取为 pyarrow.Table, 避免 pandas 转换时的额外内存和时间开销.
+
+        to_pandas=True 时返回 ArrowDtype 列的 PandasTable, 列数据直接引用 arrow 的内存, 不做拷贝.
+        """
+        logger.info(f"Read arrow data by \n{query_or_file_path}")
+        with self.connect() as connection:
+            table = self._read_arrow(connection, query_or_file_path, *args, **kwargs)
+        return PandasTable.from_arrow(table) if to_pandas else table
+
+    def iter_arrow(
+        self, query_or_file_path: str, *args, to_pandas: bool = False, **kwargs
+    ) -> Iterator[Union[pa.Table, pa.RecordBatch, PandasTable]]:
+        """流式读取结果, 每次只有一个数据块在内存中, to_pandas=True 时逐块转换为 PandasTable"""
+        logger.info(f"Iterate arrow data by \n{query_or_file_path}")
+        with self.connect() as connection:
+            for batch in self._iter_arrow(connection, query_or_file_path, *args, **kwargs):
+                yield PandasTable.from_arrow(batch) if to_pandas else batch
 
     def __enter__(self) -> "ClientBase":
         """支持上下文管理器，返回自身"""
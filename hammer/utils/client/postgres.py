@@ -1,9 +1,16 @@
 import io
-from typing import Optional
+import os
+import threading
+import uuid
+from typing import Iterator, List, Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from psycopg2 import pool
 
+from hammer.table.table import PandasTable
+
 from .client import ClientBase  # 假设 ClientBase 在 base.py 中
 
 
@@ -29,8 +36,8 @@ class PostgresClient(ClientBase):
         self._pool = self._create_pool()
 
     def _create_pool(self):
-        """创建 PostgreSQL 连接池"""
-        return pool.SimpleConnectionPool(
+        """创建 PostgreSQL 连接池, 分区读取时多个线程同时获取连接, 需要线程安全的连接池"""
+        return pool.ThreadedConnectionPool(
             minconn=1,  # 最小连接数
             maxconn=self._pool_size,  # 最大连接数
             user=self._user,
@@ -63,3 +70,113 @@ class PostgresClient(ClientBase):
                 df = pd.DataFrame(data, columns=columns)
         self.release(connection)
         return df
+
+    def read_batches(
+        self, query_or_file_path: str, *args, batch_rows: int = 100_000, use_copy: bool = False
+    ) -> Iterator[PandasTable]:
+        """流式读取查询结果, 每次返回 batch_rows 行, 内存占用与结果的总行数无关.
+
+        use_copy=False 时使用服务端游标 (named cursor), 每次从服务端拉取 batch_rows 行;
+        use_copy=True 时 COPY 的输出写入管道, 由 pyarrow 的 csv 流式读取器边读边解析, 管道的缓冲区大小固定,
+        读取端处理不过来时 COPY 会被阻塞. 此时返回的是 ArrowDtype 列.
+        """
+        connection = self.connect()
+        try:
+            if use_copy:
+                yield from self._copy_batches(connection, query_or_file_path, batch_rows)
+            else:
+                yield from self._cursor_batches(connection, query_or_file_path, *args, batch_rows=batch_rows)
+        finally:
+            # 中途退出时服务端游标或者 COPY 还未结束, 回滚后再放回连接池
+            connection.rollback()
+            self.release(connection)
+
+    def _cursor_batches(self, connection, query: str, *args, batch_rows: int) -> Iterator[PandasTable]:
+        with connection.cursor(name=f"hammer_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = batch_rows
+            cursor.execute(query, *args)
+            while True:
+                rows = cursor.fetchmany(batch_rows)
+                if not rows:
+                    break
+                columns = [desc[0] for desc in cursor.description]
+                yield PandasTable(pd.DataFrame(rows, columns=columns), copy=False)
+
+    def _copy_batches(self, connection, query: str, batch_rows: int) -> Iterator[PandasTable]:
+        convert_options = _copy_convert_options(connection, query)
+        read_fd, write_fd = os.pipe()
+        errors: List[BaseException] = []
+
+        def copy_to_pipe():
+            try:
+                with os.fdopen(write_fd, "wb") as writer, connection.cursor() as cursor:
+                    cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV HEADER", writer)
+            except BrokenPipeError:
+                # 读取端提前关闭
+                pass
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=copy_to_pipe, daemon=True)
+        thread.start()
+        try:
+            with os.fdopen(read_fd, "rb") as reader:
+                yield from _rebatch(pa_csv.open_csv(reader, convert_options=convert_options), batch_rows)
+        except pa.ArrowInvalid as e:
+            # COPY 失败时管道中没有数据, 抛出 COPY 本身的错误
+            thread.join()
+            raise errors[0] if errors else e
+        finally:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+
+# postgres 类型的 oid 对应的 arrow 类型, 其余类型按字符串读取
+_PG_ARROW_TYPES = {
+    16: pa.bool_(),
+    20: pa.int64(),
+    21: pa.int64(),
+    23: pa.int64(),
+    700: pa.float64(),
+    701: pa.float64(),
+    1700: pa.float64(),
+    1082: pa.date32(),
+    1114: pa.timestamp("us"),
+    1184: pa.timestamp("us", tz="UTC"),
+}
+
+
+def _copy_convert_options(connection, query: str) -> pa_csv.ConvertOptions:
+    """按查询结果的列类型解析 COPY 的输出.
+
+    pyarrow 只根据第一个数据块推断列类型, 前面全是 NULL 的列会被推断为 null 类型, 后面出现非空值时报错;
+    因此先执行不返回数据的查询, 从 cursor.description 中获取每一列的类型. COPY 的 csv 中 NULL 是不带引号的空值,
+    空字符串是带引号的 "", 布尔值是 t/f.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT * FROM ({query}) AS hammer_copy LIMIT 0")
+        description = cursor.description
+    column_types = {desc[0]: _PG_ARROW_TYPES.get(desc[1], pa.string()) for desc in description}
+    return pa_csv.ConvertOptions(
+        column_types=column_types,
+        true_values=["t"],
+        false_values=["f"],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False,
+    )
+
+
+def _rebatch(batches: Iterator[pa.RecordBatch], batch_rows: int) -> Iterator[PandasTable]:
+    """pyarrow 按字节数分块, 重新组合为每块 batch_rows 行"""
+    buffer, buffered_rows = [], 0
+    for batch in batches:
+        buffer.append(batch)
+        buffered_rows += batch.num_rows
+        while buffered_rows >= batch_rows:
+            table = pa.Table.from_batches(buffer)
+            yield PandasTable.from_arrow(table.slice(0, batch_rows))
+            rest = table.slice(batch_rows)
+            buffer, buffered_rows = rest.to_batches(), rest.num_rows
+    if buffered_rows:
+        yield PandasTable.from_arrow(pa.Table.from_batches(buffer))
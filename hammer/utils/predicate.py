@@ -0,0 +1,151 @@
+import ast
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_SQL_COMPARE_OPS = {
+    ast.Eq: "=",
+    ast.NotEq: "<>",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.In: "IN",
+    ast.NotIn: "NOT IN",
+}
+
+_FILTER_COMPARE_OPS = {
+    ast.Eq: "==",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.In: "in",
+}
+
+
+def _parse(expr: str) -> Optional[ast.expr]:
+    try:
+        return ast.parse(expr.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+
+
+def _literal(node: ast.expr) -> Tuple[bool, Any]:
+    """获取常量或者常量列表的值"""
+    if isinstance(node, ast.Constant):
+        return True, node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        values = [_literal(elt) for elt in node.elts]
+        if all(ok for ok, _ in values):
+            return True, [value for _, value in values]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        return True, -node.operand.value
+    return False, None
+
+
+def _sql_literal(value: Any) -> str:
+    if isinstance(value, list):
+        return f"({', '.join(_sql_literal(v) for v in value)})"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if value is None:
+        return "NULL"
+    return str(value)
+
+
+def query_columns(expr: str) -> Optional[Set[str]]:
+    """获取 df.query(expr) 中引用的列名, 无法解析时返回 None"""
+    tree = _parse(expr)
+    if tree is None:
+        return None
+    if any(isinstance(node, ast.Call) for node in ast.walk(tree)) or "@" in expr or "`" in expr:
+        # 函数调用, 外部变量和反引号列名都无法可靠地分析
+        return None
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+def query_to_sql(expr: str, column_mapping: Dict[str, str] = None) -> Optional[str]:
+    """将 df.query 的表达式转换为 sql 的 where 条件, 不支持的表达式返回 None.
+
+    pandas 中与空值的比较都为 False, 因此 !=, not in 和 not 会保留空值所在的行; sql 中与 NULL 的比较结果为 NULL,
+    这些行会被过滤掉, 转换时需要显式地保留空值.
+
+    Args:
+        expr (str): pandas query 表达式, 例如 "value > 10 and category in ['A', 'B']".
+        column_mapping (Dict[str, str], optional): 列名到数据库字段名的映射.
+
+    Returns:
+        Optional[str]: sql 条件, 例如 "(value > 10 AND category IN ('A', 'B'))".
+    """
+    column_mapping = column_mapping or {}
+
+    def convert(node: ast.expr) -> Optional[Tuple[str, bool]]:
+        """返回 sql 条件以及它的结果是否可能为 NULL"""
+        if isinstance(node, ast.BoolOp):
+            parts = [convert(value) for value in node.values]
+            if None in parts:
+                return None
+            joiner = " AND " if isinstance(node.op, ast.And) else " OR "
+            return f"({joiner.join(sql for sql, _ in parts)})", any(nullable for _, nullable in parts)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = convert(node.operand)
+            if operand is None:
+                return None
+            sql, nullable = operand
+            # NOT NULL 仍然是 NULL, 先将 NULL 视为 False, 与 pandas 的结果一致
+            return (f"(NOT COALESCE({sql}, FALSE))" if nullable else f"(NOT {sql})"), False
+        if isinstance(node, ast.Compare):
+            parts, nullable, left = [], False, node.left
+            for op, right in zip(node.ops, node.comparators):
+                sql_op = _SQL_COMPARE_OPS.get(type(op))
+                if sql_op is None:
+                    return None
+                if isinstance(left, ast.Name):
+                    is_literal, value = _literal(right)
+                    column = left.id
+                elif isinstance(right, ast.Name) and sql_op not in ("IN", "NOT IN"):
+                    # 10 < value 形式
+                    is_literal, value = _literal(left)
+                    column = right.id
+                    sql_op = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}.get(sql_op, sql_op)
+                else:
+                    return None
+                if not is_literal or (isinstance(value, list) != (sql_op in ("IN", "NOT IN"))):
+                    return None
+                column = column_mapping.get(column, column)
+                if value is None and sql_op in ("=", "<>"):
+                    parts.append(f"{column} IS {'NOT ' if sql_op == '<>' else ''}NULL")
+                elif sql_op in ("<>", "NOT IN"):
+                    parts.append(f"({column} {sql_op} {_sql_literal(value)} OR {column} IS NULL)")
+                else:
+                    parts.append(f"{column} {sql_op} {_sql_literal(value)}")
+                    nullable = True
+                left = right
+            return (parts[0] if len(parts) == 1 else f"({' AND '.join(parts)})"), nullable
+        return None
+
+    tree = _parse(expr)
+    converted = None if tree is None else convert(tree)
+    return None if converted is None else converted[0]
+
+
+def query_to_filters(expr: str) -> Optional[List[Tuple[str, str, Any]]]:
+    """将只包含 and 连接的简单比较转换为 pyarrow/pd.read_parquet 的 filters 参数, 不支持时返回 None.
+
+    pyarrow 的 != 和 not in 会过滤掉空值, 而 pandas 会保留, filters 中又无法表示 is null, 因此这两种比较不转换.
+    """
+    tree = _parse(expr)
+    if tree is None:
+        return None
+    conditions = tree.values if isinstance(tree, ast.BoolOp) and isinstance(tree.op, ast.And) else [tree]
+    filters = []
+    for condition in conditions:
+        if not (isinstance(condition, ast.Compare) and len(condition.ops) == 1):
+            return None
+        op = _FILTER_COMPARE_OPS.get(type(condition.ops[0]))
+        is_literal, value = _literal(condition.comparators[0])
+        if op is None or not isinstance(condition.left, ast.Name) or not is_literal:
+            return None
+        filters.append((condition.left.id, op, value))
+    return filters
@@ -1,8 +1,38 @@
-from typing import Dict, List, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
+from pandas.tseries.api import guess_datetime_format
 
-from ..schema import Field, TableSchema
+from ..schema import Datatype, Field, TableSchema
+
+# schema 中的类型对应的读取器 dtype, 读取时直接解析为目标类型, 不需要读取后再转换
+READER_DTYPES = {
+    "int": "int64",
+    "int8": "int8",
+    "int16": "int16",
+    "int32": "int32",
+    "float": "float64",
+    "float32": "float32",
+    "bool": "bool",
+    "str": "object",
+    "category": "category",
+}
+
+# dtype_backend="pyarrow" 时对应的 arrow 类型, 由 pyarrow 的 csv 读取器在 convert_options 中直接解析
+ARROW_READER_DTYPES = {
+    "int": pd.ArrowDtype(pa.int64()),
+    "int8": pd.ArrowDtype(pa.int8()),
+    "int16": pd.ArrowDtype(pa.int16()),
+    "int32": pd.ArrowDtype(pa.int32()),
+    "float": pd.ArrowDtype(pa.float64()),
+    "float32": pd.ArrowDtype(pa.float32()),
+    "bool": pd.ArrowDtype(pa.bool_()),
+    "str": pd.ArrowDtype(pa.string()),
+    "category": "category",
+    "datetime": pd.ArrowDtype(pa.timestamp("ns")),
+}
 
 
 def init_schema(schema: Union[str, List[Dict], TableSchema]) -> TableSchema:
@@ -19,9 +49,141 @@ def init_schema(schema: Union[str, List[Dict], TableSchema]) -> TableSchema:
 
 
 def apply_schema_to_pd(df: pd.DataFrame, schema: TableSchema):
-    for f in schema.fields:
-        if f.dtype == "datetime":
-            df[f.name] = pd.to_datetime(df[f.name])
-        else:
-            df[f.name] = df[f.name].astype(f.dtype)
-    return df
+    return SchemaCaster(schema).cast(df)
+
+
+@dataclass
+class CastReport:
+    """SchemaCaster.cast 的校验结果"""
+
+    # schema 中有但是数据中没有的列
+    missing_columns: List[str] = field(default_factory=list)
+    # 数据中有但是 schema 中没有的列
+    extra_columns: List[str] = field(default_factory=list)
+    # 每列无法转换而被置为空值的个数
+    invalid_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing_columns and not self.invalid_counts
+
+    def merge(self, other: "CastReport") -> "CastReport":
+        """合并分块读取时每个分块的结果"""
+        for col_name in other.missing_columns:
+            if col_name not in self.missing_columns:
+                self.missing_columns.append(col_name)
+        for col_name in other.extra_columns:
+            if col_name not in self.extra_columns:
+                self.extra_columns.append(col_name)
+        for col_name, count in other.invalid_counts.items():
+            self.invalid_counts[col_name] = self.invalid_counts.get(col_name, 0) + count
+        return self
+
+
+class SchemaCaster(object):
+    """由 TableSchema 编译得到的类型转换计划, 编译一次后可以用于多个文件或者同一个文件的多个分块.
+
+    读取器能解析的类型通过 reader_kwargs 在读取时完成转换, cast 只处理类型仍然不一致的列. 日期列的格式
+    从第一个非空值推断后缓存, 之后的分块直接按该格式解析, 不再逐行推断.
+
+    Examples:
+        >>> caster = SchemaCaster("id: int;dt: datetime")
+        >>> df = caster.cast(pd.read_csv(path, **caster.reader_kwargs()))
+        >>> caster.report.ok
+    """
+
+    def __init__(self, schema: Union[str, List[Dict], TableSchema], dtype_backend: str = "numpy"):
+        self.schema = init_schema(schema)
+        self.dtype_backend = dtype_backend
+        reader_dtypes = ARROW_READER_DTYPES if dtype_backend == "pyarrow" else READER_DTYPES
+        # 列名 -> 目标 dtype, 不认识的类型保持读取器的结果
+        self.dtypes: Dict[str, Any] = {}
+        self.datetime_columns: List[str] = []
+        for f in self.schema.fields:
+            dtype = f.dtype.name if isinstance(f.dtype, Datatype) else f.dtype
+            if dtype in reader_dtypes:
+                self.dtypes[f.name] = reader_dtypes[dtype]
+            elif dtype == "datetime":
+                self.datetime_columns.append(f.name)
+        self.datetime_formats: Dict[str, Optional[str]] = {}
+        self.report = CastReport()
+
+    def reader_kwargs(self, **kwargs) -> Dict[str, Any]:
+        """读取 csv 时的参数, 用户传入的 dtype 优先"""
+        dtype = kwargs.get("dtype")
+        if dtype is None or isinstance(dtype, dict):
+            kwargs["dtype"] = {**self.dtypes, **(dtype or {})}
+        return kwargs
+
+    def lenient_kwargs(self, **kwargs) -> Dict[str, Any]:
+        """整数列中有空值或者数值列中有非法值时读取器会报错, 只保留字符串类型重新读取, 其余列由 cast 转换"""
+        dtype = {k: v for k, v in kwargs.get("dtype", {}).items() if v in ("object", "category")}
+        return {**kwargs, "dtype": dtype}
+
+    def _datetime_format(self, col_name: str, series: pd.Series) -> Optional[str]:
+        if col_name not in self.datetime_formats:
+            first = series.first_valid_index()
+            value = series[first] if first is not None else None
+            self.datetime_formats[col_name] = guess_datetime_format(value) if isinstance(value, str) else None
+        return self.datetime_formats[col_name]
+
+    def _cast_datetime(self, col_name: str, series: pd.Series) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            return series
+        fmt = self._datetime_format(col_name, series)
+        result = pd.to_datetime(series, format=fmt, errors="coerce")
+        if fmt is not None and result.isna().sum() > series.isna().sum():
+            # 数据中混有其他格式, 回退到逐个推断
+            result = pd.to_datetime(series, format="mixed", errors="coerce")
+        return result
+
+    def _cast_column(self, series: pd.Series, dtype: Any) -> pd.Series:
+        if dtype == "object":
+            if pd.api.types.is_object_dtype(series.dtype):
+                return series
+            return series.astype(str).where(series.notna())
+        if dtype == "category" or self.dtype_backend == "pyarrow":
+            return series.astype(dtype)
+        result = pd.to_numeric(series, errors="coerce") if series.dtype == object else series
+        if result.hasnans and _nullable_dtype(dtype) is not None:
+            # numpy 的整数和布尔类型不能保存空值, 转换为 pandas 的可空类型, 否则空值会报错或者变成 True
+            return result.astype(_nullable_dtype(dtype))
+        return result.astype(dtype)
+
+    def cast(self, df: pd.DataFrame) -> pd.DataFrame:
+        """按 schema 转换 df 的列类型, 无法转换的值置为空值并记录在 report 中"""
+        names = self.schema.names
+        report = CastReport(
+            missing_columns=[name for name in names if name not in df.columns],
+            extra_columns=[name for name in df.columns if name not in names],
+        )
+        for col_name in self.datetime_columns:
+            if col_name in df.columns:
+                series = df[col_name]
+                df[col_name] = self._cast_datetime(col_name, series)
+                invalid = int(df[col_name].isna().sum() - series.isna().sum())
+                if invalid:
+                    report.invalid_counts[col_name] = invalid
+        for col_name, dtype in self.dtypes.items():
+            if col_name not in df.columns or df[col_name].dtype == dtype:
+                continue
+            series = df[col_name]
+            try:
+                df[col_name] = self._cast_column(series, dtype)
+            except (TypeError, ValueError):
+                report.invalid_counts[col_name] = len(series)
+                continue
+            invalid = int(df[col_name].isna().sum() - series.isna().sum())
+            if invalid:
+                report.invalid_counts[col_name] = invalid
+        self.report.merge(report)
+        return df
+
+
+def _nullable_dtype(dtype: Any) -> Optional[str]:
+    """numpy 整数和布尔类型对应的 pandas 可空类型, 其他类型返回 None"""
+    if not isinstance(dtype, str):
+        return None
+    if dtype.startswith("int"):
+        return dtype.capitalize()
+    return "boolean" if dtype == "bool" else None
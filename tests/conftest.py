@@ -14,3 +14,20 @@ def parquet_path():
 @pytest.fixture
 def schema():
     return "id: int, entity_1;category: str, entity_1*1;value: float, target;timestamp: datetime, main_time"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmark", action="store_true", default=False, help="运行标记为 benchmark 的性能测试")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: 依赖机器性能的耗时测试, 只在传入 --run-benchmark 时运行")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmark"):
+        return
+    skip = pytest.mark.skip(reason="性能测试需要传入 --run-benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
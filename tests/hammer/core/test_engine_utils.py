@@ -0,0 +1,47 @@
+import asyncio
+
+from hammer.core import engine_utils
+from hammer.core.engine_utils import Postgres
+
+
+def test_shared_engine():
+    config = {"host": "localhost", "port": 5432, "user": "u", "password": "p"}
+    db = Postgres(**config, database="hammer", pool_size=3, max_overflow=2)
+    other = Postgres(**config, database="hammer", pool_size=3, max_overflow=2)
+    assert db.async_engine is other.async_engine
+    assert db.async_engine.pool.size() == 3
+    assert db.async_engine.pool._max_overflow == 2
+    assert db.async_engine.pool._pre_ping
+    assert not db.async_engine.echo
+    assert db.async_engine.url.query["prepared_statement_cache_size"] == "500"
+    # 参数不同时使用不同的 engine
+    assert Postgres(**config, database="hammer", echo=True).async_engine is not db.async_engine
+
+    engine = db.async_engine
+    asyncio.run(db.dispose())
+    assert db._async_engine is None
+    assert db.async_engine is not engine
+    asyncio.run(engine_utils.dispose_engines())
+    assert not engine_utils._ENGINES
+
+
+def test_engine_per_event_loop():
+    db = Postgres(host="localhost", port=5432, user="u", password="p", database="hammer")
+
+    async def get_engine():
+        return db.async_engine, db.session_factory, asyncio.get_running_loop()
+
+    first, first_factory, first_loop = asyncio.run(get_engine())
+    second, second_factory, second_loop = asyncio.run(get_engine())
+    # 不同的事件循环使用不同的 engine, 已关闭的事件循环的 engine 被丢弃
+    assert first is not second
+    assert first_factory is not second_factory
+    assert first_loop not in engine_utils._ENGINES
+    assert list(engine_utils._ENGINES[second_loop].values()) == [second]
+
+    async def get_twice():
+        return db.async_engine is db.async_engine
+
+    assert asyncio.run(get_twice())
+    asyncio.run(engine_utils.dispose_engines())
+    assert not engine_utils._ENGINES
@@ -0,0 +1,151 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import TextClause
+
+from hammer.config import CONF
+from hammer.core.protos import entity_pb2
+from hammer.core.server.cache import TTLCache
+
+
+class FakeResult(object):
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeDB(object):
+    """用内存中的 dict 代替 entity 表, 根据语句的参数执行 IN 查询或者键集分页查询"""
+
+    def __init__(self):
+        self.rows = {}
+        self.writes = []
+        self.queries = 0
+        self.notifies = []
+        # 写入, 通知和提交的顺序
+        self.events = []
+
+    async def write(self, table_name, data, upsert=False, session=None):
+        self.writes.append((table_name, data, upsert))
+        self.events.append("write")
+        for item in data:
+            self.rows[item["name"]] = SimpleNamespace(**item)
+        return len(data)
+
+    def add(self, entity):
+        self.rows[entity.name] = entity
+
+    async def commit(self):
+        self.events.append("commit")
+
+    async def refresh(self, entity):
+        pass
+
+    async def execute(self, stmt, params=None):
+        if isinstance(stmt, TextClause):
+            self.notifies.append(params)
+            self.events.append("notify")
+            return
+        self.queries += 1
+        params = stmt.compile().params
+        if "param_1" not in params and not isinstance(params["name_1"], list):
+            return FakeResult([self.rows[params["name_1"]]] if params["name_1"] in self.rows else [])
+        if isinstance(params["name_1"], list):
+            return FakeResult([self.rows[n] for n in params["name_1"] if n in self.rows])
+        names = sorted(n for n in self.rows if n > params["name_1"])[: params["param_1"]]
+        return FakeResult([self.rows[n] for n in names])
+
+    @asynccontextmanager
+    async def get_db_session(self):
+        yield self
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(
+        CONF, "_infra", {"postgresql": {"hammer_meta": {"host": "h", "port": 5432, "user": "u", "password": "p"}}}
+    )
+    from hammer.core.server import entity
+
+    monkeypatch.setattr(entity, "db", FakeDB())
+    return entity.EntityService()
+
+
+def test_batch_entities(service):
+    from hammer.core.server import entity
+
+    entities = [entity_pb2.Entity(name=f"e{i}", join_keys=[f"k{i}"]) for i in range(5)]
+    entities.append(entity_pb2.Entity(name="e0", join_keys=["new"]))
+    request = entity_pb2.BatchCreateEntitiesRequest(entities=entities)
+    response = asyncio.run(service.BatchCreateEntities(request, None))
+    assert response.success and response.count == 5
+    assert len(entity.db.writes) == 1
+    assert entity.db.writes[0][2]
+
+    request = entity_pb2.BatchGetEntitiesRequest(names=["e0", "e3", "missing"])
+    response = asyncio.run(service.BatchGetEntities(request, None))
+    assert [e.name for e in response.entities] == ["e0", "e3"]
+    assert list(response.entities[0].join_keys) == ["new"]
+    assert list(response.missing) == ["missing"]
+
+    async def list_entities(request):
+        return [e async for e in service.ListEntities(request, None)]
+
+    queries = entity.db.queries
+    result = asyncio.run(list_entities(entity_pb2.ListEntitiesRequest(page_size=2, start_after="e0")))
+    assert [e.name for e in result] == ["e1", "e2", "e3", "e4"]
+    assert entity.db.queries - queries == 3
+
+
+def test_entity_cache(service):
+    from hammer.core.server import entity
+
+    service.notify_channel = "hammer_entity"
+    request = entity_pb2.CreateEntityRequest(entity=entity_pb2.Entity(name="user", join_keys=["user_id"]))
+    asyncio.run(service.CreateEntity(request, None))
+    for _ in range(3):
+        response = asyncio.run(service.GetEntity(entity_pb2.GetEntityRequest(name="user"), None))
+        assert list(response.entity.join_keys) == ["user_id"]
+    assert entity.db.queries == 1
+    assert service.cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1}
+
+    # 写操作使缓存失效, 并通知其他副本
+    request = entity_pb2.BatchCreateEntitiesRequest(entities=[entity_pb2.Entity(name="user", join_keys=["uid"])])
+    asyncio.run(service.BatchCreateEntities(request, None))
+    assert entity.db.notifies[-1] == {"channel": "hammer_entity", "key": "user"}
+    # 通知和写入在同一个事务中, 提交前发送
+    assert entity.db.events == ["notify", "commit", "write", "notify", "commit"]
+    response = asyncio.run(service.BatchGetEntities(entity_pb2.BatchGetEntitiesRequest(names=["user"]), None))
+    assert list(response.entities[0].join_keys) == ["uid"]
+    assert entity.db.queries == 2
+
+
+def test_ttl_cache():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # b 最久没有被访问, 被淘汰
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    now[0] = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 0}
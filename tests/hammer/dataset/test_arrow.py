@@ -0,0 +1,39 @@
+import pandas as pd
+import pyarrow as pa
+
+from hammer.table import PandasTable
+from hammer.utils.schema import init_schema
+
+
+def test_arrow_ipc_roundtrip(tmp_path, csv_path, schema):
+    pt = PandasTable.from_csv(csv_path, schema=schema)
+    path = str(tmp_path / "sample.arrow")
+    pt.to_arrow_ipc(path)
+
+    for mmap in (True, False):
+        result = PandasTable.from_arrow_ipc(path, mmap=mmap)
+        assert isinstance(result, PandasTable)
+        assert result._schema == init_schema(schema)
+        assert all(isinstance(dtype, pd.ArrowDtype) for dtype in result.dtypes)
+        pd.testing.assert_frame_equal(
+            result.astype(object), pt.astype(object), check_frame_type=False, check_dtype=False
+        )
+
+    result = PandasTable.from_arrow_ipc(path, columns=["id", "value"], schema="id: int;value: float")
+    assert list(result.columns) == ["id", "value"]
+    assert result._schema.names == ["id", "value"]
+
+
+def test_arrow_ipc_mmap_zero_copy(tmp_path):
+    pt = PandasTable(
+        pd.DataFrame({"a": range(1_000_000), "b": [0.5] * 1_000_000}),
+        schema="a: int;b: float",
+    )
+    path = str(tmp_path / "big.arrow")
+    pt.to_arrow_ipc(path)
+
+    before = pa.total_allocated_bytes()
+    result = PandasTable.from_arrow_ipc(path, mmap=True)
+    # 列数据直接引用映射的文件, 不在 arrow 的内存池中分配
+    assert pa.total_allocated_bytes() - before < 1_000_000
+    assert result["a"].sum() == sum(range(1_000_000))
@@ -0,0 +1,51 @@
+import pandas as pd
+import pyarrow as pa
+
+from hammer.table import PandasTable
+from hammer.utils.schema import SchemaCaster
+
+
+def test_reader_dtypes(schema):
+    caster = SchemaCaster(schema + ";label: category")
+    assert caster.reader_kwargs() == {
+        "dtype": {"id": "int64", "category": "object", "value": "float64", "label": "category"}
+    }
+    assert caster.reader_kwargs(dtype={"id": "int32"})["dtype"]["id"] == "int32"
+    assert caster.datetime_columns == ["timestamp"]
+
+
+def test_from_csv_cast(csv_path, schema):
+    pt = PandasTable.from_csv(csv_path, schema=schema.replace("category: str", "category: category"))
+    assert pt["id"].dtype == "int64"
+    assert pt["category"].dtype == "category"
+    assert pt["timestamp"].dtype == "datetime64[ns]"
+
+    pt = PandasTable.from_big_csv(csv_path, schema=schema)
+    assert pt["id"].dtype == pd.ArrowDtype(pa.int64())
+    assert pt["timestamp"].dtype == pd.ArrowDtype(pa.timestamp("ns"))
+
+    assert PandasTable.from_csv(csv_path, schema=schema, cast=False)["timestamp"].dtype == object
+
+
+def test_cast_report(tmp_path):
+    path = tmp_path / "dirty.csv"
+    path.write_text("id,dt,value,extra\n1,2024/01/02,1.5,x\n,2024/01/03,bad,y\n3,oops,2.5,z\n")
+    caster = SchemaCaster("id: int;dt: datetime;value: float;missing: str")
+    df = caster.cast(pd.read_csv(path, **caster.lenient_kwargs(**caster.reader_kwargs())))
+    assert df["id"].dtype == "Int64"
+    assert df["dt"].tolist()[:2] == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+    assert caster.datetime_formats == {"dt": "%Y/%m/%d"}
+    assert not caster.report.ok
+    assert caster.report.missing_columns == ["missing"]
+    assert caster.report.extra_columns == ["extra"]
+    assert caster.report.invalid_counts == {"dt": 1, "value": 1}
+
+
+def test_cast_nullable_bool(tmp_path):
+    path = tmp_path / "flags.csv"
+    path.write_text("id,flag\n1,true\n2,false\n3,false\n4,\n")
+    caster = SchemaCaster("id: int;flag: bool")
+    df = caster.cast(pd.read_csv(path, **caster.lenient_kwargs(**caster.reader_kwargs())))
+    assert df["flag"].dtype == "boolean"
+    assert df["flag"].tolist() == [True, False, False, pd.NA]
+    assert caster.report.ok
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hammer.table import KMVSketch, PandasTable, StreamingStats
+
+
+def test_iter_csv(csv_path, schema):
+    expected = pd.read_csv(csv_path, parse_dates=["timestamp"])
+    chunks = list(PandasTable.iter_csv(csv_path, schema, chunk_rows=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    assert all(isinstance(chunk, PandasTable) for chunk in chunks)
+    assert chunks[0]._schema.names == ["id", "category", "value", "timestamp"]
+    pd.testing.assert_frame_equal(pd.concat(chunks), PandasTable(expected))
+
+
+def test_iter_parquet(tmp_path, parquet_path, schema):
+    expected = pd.read_parquet(parquet_path)
+    path = tmp_path / "row_groups.parquet"
+    expected.to_parquet(path, row_group_size=3)
+    chunks = list(PandasTable.iter_parquet(str(path), schema, columns=["id", "value"]))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 2]
+    result = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(result, PandasTable(expected[["id", "value"]]))
+
+
+def test_streaming_stats(csv_path, schema):
+    expected = pd.read_csv(csv_path)
+    stats = StreamingStats.from_chunks(
+        PandasTable.iter_csv(csv_path, schema, chunk_rows=3), missing_val={"category": "D"}
+    )
+    assert stats.nrows == len(expected)
+    assert stats.sum()["value"] == pytest.approx(expected["value"].sum())
+    assert stats.mean()["id"] == pytest.approx(expected["id"].mean())
+    assert stats.count()["category"] == expected["category"].count()
+    assert stats.nunique().to_dict() == expected.nunique().to_dict()
+    assert stats.missing_info().loc["category", "missing_counts"] == (expected["category"] == "D").sum()
+
+
+def test_streaming_stats_merge(csv_path, schema):
+    expected = pd.read_csv(csv_path)
+    chunks = list(PandasTable.iter_csv(csv_path, schema, chunk_rows=4))
+    merged = StreamingStats().update(chunks[0]).merge(StreamingStats().update(chunks[1]))
+    assert merged.nrows == len(expected)
+    assert merged.sum()["value"] == pytest.approx(expected["value"].sum())
+    assert merged.nunique()["category"] == expected["category"].nunique()
+
+
+def test_kmv_sketch_estimate():
+    values = pd.Series(np.arange(200_000) % 50_000)
+    sketch = KMVSketch(k=1024)
+    for chunk in np.array_split(values, 10):
+        sketch.update(chunk)
+    assert sketch.estimate() == pytest.approx(50_000, rel=0.1)
+    assert KMVSketch(k=1024).update(values.iloc[:500]).estimate() == 500
+
+
+def test_iter_csv_nulls_in_later_chunk(tmp_path):
+    path = tmp_path / "nulls.csv"
+    path.write_text("id,flag\n1,true\n2,false\n,false\n4,\n")
+    chunks = list(PandasTable.iter_csv(str(path), "id: int;flag: bool", chunk_rows=2))
+    assert [chunk["id"].dtype for chunk in chunks] == ["int64", "Int64"]
+    assert [chunk["flag"].dtype for chunk in chunks] == ["bool", "boolean"]
+    assert pd.concat(chunks)["id"].isna().sum() == 1
+    assert pd.concat(chunks)["flag"].tolist()[2:] == [False, pd.NA]
@@ -1,7 +1,12 @@
+import timeit
+
+import numpy as np
 import pandas as pd
 import pytest
 
 from hammer.table import PandasTable
+from hammer.table import table as table_module
+from hammer.table.table import PandasSeries, wrape_result
 from hammer.utils.schema import init_schema
 
 
@@ -38,3 +43,44 @@ def test_pt_load(csv_path, parquet_path, schema):
     assert not expected.equals(pt2)
     assert pt2._schema == init_schema(schema)
     print(pt2._schema)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"k": rng.integers(0, 10, 100), "a": rng.random(100), "b": rng.random(100)})
+
+
+def test_pt_subclass(frame, schema, monkeypatch):
+    pt = PandasTable(frame, schema=schema)
+    # 链式操作不会重新解析 schema
+    monkeypatch.setattr(table_module, "init_schema", None)
+    assert pt[["k", "a"]]._schema is pt._schema
+    assert isinstance(pt[["k", "a"]].groupby("k").agg(total=("a", "sum")), PandasTable)
+    assert isinstance(pt.a, PandasSeries)
+    assert isinstance(pt.groupby("k")["a"].sum(), PandasSeries)
+    assert isinstance(pt["a"].reset_index(), PandasTable)
+    assert pt.loc[pt["a"] > 0.5, ["k", "a"]]._schema is pt._schema
+    assert isinstance(pt.copy(), PandasTable) and pt.copy()._schema is pt._schema
+    assert PandasTable(frame)._schema is None
+
+    # 包装不拷贝数据
+    wrapped = wrape_result(frame)
+    assert isinstance(wrapped, PandasTable)
+    assert np.shares_memory(wrapped["a"].to_numpy(), frame["a"].to_numpy())
+    # 但不与原对象共用 BlockManager, 新增的列不会出现在原对象中
+    wrapped["new"] = 5
+    assert "new" not in frame.columns
+
+
+@pytest.mark.benchmark
+def test_pt_overhead(frame, schema):
+    """PandasTable 的链式操作与 pd.DataFrame 的耗时相当"""
+    pt = PandasTable(frame, schema=schema)
+
+    def chain(df):
+        return df[["k", "a", "b"]].groupby("k").sum(), df.loc[df["a"] > 0.5, ["k", "b"]].reset_index(drop=True)
+
+    plain = min(timeit.repeat(lambda: chain(frame), number=50, repeat=10))
+    subclass = min(timeit.repeat(lambda: chain(pt), number=50, repeat=10))
+    assert subclass < plain * 1.5
@@ -0,0 +1,121 @@
+import pandas as pd
+import pytest
+
+from hammer.feature.feature import Feature, time_slice
+from hammer.source import BatchSource
+from hammer.table import PandasTable
+from hammer.table.entity import Entity
+
+
+@pytest.fixture
+def events():
+    ts = pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"])
+    return pd.DataFrame({"user_id": [1, 2, 1, 2, 1], "ts": ts, "amount": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+
+@pytest.mark.parametrize("layout", ["sorted", "unsorted", "index", "string"])
+def test_time_slice(events, layout):
+    if layout == "unsorted":
+        events = events.iloc[[3, 0, 4, 1, 2]]
+    elif layout == "index":
+        events = events.set_index("ts")
+    elif layout == "string":
+        events = events.assign(ts=events["ts"].dt.strftime("%Y-%m-%d"))
+    result = time_slice(events, "ts", "2024-01-02", pd.Timestamp("2024-01-04"))
+    assert sorted(result["amount"].tolist()) == [2.0, 3.0, 4.0]
+    assert time_slice(events, "ts", end="2024-01-01")["amount"].tolist() == [1.0]
+    assert time_slice(events, "missing", "2024-01-02") is events
+
+
+def test_time_slice_is_view(events):
+    # 有序的列使用二分查找得到切片
+    result = time_slice(events, "ts", "2024-01-02", "2024-01-03")
+    assert result.index.tolist() == [1, 2]
+    assert time_slice(events.assign(ts=events["ts"].dt.tz_localize("UTC")), "ts", "2024-01-05").index.tolist() == [4]
+
+
+def test_feature_window(events):
+    user = Entity(name="user", join_keys=["user_id"])
+    calls = []
+
+    @Feature(
+        [events],
+        user,
+        event_timestamp_field="ts",
+        start_event_datetime="2024-01-03",
+        end_event_datetime="2024-01-04",
+        ttl=86400,
+    )
+    def rolling_amount(df):
+        calls.append(len(df))
+        return df.assign(total=df.groupby("user_id")["amount"].cumsum())
+
+    result = rolling_amount()
+    # 数据源向前回溯 ttl, 结果只保留 [start, end] 内的行
+    assert calls == [3]
+    assert result["ts"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-03", "2024-01-04"]
+    assert result["total"].tolist() == [3.0, 6.0]
+    pd.testing.assert_frame_equal(rolling_amount.feature.compute(), result)
+
+
+class FakeClient(object):
+    def __init__(self):
+        self.queries = []
+        self.data = pd.DataFrame({"ts": pd.to_datetime(["2024-01-03"]), "amount": [1.0]})
+
+    def read(self, sql, **kwargs):
+        self.queries.append(sql)
+        return PandasTable(self.data)
+
+
+def test_feature_pushes_window_into_source():
+    source = BatchSource(
+        "orders",
+        "0.1.0",
+        "orders",
+        "clickhouse",
+        field_mapping={"c_ts": "ts", "c_amount": "amount"},
+        filter_conditions="c_amount > 0",
+        config={"database": "db"},
+    )
+    client = source._client = FakeClient()
+    feature = Feature(
+        [source],
+        Entity(name="user", join_keys=["user_id"]),
+        event_timestamp_field="ts",
+        start_event_datetime="2024-01-03",
+        end_event_datetime="2024-01-04 12:00:00",
+        ttl=3600,
+    )
+    feature(lambda df: df)
+    feature.compute()
+    assert client.queries == [
+        "select c_ts as ts,c_amount as amount"
+        "\nfrom db.orders"
+        "\nwhere (c_amount > 0) and (c_ts >= '2024-01-02 23:00:00' AND c_ts <= '2024-01-04 12:00:00')"
+    ]
+    # 原数据源不受影响
+    assert source.fetch_data_sql.endswith("\nwhere c_amount > 0")
+
+
+def test_feature_slices_source_without_known_time_column():
+    # select * 时不确定数据表中是否有时间列, 不下推时间范围, 拉取后再按时间窗口过滤
+    source = BatchSource("orders", "0.1.0", "orders", "clickhouse", config={"database": "db"})
+    client = source._client = FakeClient()
+    client.data = pd.DataFrame(
+        {"ts": pd.to_datetime(["2024-01-01", "2024-01-03", "2024-01-05"]), "amount": [1.0, 2.0, 3.0]}
+    )
+    feature = Feature(
+        [source],
+        Entity(name="user", join_keys=["user_id"]),
+        event_timestamp_field="ts",
+        start_event_datetime="2024-01-02",
+        end_event_datetime="2024-01-04",
+    )
+    feature(lambda df: df)
+    result = feature.compute()
+    assert client.queries == ["select *\nfrom db.orders"]
+    assert result["amount"].tolist() == [2.0]
+    assert not source.selects("ts")
+    source.push_down(columns=["amount", "ts"])
+    assert source.selects("ts")
@@ -0,0 +1,75 @@
+import copy
+import os
+
+import pandas as pd
+import pytest
+
+from hammer.feature.feature import Feature
+from hammer.feature.materialize import partition_ranges
+from hammer.feature.online_store import SQLiteOnlineStore, entity_key
+from hammer.table.entity import Entity
+
+EVENTS = pd.DataFrame(
+    {
+        "user_id": [1, 2, 2, 2, 1],
+        "ts": pd.to_datetime(
+            ["2024-01-01 08:00", "2024-01-01 20:00", "2024-01-02 09:00", "2024-01-03 00:00", "2024-01-03 23:00"]
+        ),
+        "amount": [1.0, 2.0, 3.0, 4.0, 5.0],
+    }
+)
+
+
+# 子进程按模块名和函数名重新导入特征计算函数, 因此需要定义在模块顶层
+@Feature([EVENTS], Entity(name="user", join_keys=["user_id"]), event_timestamp_field="ts", ttl=43200)
+def daily_amount(df):
+    if (df["amount"] < 0).any():
+        raise ValueError("negative amount")
+    return df.assign(total=df.groupby("user_id")["amount"].cumsum())
+
+
+def test_partition_ranges():
+    ranges = partition_ranges("2024-01-01 12:00", "2024-01-03", "day")
+    assert [label for _, _, label in ranges] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert ranges[0][:2] == (pd.Timestamp("2024-01-01 12:00"), pd.Timestamp("2024-01-01 23:59:59.999999"))
+    assert ranges[-1][:2] == (pd.Timestamp("2024-01-03"), pd.Timestamp("2024-01-03"))
+    assert [label for _, _, label in partition_ranges("2024-01-30", "2024-02-02", "month")] == ["2024-01", "2024-02"]
+    with pytest.raises(ValueError):
+        partition_ranges("2024-01-01", "2024-01-02", "minute")
+
+
+def test_materialize_resumes_failed_partitions(tmp_path):
+    feature = copy.copy(daily_amount.feature)
+    feature.source = [EVENTS.assign(amount=[1.0, 2.0, -3.0, 4.0, 5.0])]
+    statuses = []
+
+    def on_status(start, end, status):
+        statuses.append((start.strftime("%m-%d"), status))
+
+    parts = feature.materialize("2024-01-01", "2024-01-03 23:59:59", sink=str(tmp_path), on_status=on_status)
+    assert [p.status for p in parts] == ["done", "failed", "done"]
+    assert "negative amount" in parts[1].error
+    assert sorted(statuses) == sorted(
+        [(day, status) for day in ["01-01", "01-02", "01-03"] for status in ["running"]]
+        + [("01-01", "done"), ("01-02", "failed"), ("01-03", "done")]
+    )
+    assert sorted(os.listdir(tmp_path)) == ["dt=2024-01-01", "dt=2024-01-03"]
+    mtime = os.stat(parts[0].path).st_mtime_ns
+
+    # 修复数据后重新执行, 已经完成的分区不会重新计算
+    statuses.clear()
+    store = SQLiteOnlineStore()
+    parts = daily_amount.feature.materialize(
+        "2024-01-01", "2024-01-03 23:59:59", sink=str(tmp_path), on_status=on_status, max_workers=1, online_store=store
+    )
+    assert [p.status for p in parts] == ["done", "done", "done"]
+    assert statuses == [("01-01", "done"), ("01-03", "done"), ("01-02", "running"), ("01-02", "done")]
+    assert os.stat(parts[0].path).st_mtime_ns == mtime
+    assert [p.rows for p in parts] == [None, 1, None]
+    # 跳过的分区同样写入在线存储, 每个实体保留事件时间最新的一行
+    assert store.get(["daily_amount:total"], [entity_key([1]), entity_key([2])]) == ([[5.0, 4.0]], [True, True])
+
+    result = pd.read_parquet(tmp_path)
+    assert result["amount"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    # 数据源向前回溯 ttl, 每个分区的累计值包含前 12 小时的数据
+    assert result["total"].tolist() == [1.0, 2.0, 5.0, 4.0, 5.0]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hammer.feature.online_store import SQLiteOnlineStore, entity_key
+
+
+@pytest.fixture
+def features():
+    return pd.DataFrame(
+        {
+            "user_id": [1, 2, 1, 3],
+            "city": ["a", "b", "a", "c"],
+            "ts": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-03"]),
+            "total": [1.0, 2.0, 3.0, None],
+            "count": [1, 1, 2, 1],
+        }
+    )
+
+
+def test_online_store_latest_vector(tmp_path, features):
+    store = SQLiteOnlineStore(str(tmp_path / "online.db"))
+    assert store.write("user_amount", features, ["user_id", "city"], "ts") == 3
+    keys = [entity_key([1, "a"]), entity_key([3, "c"]), entity_key([9, "x"])]
+    columns, found = store.get(["user_amount:count", "user_amount:total"], keys)
+    assert columns == [[2, 1, None], [3.0, None, None]]
+    assert found == [True, True, False]
+    assert store.kinds(["user_amount:total", "user_amount:count"]) == ["double", "int64"]
+
+    # 较早的数据不会覆盖较新的特征, 其他进程打开同一个文件可以读到写入的视图
+    store.write("user_amount", features.iloc[[0]], ["user_id", "city"], "ts")
+    other = SQLiteOnlineStore(str(tmp_path / "online.db"))
+    assert other.get(["user_amount:total"], keys[:1]) == ([[3.0]], [True])
+    assert store.get(["user_amount:total"], []) == ([[]], [])
+
+    with pytest.raises(KeyError):
+        store.get(["user_amount:missing"], keys)
+    with pytest.raises(KeyError):
+        store.get(["other:total"], keys)
+    with pytest.raises(ValueError):
+        store.write("user_amount", features, ["user_id", "city"], "ts", columns=["total"])
+
+
+def test_online_store_float_keys(features):
+    # 主键列有空值时是浮点数, 写入的主键与按整数或字符串查询的主键一致
+    features["user_id"] = features["user_id"].astype(float)
+    store = SQLiteOnlineStore()
+    store.write("user_amount", features, ["user_id"], "ts")
+    assert entity_key([1.0]) == entity_key([np.int64(1)]) == entity_key(["1"]) == "1"
+    assert entity_key([1.5, np.float64(2.0), True]) == entity_key(["1.5", "2", "True"])
+    kinds, columns, found = store.lookup(["user_amount:count"], [entity_key(["1"]), entity_key([3])])
+    assert (kinds, columns, found) == (["int64"], [[2, 1]], [True, True])
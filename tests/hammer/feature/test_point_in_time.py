@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hammer.feature.feature import Feature
+from hammer.feature.point_in_time import point_in_time_join
+from hammer.table.entity import Entity
+
+
+@pytest.fixture
+def spine():
+    return pd.DataFrame(
+        {
+            "user_id": [1, 1, 2, 2, 3],
+            "ts": pd.to_datetime(["2024-01-02", "2024-01-10", "2024-01-01", "2024-01-05", "2024-01-03"]),
+            "label": [0, 1, 1, 0, 1],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+
+@pytest.fixture
+def spend():
+    return pd.DataFrame(
+        {
+            "user_id": [1, 1, 1, 2, 2],
+            "event_ts": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-11", "2023-12-01", "2024-01-04"]),
+            "spend": [1.0, 2.0, 99.0, 3.0, 4.0],
+        }
+    )
+
+
+def _naive_join(spine, feature, ttl):
+    """交叉连接后过滤, 作为对照"""
+    rows = []
+    for _, row in spine.iterrows():
+        candidates = feature[(feature["user_id"] == row["user_id"]) & (feature["event_ts"] <= row["ts"])]
+        if ttl:
+            candidates = candidates[candidates["event_ts"] >= row["ts"] - pd.Timedelta(seconds=ttl)]
+        rows.append(candidates.sort_values("event_ts")["spend"].iloc[-1] if len(candidates) else np.nan)
+    return pd.Series(rows, index=spine.index, name="spend")
+
+
+@pytest.mark.parametrize("num_partitions", [1, 4])
+@pytest.mark.parametrize("ttl", [0, 3 * 86400])
+def test_point_in_time_join(spine, spend, ttl, num_partitions):
+    result = point_in_time_join(spine, spend, ["user_id"], "ts", "event_ts", ttl, num_partitions=num_partitions)
+    assert list(result.columns) == ["user_id", "ts", "label", "spend"]
+    pd.testing.assert_frame_equal(result[["user_id", "ts", "label"]], spine)
+    pd.testing.assert_series_equal(result["spend"], _naive_join(spine, spend, ttl))
+
+
+def test_point_in_time_join_random():
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2024-01-01")
+    spine = pd.DataFrame(
+        {"user_id": rng.integers(0, 20, 300), "ts": start + pd.to_timedelta(rng.integers(0, 1000, 300), unit="h")}
+    )
+    spend = pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 20, 500).astype("int32"),
+            "event_ts": start + pd.to_timedelta(rng.integers(0, 1000, 500), unit="h"),
+            "spend": rng.random(500),
+        }
+    ).drop_duplicates(["user_id", "event_ts"])
+    result = point_in_time_join(spine, spend, ["user_id"], "ts", "event_ts", 86400, num_partitions=8)
+    pd.testing.assert_series_equal(result["spend"], _naive_join(spine, spend, 86400))
+
+
+def test_get_historical_features(spine, spend):
+    user = Entity(name="user", join_keys=["user_id"])
+    orders = spend.rename(columns={"spend": "amount"})
+
+    @Feature([spend], user, event_timestamp_field="event_ts")
+    def user_spend(df):
+        return df
+
+    @Feature([orders], user, event_timestamp_field="event_ts")
+    def user_orders(df):
+        return df.assign(amount=df["amount"] * 10)
+
+    result = Feature.get_historical_features(spine, features=[user_spend, user_orders], timestamp_field="ts")
+    expected = _naive_join(spine, spend, 0)
+    pd.testing.assert_series_equal(result["spend"], expected)
+    pd.testing.assert_series_equal(result["amount"], (expected * 10).rename("amount"))
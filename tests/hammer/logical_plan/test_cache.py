@@ -0,0 +1,149 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from hammer.logical_plan import LogicalPlan
+from hammer.logical_plan.engine import PlanCache, PlanExecutor
+from hammer.source import BatchSource
+from hammer.table import PandasTable
+
+
+@pytest.fixture
+def local_csv(tmp_path, csv_path):
+    path = tmp_path / "data.csv"
+    shutil.copy(csv_path, path)
+    return str(path)
+
+
+@pytest.fixture
+def dag(local_csv):
+    double = "def double(df):\n    return df * 2\n"
+    dag = LogicalPlan()
+    dag.add_operation_node("double", "udf", udf_name="double", udf_block=double)
+    dag.add_data_node("input_csv", "io", local_csv)
+    dag.add_operation_node("read_csv", "pd.read_csv", ["input_csv"], {}, "input_csv")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("read_csv", "df1")
+    dag.add_operation_node("groupby", "groupby", ["category"], {}, "df1")
+    dag.add_operation_node("select", "select", "value", {}, "groupby")
+    dag.add_operation_node("sum", "sum", [], {}, "select")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("sum", "df2")
+    dag.add_operation_node("double", "double", input_nodes="df2")
+    dag.add_data_node("df3", "memory")
+    dag.add_edge("double", "df3")
+    return dag
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PlanCache(tmp_path / "cache")
+
+
+def test_cache_reuse(dag: LogicalPlan, cache: PlanCache):
+    first = PlanExecutor(dag, cache=cache)
+    expected = first.execute(outputs="df3")["df3"]
+    assert first.cached_nodes == set()
+
+    second = PlanExecutor(dag, cache=cache)
+    result = second.execute(outputs="df3")["df3"]
+    pd.testing.assert_series_equal(result, expected)
+    # 输出节点直接从缓存读取, 上游节点都不需要执行
+    assert second.cached_nodes == {"df3"}
+    assert list(second.plan_nodes({}, ["df3"])) == ["df3"]
+
+
+def test_cache_recompute_dirty_suffix(dag: LogicalPlan, cache: PlanCache):
+    PlanExecutor(dag, cache=cache).execute(outputs="df3")
+
+    dag["double"]["obj"].udf_block = "def double(df):\n    return df * 3\n"
+    executor = PlanExecutor(dag, cache=cache)
+    # 只有 udf 下游需要重新计算, df2 从缓存读取
+    assert list(executor.plan_nodes({}, ["df3"])) == ["df2", "double", "df3"]
+    result = executor.execute(outputs="df3")["df3"]
+    assert executor.cached_nodes == {"df2"}
+    assert result.to_dict() == (executor.cache.load(executor.fingerprints["df2"]) * 3).to_dict()
+
+
+def test_cache_source_changed(dag: LogicalPlan, cache: PlanCache, local_csv):
+    PlanExecutor(dag, cache=cache).execute(outputs="df3")
+
+    df = pd.read_csv(local_csv)
+    df["value"] = 1.0
+    df.to_csv(local_csv, index=False)
+    os.utime(local_csv, ns=(0, 0))
+
+    executor = PlanExecutor(dag, cache=cache)
+    result = executor.execute(outputs="df3")["df3"]
+    assert executor.cached_nodes == set()
+    assert result.to_dict() == (df.groupby("category")["value"].sum() * 2).to_dict()
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = PlanCache(tmp_path / "lru", max_bytes=1)
+    frame = pd.DataFrame({"a": range(10)})
+    cache.save("first", frame)
+    assert "first" not in cache
+
+    cache.max_bytes = 10 * 1024**2
+    cache.save("first", frame)
+    cache.save("second", frame["a"])
+    os.utime(cache._path("first"), ns=(0, 0))
+    pd.testing.assert_series_equal(cache.load("second"), frame["a"])
+    cache.max_bytes = os.path.getsize(cache._path("second"))
+    cache.evict()
+    assert "first" not in cache
+    assert "second" in cache
+
+
+def test_cache_skips_unconvertible_results(local_csv, cache: PlanCache):
+    # object 列中混有整数和字符串, 无法转换为 arrow, 跳过缓存而不是中断执行
+    mixed = "def mixed(df):\n    return df.assign(mixed=[i if i % 2 else str(i) for i in range(len(df))])\n"
+    dag = LogicalPlan()
+    dag.add_operation_node("mixed", "udf", udf_name="mixed", udf_block=mixed)
+    dag.add_data_node("input_csv", "io", local_csv)
+    dag.add_operation_node("read_csv", "pd.read_csv", ["input_csv"], {}, "input_csv")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("read_csv", "df1")
+    dag.add_operation_node("mixed", "mixed", input_nodes="df1")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("mixed", "df2")
+
+    executor = PlanExecutor(dag, cache=cache)
+    result = executor.execute(outputs="df2")["df2"]
+    assert result["mixed"].tolist()[:2] == ["0", 1]
+    assert executor.fingerprints["df2"] is not None and executor.fingerprints["df2"] not in cache
+
+
+def test_cache_series_tuple_name(cache: PlanCache):
+    series = pd.Series([1, 2], name=("value", "sum"))
+    assert cache.save("tuple", series)
+    pd.testing.assert_series_equal(cache.load("tuple"), series)
+    assert not cache.save("unnamed", pd.Series([1, 2], name=object()))
+
+
+class SqlClient(object):
+    def read(self, sql, **kwargs):
+        return PandasTable(pd.DataFrame({"value": [1.0, 2.0, 3.0]}).query(sql.split("where ")[-1]))
+
+
+def test_cache_source_fingerprint(cache: PlanCache):
+    dag = LogicalPlan()
+    dag.add_data_node("orders", "sql")
+    dag.add_operation_node("sum", "sum", [], {}, "orders")
+    dag.add_data_node("total", "memory")
+    dag.add_edge("sum", "total")
+
+    results = []
+    for condition in ["value > 1", "value > 2", "value > 1"]:
+        source = BatchSource(
+            "orders", "0.1.0", "orders", "clickhouse", filter_conditions=condition, config={"database": "db"}
+        )
+        source._client = SqlClient()
+        executor = PlanExecutor(dag, cache=cache)
+        results.append(executor.execute(inputs={"orders": source}, outputs="total")["total"]["value"])
+    # 不同 sql 的数据源指纹不同, 相同 sql 的数据源命中缓存
+    assert results == [5.0, 3.0, 5.0]
+    assert cache.hits == 1
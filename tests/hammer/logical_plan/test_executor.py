@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+
+from hammer.logical_plan import LogicalPlan
+from hammer.logical_plan.engine import ParallelPlanExecutor, PlanExecutor
+from hammer.logical_plan.pandas_ast.parser import PandasParser
+
+
+@pytest.fixture
+def code(csv_path):
+    return f"""
+import pandas as pd
+
+def double(df):
+    return df * 2
+
+input_csv = "{csv_path}"
+df1 = pd.read_csv(input_csv)
+df2 = df1.groupby("category")["value"].sum()
+df3 = double(df2)
+"""
+
+
+@pytest.fixture
+def dag():
+    dag = LogicalPlan()
+    dag.add_data_node("input_csv", "io", "data.csv")
+    dag.add_operation_node("read_csv", "pd.read_csv", ["input_csv"], {}, "input_csv")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("read_csv", "df1")
+    dag.add_operation_node("groupby", "groupby", ["category"], {}, "df1")
+    dag.add_operation_node("select", "select", "value", {}, "groupby")
+    dag.add_operation_node("sum", "sum", [], {}, "select")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("sum", "df2")
+    return dag
+
+
+def test_execute_parsed_plan(code, csv_path):
+    parser = PandasParser("input_csv", "df3")
+    parser.parse(code)
+    result = parser.dag.execute(outputs="df3")
+
+    expected = pd.read_csv(csv_path).groupby("category")["value"].sum() * 2
+    pd.testing.assert_series_equal(result["df3"], expected)
+
+
+def test_execute_with_inputs(dag: LogicalPlan, csv_path):
+    result = dag.execute({"input_csv": csv_path})
+    expected = pd.read_csv(csv_path).groupby("category")["value"].sum()
+    assert list(result) == ["df2"]
+    pd.testing.assert_series_equal(result["df2"], expected)
+
+    # 直接传入内存数据, 跳过读文件
+    df1 = pd.DataFrame({"category": ["a", "a", "b"], "value": [1, 2, 3]})
+    result = dag.execute({"df1": df1}, outputs="df2")
+    assert result["df2"].to_dict() == {"a": 3, "b": 3}
+
+
+def test_execute_frees_intermediate(dag: LogicalPlan, csv_path):
+    executor = PlanExecutor(dag)
+    result = executor.execute({"input_csv": csv_path})
+    assert list(result) == ["df2"]
+    # 链式 dag 中, 任意时刻最多只有上游和当前节点两个结果存活
+    assert executor.peak_live_nodes == 2
+
+
+def test_execute_missing_input():
+    dag = LogicalPlan()
+    dag.add_data_node("df1", "memory")
+    dag.add_operation_node("sum", "sum", [], {}, "df1")
+    with pytest.raises(ValueError):
+        dag.execute(outputs="sum")
+
+
+@pytest.fixture
+def branch_dag():
+    """两个相互独立的分支, 最后由 udf 合并"""
+    slow = "def slow(df):\n    import time\n    time.sleep(0.3)\n    return df\n"
+    combine = "def combine(a, b):\n    return a + b\n"
+    dag = LogicalPlan()
+    dag.add_operation_node("slow", "udf", udf_name="slow", udf_block=slow)
+    dag.add_operation_node("combine", "udf", udf_name="combine", udf_block=combine)
+    for i in range(2):
+        dag.add_data_node(f"path_{i}", "io", "tests/data/sample_data.csv")
+        dag.add_operation_node(f"read_csv_{i}", "pd.read_csv", [f"path_{i}"], {}, f"path_{i}")
+        dag.add_operation_node(f"groupby_{i}", "groupby", ["category"], {}, f"read_csv_{i}")
+        dag.add_operation_node(f"select_{i}", "select", "value", {}, f"groupby_{i}")
+        dag.add_operation_node(f"sum_{i}", "sum", [], {}, f"select_{i}")
+        # 第二次调用 slow 时会生成 slow_hammer_tag_1 节点
+        dag.add_operation_node("slow", "slow", input_nodes=f"sum_{i}")
+        dag.add_data_node(f"s{i}", "memory")
+        dag.add_edge("slow", f"s{i}")
+    dag.add_operation_node("combine", "combine", input_nodes=["s0", "s1"])
+    dag.add_data_node("out", "memory")
+    dag.add_edge("combine", "out")
+    return dag
+
+
+@pytest.mark.parametrize("udf_pool", ["thread", "process"])
+def test_parallel_execute(branch_dag: LogicalPlan, csv_path, udf_pool):
+    executor = ParallelPlanExecutor(branch_dag, max_workers=4, udf_pool=udf_pool)
+    result = executor.execute(outputs="out")
+
+    expected = pd.read_csv(csv_path).groupby("category")["value"].sum() * 2
+    pd.testing.assert_series_equal(result["out"], expected)
+
+    report = executor.report()
+    assert set(report["node_name"]) >= {"read_csv_0", "read_csv_1", "slow", "slow_hammer_tag_1", "combine"}
+    assert report["start"].is_monotonic_increasing
+    # 两个分支上的 slow 节点应该同时执行
+    slow_0, slow_1 = (t for t in executor.timeline if t.node_name.startswith("slow"))
+    assert slow_0.start < slow_1.end and slow_1.start < slow_0.end
+
+
+def test_parallel_matches_serial(dag: LogicalPlan, csv_path):
+    serial = dag.execute({"input_csv": csv_path})
+    parallel = dag.execute({"input_csv": csv_path}, max_workers=2)
+    pd.testing.assert_series_equal(serial["df2"], parallel["df2"])
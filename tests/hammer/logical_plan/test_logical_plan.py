@@ -1,5 +1,6 @@
 import json
 
+import pandas as pd
 import pytest
 
 from hammer.logical_plan import LogicalPlan
@@ -33,3 +34,69 @@ def test_dag_from_json(dag: LogicalPlan):
     json_str = dag.to_json()
     dag2 = dag.from_json(json_str)
     assert dag == dag2
+
+
+def test_version_index():
+    dag = LogicalPlan()
+    dag.add_data_node("input_csv", "io", "data.csv")
+    dag.add_operation_node("read_csv", "pd.read_csv", ["input_csv"], {}, "input_csv")
+    dag.add_data_node("df", "memory")
+    dag.add_edge("read_csv", "df")
+    for _ in range(12):
+        dag.add_operation_node("sum", "sum", [], {}, "df")
+        dag.add_data_node("df", "memory")
+        dag.add_edge("sum", "df")
+    # 按版本号而不是字典序排序
+    assert dag.get_last_node("df") == "df_hammer_tag_12"
+    assert dag.get_second_to_last_node("df") == "df_hammer_tag_11"
+    assert dag.get_duplicated_nodes("sum")[-3:] == ["sum_hammer_tag_9", "sum_hammer_tag_10", "sum_hammer_tag_11"]
+    assert dag.get_input_nodes("sum_hammer_tag_11") == ["df_hammer_tag_11"]
+
+    # 复制和反序列化后的 plan 继续编号
+    for plan in (dag.copy(), LogicalPlan.from_json(dag.to_json())):
+        assert plan.get_last_node("df") == "df_hammer_tag_12"
+        plan.add_operation_node("sum", "sum", [], {}, "df")
+        assert plan.get_last_node("sum") == "sum_hammer_tag_12"
+    assert dag.get_last_node("sum") == "sum_hammer_tag_11"
+
+    # 被删除的节点不再作为最新节点
+    dag.graph.remove_node("df_hammer_tag_12")
+    assert dag.get_last_node("df") == "df_hammer_tag_11"
+
+
+def test_dag_bytes_roundtrip(csv_path):
+    dag = LogicalPlan()
+    dag.add_data_node("input_csv", "io", csv_path)
+    dag.add_edge(csv_path, "input_csv")
+    dag.add_operation_node("read_csv", "pd.read_csv", ["input_csv"], {"usecols": ["category", "value"]}, "input_csv")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("read_csv", "df1")
+    dag.add_operation_node("loc", "loc", [None, ("category", "value")], {}, "df1")
+    dag.add_operation_node("groupby", "groupby", ["category"], {"dropna": False}, "loc")
+    dag.add_operation_node("select", "select", "value", {}, "groupby")
+    dag.add_operation_node("sum", "sum", [], {"min_count": 1}, "select")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("sum", "df2")
+    dag.add_operation_node(
+        "scale", "udf", ["df2", 2.5], udf_name="scale", udf_block="def scale(df):\n    return df * 2.5\n"
+    )
+    dag.add_edge("df2", "scale")
+    dag.add_data_node("df3", "memory")
+    dag.add_edge("scale", "df3")
+
+    data = dag.to_bytes()
+    dag2 = LogicalPlan.from_bytes(data)
+    assert dag == dag2
+    assert list(dag2.graph.nodes) == list(dag.graph.nodes)
+    assert dag2[csv_path] == {}
+    for node_name in ("input_csv", "read_csv", "loc", "groupby", "sum", "scale"):
+        obj, obj2 = dag[node_name]["obj"], dag2[node_name]["obj"]
+        assert type(obj2) is type(obj)
+        assert obj2.to_dict() == obj.to_dict()
+    assert dag2["loc"]["obj"].function_positional_args == [None, ("category", "value")]
+    assert dag2.get_last_node("df2") == "df2"
+    pd.testing.assert_series_equal(dag2.execute(outputs="df3")["df3"], dag.execute(outputs="df3")["df3"])
+
+    dag.add_operation_node("bad", "groupby", [object()], {}, "df3")
+    with pytest.raises(TypeError):
+        dag.to_bytes()
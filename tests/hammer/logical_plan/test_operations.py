@@ -0,0 +1,39 @@
+import copy
+import inspect
+import pickle
+
+import pytest
+
+from hammer.logical_plan.operations import (
+    GroupbyOp,
+    SumOp,
+    UserDefinedFunctionOp,
+    create_ops,
+)
+
+
+def test_create_ops_without_signature_inspection(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("create_ops 不应该在每次构造算子时调用 inspect.signature")
+
+    monkeypatch.setattr(inspect, "signature", fail)
+    op = create_ops("groupby", ["category"], {"dropna": False})
+    assert isinstance(op, GroupbyOp)
+    assert op.function_keyword_args == {"by": "category", "dropna": False}
+    assert isinstance(create_ops("sum", [], {}), SumOp)
+    with pytest.raises(ValueError):
+        create_ops("not_registered")
+
+
+def test_ops_use_slots():
+    op = create_ops("groupby", ["category"], {})
+    assert not hasattr(op, "__dict__")
+    assert op.function_name == "groupby"
+    with pytest.raises(AttributeError):
+        op.unknown = 1
+
+    udf = create_ops("udf", ["df"], udf_name="double", udf_block="def double(df):\n    return df * 2\n")
+    assert isinstance(udf, UserDefinedFunctionOp)
+    for restored in (pickle.loads(pickle.dumps(udf)), copy.deepcopy(udf)):
+        assert type(restored) is UserDefinedFunctionOp
+        assert restored.to_dict() == udf.to_dict()
@@ -0,0 +1,165 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from hammer.logical_plan import LogicalPlan
+from hammer.logical_plan.pandas_ast.parser import PandasParser
+from hammer.source import BatchSource
+from hammer.utils.predicate import query_columns, query_to_filters, query_to_sql
+
+
+@pytest.fixture
+def dag(csv_path):
+    dag = LogicalPlan()
+    dag.add_data_node("input_csv", "io", csv_path)
+    dag.add_operation_node("read_csv", "pd.read_csv", ["input_csv"], {}, "input_csv")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("read_csv", "df1")
+    dag.add_operation_node("groupby", "groupby", ["category"], {}, "df1")
+    dag.add_operation_node("select", "select", "value", {}, "groupby")
+    dag.add_operation_node("sum", "sum", [], {}, "select")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("sum", "df2")
+    # 没有被使用的分支
+    dag.add_operation_node("select_id", "select", "id", {}, "df1")
+    dag.add_data_node("unused", "memory")
+    dag.add_edge("select_id", "unused")
+    return dag
+
+
+def test_prune_and_projection(dag: LogicalPlan, csv_path):
+    optimized = dag.optimize("df2")
+    assert not optimized.has_node("unused")
+    assert not optimized.has_node("select_id")
+    assert optimized["read_csv"]["obj"].function_keyword_args["usecols"] == ["category", "value"]
+    # 原 dag 不受影响
+    assert dag.has_node("unused")
+    assert "usecols" not in dag["read_csv"]["obj"].function_keyword_args
+
+    expected = pd.read_csv(csv_path).groupby("category")["value"].sum()
+    pd.testing.assert_series_equal(optimized.execute(outputs="df2")["df2"], expected)
+
+
+def test_projection_blocked_by_output(dag: LogicalPlan):
+    optimized = dag.optimize(["df1", "df2"])
+    assert "usecols" not in optimized["read_csv"]["obj"].function_keyword_args
+
+
+def test_parquet_predicate_pushdown(parquet_path):
+    dag = LogicalPlan()
+    dag.add_data_node("path", "io", parquet_path)
+    dag.add_operation_node("read_parquet", "pd.read_parquet", ["path"], {}, "path")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("read_parquet", "df1")
+    dag.add_operation_node("query", "query", ["value > 50"], {}, "df1")
+    dag.add_operation_node("select", "select", ["id", "category"], {}, "query")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("select", "df2")
+
+    optimized = dag.optimize("df2")
+    assert not optimized.has_node("query")
+    reader = optimized["read_parquet"]["obj"]
+    assert reader.function_keyword_args["filters"] == [("value", ">", 50)]
+    assert reader.function_keyword_args["columns"] == ["category", "id"]
+
+    expected = pd.read_parquet(parquet_path).query("value > 50")[["id", "category"]]
+    result = optimized.execute(outputs="df2")["df2"]
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_source_pushdown():
+    source = BatchSource(
+        "orders",
+        "0.1.0",
+        "orders",
+        "clickhouse",
+        field_mapping={"c_value": "value", "c_category": "category", "c_id": "id"},
+        filter_conditions="dt >= '2024-01-01'",
+        config={"database": "db"},
+    )
+    dag = LogicalPlan()
+    dag.add_data_node("orders", "sql")
+    dag.add_operation_node("query", "query", ["value > 10 and category in ['A', 'B']"], {}, "orders")
+    dag.add_data_node("df1", "memory")
+    dag.add_edge("query", "df1")
+    dag.add_operation_node("groupby", "groupby", ["category"], {}, "df1")
+    dag.add_operation_node("select", "select", "value", {}, "groupby")
+    dag.add_operation_node("sum", "sum", [], {}, "select")
+    dag.add_data_node("df2", "memory")
+    dag.add_edge("sum", "df2")
+
+    original_sql = source.fetch_data_sql
+    expected_sql = (
+        "select c_value as value,c_category as category"
+        "\nfrom db.orders"
+        "\nwhere (dt >= '2024-01-01') and (c_value > 10 AND c_category IN ('A', 'B'))"
+    )
+    optimized = dag.optimize("df2", sources={"orders": source})
+    assert not optimized.has_node("query")
+    assert optimized.sources["orders"].fetch_data_sql == expected_sql
+    # 下推到副本中, 原数据源不受影响, 重复优化时条件不会累积
+    assert source.fetch_data_sql == original_sql
+    assert dag.optimize("df2", sources={"orders": source}).sources["orders"].fetch_data_sql == expected_sql
+
+
+def test_query_translation():
+    assert query_columns("a > 1 and (b == 'x' or c != d)") == {"a", "b", "c", "d"}
+    assert query_columns("a > @threshold") is None
+    assert query_to_sql('a > 1 and b == "it\'s"') == "(a > 1 AND b = 'it''s')"
+    assert query_to_sql("1 < a <= 3") == "(a > 1 AND a <= 3)"
+    assert query_to_sql("not a == None") == "(NOT a IS NULL)"
+    # pandas 会保留 !=, not in 和 not 中的空值
+    assert query_to_sql("a != 5") == "(a <> 5 OR a IS NULL)"
+    assert query_to_sql("a not in [1, 2]") == "(a NOT IN (1, 2) OR a IS NULL)"
+    assert query_to_sql("not a > 5") == "(NOT COALESCE(a > 5, FALSE))"
+    assert query_to_sql("a.str.startswith('x')") is None
+    assert query_to_filters("a > 1 and b in [1, 2]") == [("a", ">", 1), ("b", "in", [1, 2])]
+    assert query_to_filters("a > 1 or b < 2") is None
+    assert query_to_filters("a > 1 and b != 2") is None
+    assert query_to_filters("b not in [1, 2]") is None
+
+
+def test_query_to_sql_keeps_nulls():
+    df = pd.DataFrame({"a": [1.0, 5.0, None, 7.0]})
+    conn = sqlite3.connect(":memory:")
+    df.to_sql("t", conn, index=False)
+    for expr in ["a != 5", "a not in [1, 7]", "not a > 5", "not (a > 5 and a != 7)", "a > 1 or not a < 6"]:
+        expected = df.query(expr)["a"].fillna(-1).tolist()
+        result = pd.read_sql(f"select a from t where {query_to_sql(expr)}", conn)["a"].fillna(-1).tolist()
+        assert result == expected, expr
+
+
+def test_common_subexpression_elimination(csv_path):
+    code = f"""
+    input_csv = "{csv_path}"
+    df1 = pd.read_csv(input_csv)
+    df2 = pd.read_csv(input_csv)
+    s1 = df1.groupby("category")["value"].sum()
+    s2 = df2.groupby("category")["value"].sum()
+    s3 = df2.groupby("category")["id"].sum()
+    df4 = combine(s1, s2)
+    df5 = combine(s3, s2)
+
+    def combine(a, b):
+        return a + b
+    """
+    dag = PandasParser("input_csv", "df5").parse(code)
+    optimized = dag.optimize(["df4", "df5", "s3"])
+
+    # 两次读取和 s1/s2 的聚合各只保留一个, s3 与它们共用 groupby
+    assert optimized.node_startswith("pd.read_csv") == ["pd.read_csv"]
+    assert optimized.node_startswith("groupby") == ["groupby"]
+    assert optimized.get_input_nodes("s2") == ["sum"]
+    assert len(optimized.node_startswith("select")) == 2
+    # combine(s1, s2) 的两个入参合并后是同一个节点, 不能合并成一条边
+    assert optimized.get_input_nodes("combine") == ["s1", "s2"]
+    assert optimized.get_input_nodes("combine_hammer_tag_1") == ["s3", "s2"]
+    # 合并后的读取算子读取所有下游需要的列
+    assert optimized["pd.read_csv"]["obj"].function_keyword_args["usecols"] == ["category", "id", "value"]
+
+    df = pd.read_csv(csv_path)
+    value, id_ = df.groupby("category")["value"].sum(), df.groupby("category")["id"].sum()
+    result = optimized.execute(outputs=["df4", "df5"])
+    pd.testing.assert_series_equal(result["df4"], value + value)
+    pd.testing.assert_series_equal(result["df5"], id_ + value)
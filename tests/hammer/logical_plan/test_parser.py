@@ -0,0 +1,77 @@
+import pandas as pd
+
+from hammer.logical_plan import LogicalPlan
+from hammer.logical_plan.pandas_ast.parser import PandasParser
+
+
+def test_parse_multiline_and_repeated_chain(csv_path):
+    code = f"""
+    import pandas as pd
+
+    input_csv = "{csv_path}"
+    df1 = pd.read_csv(
+        input_csv,
+    )
+    df2 = (
+        df1.groupby("category")["value"]
+        .sum()
+    )
+    df3 = df1.groupby("category")["id"].sum()
+    df4 = combine(df2, df3)
+
+    def combine(a, b):
+        return a + b
+    """
+    parser = PandasParser("input_csv", "df4")
+    dag = parser.parse(code)
+    assert dag.has_node("groupby_hammer_tag_1")
+    assert dag.get_input_nodes("groupby_hammer_tag_1") == ["df1"]
+    assert sorted(dag.get_input_nodes("combine")) == ["df2", "df3"]
+
+    df = pd.read_csv(csv_path)
+    expected = df.groupby("category")["value"].sum() + df.groupby("category")["id"].sum()
+    pd.testing.assert_series_equal(dag.execute(outputs="df4")["df4"], expected)
+
+
+def test_parse_reassign_and_constants(csv_path):
+    code = f"""
+    input_csv = "{csv_path}"
+    df = pd.read_csv(input_csv)
+    df = df.query("value > 50")
+    df = df.loc[:, ["id", "value"]]
+    df.sum()
+    """
+    parser = PandasParser("input_csv", "df")
+    dag = parser.parse(code)
+    assert parser.end_node_name == "df_hammer_tag_2"
+    assert dag["loc"]["obj"].columns == ["id", "value"]
+
+    expected = pd.read_csv(csv_path).query("value > 50").loc[:, ["id", "value"]]
+    pd.testing.assert_frame_equal(dag.execute(outputs=parser.end_node_name)[parser.end_node_name], expected)
+
+
+def test_parse_repeated_select(csv_path):
+    lines = [f'input_csv = "{csv_path}"', "df0 = pd.read_csv(input_csv)"]
+    lines += [f'df{i} = df{i - 1}[["id", "value"]]' for i in range(1, 9)]
+    parser = PandasParser("input_csv", "df8")
+    dag = parser.parse("\n".join(lines))
+    assert dag.get_input_nodes("select_hammer_tag_7") == ["df7"]
+    assert len(parser.get_main_nodes("op", prefix="select")) == 8
+
+
+def test_parse_long_script(csv_path, monkeypatch):
+    scans = []
+    node_startswith = LogicalPlan.node_startswith
+    monkeypatch.setattr(
+        LogicalPlan, "node_startswith", lambda self, prefix: scans.append(prefix) or node_startswith(self, prefix)
+    )
+
+    lines = [f'input_csv = "{csv_path}"', "df0 = pd.read_csv(input_csv)"]
+    lines += [f'df{i} = df{i - 1}[["id", "value"]]' for i in range(1, 200)]
+    dag = PandasParser("input_csv", "df199").parse("\n".join(lines))
+    # 查找最新的同名节点走版本索引, 不扫描全图, 解析的耗时与脚本长度成线性关系
+    assert scans == []
+    assert dag._versions["select"] == ["select"] + [f"select_hammer_tag_{i}" for i in range(1, 199)]
+    assert dag.get_last_node("select") == "select_hammer_tag_198"
+    assert dag.get_input_nodes("select_hammer_tag_198") == ["df198"]
+    assert dag.get_input_nodes("df199") == ["select_hammer_tag_198"]
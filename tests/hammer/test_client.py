@@ -0,0 +1,156 @@
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from hammer.table import PandasTable
+from hammer.utils.client.clickhouse import ClickHouseClient
+from hammer.utils.client.postgres import PostgresClient
+
+
+class FakeClickHouse(object):
+    """只实现 ClickHouseClient 用到的接口, 返回固定的 arrow 数据"""
+
+    def __init__(self, table: pa.Table):
+        self.table = table
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def query_df(self, query, **kwargs):
+        self.calls.append(("query_df", kwargs))
+        return self.table.to_pandas()
+
+    def query_arrow(self, query, **kwargs):
+        self.calls.append(("query_arrow", kwargs))
+        return self.table
+
+    @contextmanager
+    def query_arrow_stream(self, query, **kwargs):
+        self.calls.append(("query_arrow_stream", kwargs))
+        yield iter(self.table.to_batches(max_chunksize=2))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    table = pa.table({"id": [1, 2, 3], "name": ["a", "b", None]})
+    monkeypatch.setattr(ClickHouseClient, "_create_pool", lambda self: FakeClickHouse(table))
+    return ClickHouseClient(user="u", password="p", host="localhost", port="8123", database="db")
+
+
+def test_read_arrow(client):
+    table = client.read_arrow("select * from t", use_copy=False)
+    assert isinstance(table, pa.Table)
+    assert client._pool.calls == [("query_arrow", {"use_strings": True})]
+
+    pt = client.read_arrow("select * from t", to_pandas=True)
+    assert isinstance(pt, PandasTable)
+    assert pt["id"].dtype == pd.ArrowDtype(pa.int64())
+    # ArrowDtype 列直接引用 arrow 的内存
+    assert pt["id"].array._pa_array.chunks[0].buffers()[1].address == table["id"].chunks[0].buffers()[1].address
+    assert pt["name"].isna().tolist() == [False, False, True]
+
+
+def test_iter_arrow(client):
+    chunks = list(client.iter_arrow("select * from t", to_pandas=True))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all(isinstance(chunk, PandasTable) for chunk in chunks)
+    assert pd.concat(chunks)["id"].tolist() == [1, 2, 3]
+    assert client.read("select * from t", use_copy=False)["id"].tolist() == [1, 2, 3]
+
+
+class FakeCursor(object):
+    def __init__(self, rows, name=None):
+        self.rows = rows
+        self.name = name
+        # (列名, 类型 oid), 与 psycopg2 的 cursor.description 一致
+        self.description = [("id", 20), ("name", 25)]
+        self.fetch_sizes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, *args):
+        self.position = 0
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        rows = self.rows[self.position : self.position + size]
+        self.position += size
+        return rows
+
+    def copy_expert(self, sql, file):
+        assert sql.startswith("COPY (") and sql.endswith("TO STDOUT WITH CSV HEADER")
+        file.write(b"id,name\n")
+        for row in self.rows:
+            file.write(",".join("" if v is None else str(v) for v in row).encode() + b"\n")
+
+
+class FakePostgres(object):
+    def __init__(self, rows):
+        self.rows = rows
+        self.cursors = []
+        self.rollbacks = 0
+        self.released = 0
+
+    def getconn(self):
+        return self
+
+    def putconn(self, connection):
+        self.released += 1
+
+    def cursor(self, name=None):
+        self.cursors.append(FakeCursor(self.rows, name))
+        return self.cursors[-1]
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def pg_client(monkeypatch):
+    rows = [(i, f"name_{i}") for i in range(10)]
+    monkeypatch.setattr(PostgresClient, "_create_pool", lambda self: FakePostgres(rows))
+    return PostgresClient(user="u", password="p", host="localhost", port="5432", database="db")
+
+
+@pytest.mark.parametrize("use_copy", [False, True])
+def test_postgres_read_batches(pg_client, use_copy):
+    batches = list(pg_client.read_batches("select * from t", batch_rows=4, use_copy=use_copy))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert all(isinstance(batch, PandasTable) for batch in batches)
+    assert pd.concat(batches)["id"].tolist() == list(range(10))
+    assert pg_client._pool.released == 1
+    if not use_copy:
+        cursor = pg_client._pool.cursors[0]
+        assert cursor.name.startswith("hammer_")
+        assert cursor.itersize == 4
+
+
+def test_postgres_read_batches_early_exit(pg_client):
+    batches = pg_client.read_batches("select * from t", batch_rows=2, use_copy=True)
+    assert len(next(batches)) == 2
+    batches.close()
+    assert pg_client._pool.rollbacks == 1
+    assert pg_client._pool.released == 1
+
+
+def test_postgres_copy_late_values(monkeypatch):
+    # name 列在第一个数据块 (1MB) 中全部为空, 之后才出现非空值
+    rows = [(i, None) for i in range(200_000)] + [(200_000, "late"), (200_001, "")]
+    monkeypatch.setattr(PostgresClient, "_create_pool", lambda self: FakePostgres(rows))
+    client = PostgresClient(user="u", password="p", host="localhost", port="5432", database="db")
+    batches = list(client.read_batches("select * from t", batch_rows=100_000, use_copy=True))
+    result = pd.concat(batches)
+    assert len(result) == len(rows)
+    assert result["id"].dtype == pd.ArrowDtype(pa.int64())
+    assert result["name"].isna().sum() == 200_001
+    assert result["name"].iloc[-2] == "late"
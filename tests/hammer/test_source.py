@@ -0,0 +1,298 @@
+import datetime
+import re
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from hammer.source import BatchSource
+from hammer.source.batch import range_predicates
+from hammer.table import PandasTable
+
+
+class FakeClient(object):
+    """按 where 中的 id 范围从内存表中过滤数据"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.queries = []
+
+    def read(self, sql, **kwargs):
+        self.queries.append(sql)
+        return PandasTable(pd.DataFrame({"lo": [self.df["c_id"].min()], "hi": [self.df["c_id"].max()]}))
+
+    def read_arrow(self, sql, **kwargs):
+        self.queries.append(sql)
+        lo, op, hi = re.search(r"c_id >= (\d+) and c_id (<=?) (\d+)", sql).groups()
+        df = self.df.query(f"c_id >= {lo} and c_id {op} {hi}")
+        return pa.Table.from_pandas(df.rename(columns={"c_id": "id"}), preserve_index=False)
+
+
+def test_range_predicates():
+    assert range_predicates("id", 0, 100, 4) == [
+        "((id >= 0 and id < 25) or id is null)",
+        "(id >= 25 and id < 50)",
+        "(id >= 50 and id < 75)",
+        "(id >= 75 and id <= 100)",
+    ]
+    assert range_predicates("id", 1, 2, 4) == ["((id >= 1 and id <= 2) or id is null)"]
+    assert range_predicates("id", None, None, 4) == ["id is null"]
+    assert range_predicates("dt", pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-03"), 2) == [
+        "((dt >= '2024-01-01 00:00:00' and dt < '2024-01-02 00:00:00') or dt is null)",
+        "(dt >= '2024-01-02 00:00:00' and dt <= '2024-01-03 00:00:00')",
+    ]
+    # lo 和 hi 在同一秒内
+    lo, hi = pd.Timestamp("2024-01-01 00:00:00.200"), pd.Timestamp("2024-01-01 00:00:00.700")
+    assert range_predicates("dt", lo, hi, 4) == [
+        "((dt >= '2024-01-01 00:00:00' and dt <= '2024-01-01 00:00:01') or dt is null)"
+    ]
+    assert range_predicates("dt", hi.floor("s"), hi.floor("s"), 4) == ["(dt = '2024-01-01 00:00:00' or dt is null)"]
+
+
+def test_partitioned_data():
+    source = BatchSource(
+        "orders",
+        "0.1.0",
+        "orders",
+        "clickhouse",
+        field_mapping={"c_id": "id"},
+        filter_conditions="dt >= '2024-01-01'",
+        config={"database": "db"},
+        partition_column="c_id",
+        num_partitions=4,
+    )
+    source._client = FakeClient(pd.DataFrame({"c_id": range(1000)}))
+    data = source.data
+    assert isinstance(data, PandasTable)
+    assert sorted(data["id"].tolist()) == list(range(1000))
+    assert source._client.queries[0] == (
+        "select min(c_id) as lo, max(c_id) as hi\nfrom db.orders\nwhere dt >= '2024-01-01'"
+    )
+    assert source._client.queries[1] == (
+        "select c_id as id\nfrom db.orders\nwhere (dt >= '2024-01-01') and ((c_id >= 0 and c_id < 249) or c_id is null)"
+    )
+    assert len(source._client.queries) == 5
+
+
+class PooledClient(FakeClient):
+    """连接池只有 2 个连接, 第一个分区中的 value 全部是整数"""
+
+    _pool_size = 2
+
+    def __init__(self, df: pd.DataFrame):
+        super().__init__(df)
+        self.lock = threading.Lock()
+        self.active = self.max_active = 0
+
+    def read_arrow(self, sql, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        table = super().read_arrow(sql, **kwargs)
+        with self.lock:
+            self.active -= 1
+        if "c_id < 249" in sql:
+            return table.set_column(1, "value", table["value"].cast(pa.int64()))
+        return table
+
+
+def test_partitioned_data_pool_size():
+    source = BatchSource(
+        "orders",
+        "0.1.0",
+        "orders",
+        "clickhouse",
+        config={"database": "db"},
+        partition_column="c_id",
+        num_partitions=4,
+    )
+    source._client = PooledClient(pd.DataFrame({"c_id": range(1000), "value": [float(i) for i in range(1000)]}))
+    data = source.data
+    assert source._client.max_active <= 2
+    assert data["value"].dtype == "float64"
+    assert sorted(data["value"].tolist()) == [float(i) for i in range(1000)]
+
+
+class CountingClient(object):
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.reads = 0
+        self.probe = 1
+
+    def read(self, sql, **kwargs):
+        if "as probe" in sql:
+            return PandasTable(pd.DataFrame({"probe": [self.probe]}))
+        self.reads += 1
+        return PandasTable(self.df.copy())
+
+
+def _snapshot_source(tmp_path, **kwargs):
+    source = BatchSource(
+        "orders", "0.1.0", "orders", "clickhouse", config={"database": "db"}, snapshot_dir=str(tmp_path), **kwargs
+    )
+    source._client = CountingClient(pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]}))
+    return source
+
+
+def test_snapshot_cache(tmp_path):
+    source = _snapshot_source(tmp_path, freshness_probe="updated_at")
+    pd.testing.assert_frame_equal(source.data, PandasTable(source._client.df))
+    assert source._client.reads == 1
+
+    # 新的进程直接读取快照
+    other = _snapshot_source(tmp_path, freshness_probe="updated_at")
+    pd.testing.assert_frame_equal(other.data, PandasTable(source._client.df))
+    assert other._client.reads == 0
+    assert other.snapshot.hits == 1
+
+    # 探针结果变化后快照失效
+    other = _snapshot_source(tmp_path, freshness_probe="updated_at")
+    other._client.probe = 2
+    other.data
+    assert other._client.reads == 1
+
+    other.refresh()
+    assert other._client.reads == 2
+    # 不同的 sql 使用不同的快照
+    other.push_down(columns=["id"])
+    other.data
+    assert other._client.reads == 3
+
+
+def test_snapshot_ttl(tmp_path):
+    source = _snapshot_source(tmp_path, snapshot_ttl=0)
+    source.data
+    other = _snapshot_source(tmp_path, snapshot_ttl=0)
+    other.data
+    assert other._client.reads == 1
+    assert other.snapshot.misses == 1
+
+
+class IncrementalClient(object):
+    """按 where 中的 dt >= '...' 从内存表中过滤数据"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.queries = []
+
+    def read(self, sql, **kwargs):
+        self.queries.append(sql)
+        match = re.search(r"c_dt >= '([^']+)'", sql)
+        df = self.df if match is None else self.df[pd.to_datetime(self.df["c_dt"]) >= pd.Timestamp(match.group(1))]
+        df = df.rename(columns={"c_id": "id", "c_dt": "dt", "c_value": "value"})
+        return PandasTable(df.reset_index(drop=True))
+
+
+def _incremental_source(tmp_path, dedup_keys=None, lateness="1D"):
+    return BatchSource(
+        "events",
+        "0.1.0",
+        "events",
+        "clickhouse",
+        config={"database": "db"},
+        field_mapping={"c_id": "id", "c_dt": "dt", "c_value": "value"},
+        snapshot_dir=str(tmp_path),
+        snapshot_ttl=0,
+        incremental_column="c_dt",
+        lateness=lateness,
+        dedup_keys=dedup_keys,
+    )
+
+
+@pytest.mark.parametrize("dedup_keys", [["id", "dt"], None])
+def test_incremental_refresh(tmp_path, dedup_keys):
+    def make_source():
+        return _incremental_source(tmp_path, dedup_keys)
+
+    days = pd.date_range("2024-01-01", periods=3, freq="D")
+    df = pd.DataFrame({"c_id": [1, 2, 3], "c_dt": days, "c_value": [1.0, 2.0, 3.0]})
+    source = make_source()
+    source._client = IncrementalClient(df)
+    assert len(source.data) == 3
+
+    # 迟到的数据修改了最后一天的值, 并新增了一天
+    late = pd.DataFrame({"c_id": [3, 4], "c_dt": [days[2], days[2] + pd.Timedelta("1D")], "c_value": [30.0, 4.0]})
+    other = make_source()
+    other._client = IncrementalClient(pd.concat([df.iloc[:2], late], ignore_index=True))
+    data = other.data
+    assert other._client.queries == [
+        "select c_id as id,c_dt as dt,c_value as value\nfrom db.events\nwhere c_dt >= '2024-01-02 00:00:00'"
+    ]
+    assert data.sort_values("dt")["value"].tolist() == [1.0, 2.0, 30.0, 4.0]
+    assert other.snapshot.meta(other)["watermark"] == "2024-01-04 00:00:00"
+
+
+def test_incremental_refresh_date_watermark(tmp_path):
+    # postgres 的 DATE 列在快照中是 datetime.date
+    days = [datetime.date(2024, 1, d) for d in (1, 2, 3)]
+    df = pd.DataFrame({"c_id": [1, 2, 3], "c_dt": days, "c_value": [1.0, 2.0, 3.0]})
+    source = _incremental_source(tmp_path, lateness="12h")
+    source._client = IncrementalClient(df)
+    source.data
+
+    other = _incremental_source(tmp_path, lateness="12h")
+    other._client = IncrementalClient(df.assign(c_value=[1.0, 20.0, 30.0]))
+    data = other.data
+    # 水位线减去 12 小时后向下取整到天
+    assert other._client.queries[0].endswith("where c_dt >= '2024-01-02'")
+    assert data.sort_values("id")["value"].tolist() == [1.0, 20.0, 30.0]
+
+
+def test_incremental_refresh_subsecond_watermark(tmp_path):
+    ts = pd.to_datetime(["2024-01-01 00:00:00.000", "2024-01-01 00:00:01.250", "2024-01-01 00:00:01.500"])
+    df = pd.DataFrame({"c_id": [1, 2, 3], "c_dt": ts, "c_value": [1.0, 2.0, 3.0]})
+    source = _incremental_source(tmp_path, lateness="100ms")
+    source._client = IncrementalClient(df)
+    source.data
+
+    other = _incremental_source(tmp_path, lateness="100ms")
+    other._client = IncrementalClient(df)
+    data = other.data
+    assert other._client.queries[0].endswith("where c_dt >= '2024-01-01 00:00:01.400000'")
+    # 没有 dedup_keys 时, 快照中下界之前的行与新拉取的行不重叠
+    assert data["id"].tolist() == [1, 2, 3]
+
+
+def test_snapshot_versions(tmp_path):
+    source = _snapshot_source(tmp_path)
+    source.snapshot.rows_per_part = 2
+    data = PandasTable(pd.DataFrame({"id": range(5), "name": list("abcde")}))
+    for _ in range(3):
+        source.snapshot.save(source, data)
+    target = source.snapshot._dir(source)
+    current = source.snapshot._current(source)
+    # 数据按行数切分为多个分片, 只保留当前和上一个版本
+    assert sorted(p.name for p in current.glob("*.parquet")) == ["part-0.parquet", "part-1.parquet", "part-2.parquet"]
+    assert len([p for p in target.iterdir() if p.name.startswith("v-")]) == 2
+    pd.testing.assert_frame_equal(source.snapshot.read(source), data)
+
+    source.snapshot.invalidate(source)
+    assert source.snapshot.meta(source) is None
+    assert source.snapshot.load(source) is None
+
+
+def test_snapshot_concurrent_save_and_read(tmp_path):
+    source = _snapshot_source(tmp_path)
+    data = PandasTable(pd.DataFrame({"id": range(100)}))
+    source.snapshot.save(source, data)
+    errors = []
+
+    def write():
+        try:
+            for _ in range(10):
+                source.snapshot.save(source, data)
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write) for _ in range(3)]
+    for writer in writers:
+        writer.start()
+    # 写入的同时读取, 总能读到一个完整的版本
+    while any(writer.is_alive() for writer in writers):
+        assert len(source.snapshot.read(source)) == 100
+    for writer in writers:
+        writer.join()
+    assert errors == []